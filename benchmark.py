@@ -0,0 +1,324 @@
+# Mesures de performance des fonctions publiques du projet sur des reseaux synthetiques
+# (src/generateurs.py) de taille croissante : duree, temps CPU et memoire de pointe de chaque appel.
+# Chaque mesure s'execute dans un processus fils (fork) : les caches d'une fonction ne profitent pas
+# a la suivante et la memoire de pointe est celle de la fonction seule.
+# Au-dela de leur seuil, les calculs exacts sont remplaces par leur variante pour grands graphes
+# (colonne "variante" des resultats) ; une mesure sans variante est omise avec sa raison.
+# Les resultats (JSON) peuvent etre compares a une reference pour detecter les regressions :
+#   python benchmark.py --echelles 1000 10000 --sortie output/benchmark/reference.json
+#   python benchmark.py --echelles 1000 10000 --reference output/benchmark/reference.json
+# --demarrage verifie le budget de temps d'import de main.py (code de retour 1 s'il est depasse).
+
+import os #dossiers temporaires et fichiers de resultats
+import sys #code de retour en cas de regression
+import json #resultats lisibles par machine
+import time #mesure des durees
+import argparse #options de la ligne de commande
+import platform #description de la machine
+import subprocess #temps d'import mesure dans un interpreteur neuf
+import tempfile #dossier de travail isole pour chaque campagne
+import multiprocessing #une mesure = un processus (memoire de pointe propre a la fonction)
+import matplotlib
+matplotlib.use('Agg') #figures seulement sauvegardees
+# Importation des fonctions depuis les modules src/
+from src.generateurs import GENERATEURS
+from src.construction_graphe import creer_reseau_social, sauvegarder_graphe, charger_graphe, charger_graphe_compact
+from src.chargement_flux import charger_aretes_par_blocs
+from src.snapshot import sauvegarder_snapshot, charger_snapshot
+from src.analyse import analyser_reseau, afficher_rapport_analyse, visualiser_metriques
+from src.visualisation import appliquer_layouts, visualiser_layout_unique, visualiser_tous_layouts
+from src.caracteristiques import COLONNES_GRAND
+from src.reduction_dimension import (creer_matrice_caracteristiques, appliquer_pca, appliquer_tsne,
+                                     visualiser_reduction_dimension)
+from src.visualisation_3d import visualisation_3d
+from src.layout_force import layout_partage
+from src.vues import extraire_vue
+from src.instrumentation import memoire_ko, reinitialiser_pic_memoire
+
+ECHELLES_DEFAUT = (1_000, 10_000, 100_000)
+DELAI_DEFAUT = 600          # Secondes accordees a chaque mesure avant abandon
+TOLERANCE_DEFAUT = 0.25     # Hausse relative toleree par rapport a la reference (temps et memoire)
+PLANCHER_SECONDES = 0.05    # En dessous, les ecarts de duree ne sont pas significatifs
+PLANCHER_MO = 5.0           # Idem pour la memoire
+BUDGET_DEMARRAGE = 1.0      # Secondes accordees a "import main" (avant toute etape)
+MODULES_LOURDS = ('matplotlib', 'sklearn', 'plotly', 'pandas', 'openTSNE')  # Charges seulement a la demande
+VUE_GRAND = {'mode': 'echantillon'}  # Vue dessinee a la place du reseau complet au-dela du seuil
+
+
+# Preparation (non mesuree) et appel mesure de chaque fonction.
+# preparation(G) retourne les arguments supplementaires de l'appel mesure ;
+# seuil : nombre de noeuds au-dela duquel le calcul exact est trop long. La variante 'grand'
+# (mode approche, vue du reseau, colonnes sans balayage) est alors mesuree a sa place ; sans
+# variante, la mesure est omise et signalee comme telle dans les resultats.
+
+def _aucune(G):
+    return ()
+
+
+def _analyse(G):
+    return (analyser_reseau(G, mode='approchee'),)
+
+
+def _layouts(G):
+    return (appliquer_layouts(G),)
+
+
+def _reduction(G):
+    pos_pca, variance_pca = appliquer_pca(G)
+    return pos_pca, appliquer_tsne(G), variance_pca
+
+
+def _reduction_grand(G):
+    pos_pca, variance_pca = appliquer_pca(G, mode='grand')  # Colonnes COLONNES_GRAND par defaut
+    return pos_pca, appliquer_tsne(G, mode='grand'), variance_pca
+
+
+def _layouts_vue(G):
+    H = extraire_vue(G, **VUE_GRAND)
+    return H, appliquer_layouts(H)
+
+
+def _layout_3d(G):
+    return (layout_partage(G, dim=3),)
+
+
+def _fichier_csv(G):
+    sauvegarder_graphe(G, "data/benchmark.csv")
+    return ()
+
+
+def _fichier_snapshot(G):
+    sauvegarder_snapshot(G, "data/benchmark.snap")
+    return ()
+
+
+MESURES = {
+    'creer_reseau_social': {'preparation': _aucune, 'mesure': lambda G: creer_reseau_social()},
+    'sauvegarder_graphe': {'preparation': _aucune, 'mesure': lambda G: sauvegarder_graphe(G, "data/benchmark.csv")},
+    'charger_graphe': {'preparation': _fichier_csv, 'mesure': lambda G: charger_graphe("data/benchmark.csv")},
+    'charger_graphe_compact': {'preparation': _fichier_csv, 'mesure': lambda G: charger_graphe_compact("data/benchmark.csv")},
+    'charger_aretes_par_blocs': {'preparation': _fichier_csv,
+                                 'mesure': lambda G: charger_aretes_par_blocs("data/benchmark.csv")},
+    'sauvegarder_snapshot': {'preparation': _aucune, 'mesure': lambda G: sauvegarder_snapshot(G, "data/benchmark.snap")},
+    'charger_snapshot': {'preparation': _fichier_snapshot, 'mesure': lambda G: charger_snapshot("data/benchmark.snap")},
+    'analyser_reseau': {'preparation': _aucune, 'mesure': analyser_reseau, 'seuil': 10_000,
+                        'grand': {'preparation': _aucune, 'mesure': lambda G: analyser_reseau(G, mode='approchee')}},
+    'analyser_reseau_approchee': {'preparation': _aucune, 'mesure': lambda G: analyser_reseau(G, mode='approchee')},
+    'afficher_rapport_analyse': {'preparation': _analyse, 'mesure': lambda G, analyse: afficher_rapport_analyse(analyse, G)},
+    'visualiser_metriques': {'preparation': _analyse, 'mesure': visualiser_metriques, 'seuil': 100_000,
+                             'grand': {'preparation': _analyse, 'mesure': lambda G, analyse: visualiser_metriques(
+                                 G, analyse, vue=VUE_GRAND)}},
+    'appliquer_layouts': {'preparation': _aucune, 'mesure': appliquer_layouts, 'seuil': 100_000,
+                          'grand': {'preparation': _aucune,
+                                    'mesure': lambda G: appliquer_layouts(extraire_vue(G, **VUE_GRAND))}},
+    'visualiser_layout_unique': {'preparation': _layouts, 'mesure': lambda G, layouts: visualiser_layout_unique(
+        G, layouts['spring'], "Layout Spring", "layout_spring"), 'seuil': 100_000,
+                                 'grand': {'preparation': _aucune, 'mesure': lambda G: visualiser_layout_unique(
+                                     G, 'spring', "Layout Spring", "layout_spring", vue=VUE_GRAND)}},
+    'visualiser_tous_layouts': {'preparation': _layouts, 'mesure': visualiser_tous_layouts, 'seuil': 100_000,
+                                'grand': {'preparation': _layouts_vue,
+                                          'mesure': lambda G, H, layouts: visualiser_tous_layouts(H, layouts)}},
+    'creer_matrice_caracteristiques': {'preparation': _aucune, 'mesure': creer_matrice_caracteristiques, 'seuil': 10_000,
+                                       'grand': {'preparation': _aucune, 'mesure': lambda G: creer_matrice_caracteristiques(
+                                           G, COLONNES_GRAND)}},
+    'appliquer_pca': {'preparation': _aucune, 'mesure': appliquer_pca, 'seuil': 10_000,
+                      'grand': {'preparation': _aucune,
+                                'mesure': lambda G: appliquer_pca(G, mode='grand')}},
+    'appliquer_tsne': {'preparation': _aucune, 'mesure': appliquer_tsne, 'seuil': 10_000,
+                       'grand': {'preparation': _aucune,
+                                 'mesure': lambda G: appliquer_tsne(G, mode='grand')}},
+    'visualiser_reduction_dimension': {'preparation': _reduction, 'mesure': visualiser_reduction_dimension, 'seuil': 10_000,
+                                       'grand': {'preparation': _reduction_grand, 'mesure': visualiser_reduction_dimension}},
+    'visualisation_3d': {'preparation': _layout_3d, 'mesure': visualisation_3d, 'seuil': 100_000,
+                         'grand': {'preparation': _aucune, 'mesure': lambda G: visualisation_3d(G, vue=VUE_GRAND)}},
+}
+
+
+def _variante(nom, n, sans_seuils):
+    # Description de la mesure a faire pour n noeuds : 'exacte', 'grand' ou None (omise)
+    if sans_seuils or n <= MESURES[nom].get('seuil', float('inf')):
+        return 'exacte'
+    return 'grand' if 'grand' in MESURES[nom] else None
+
+
+def _executer_mesure(connexion, G, nom, dossier, variante):
+    # Processus fils : preparation, puis appel mesure (duree, temps CPU, memoire de pointe)
+    try:
+        os.chdir(dossier)
+        sortie = open(os.devnull, "w")
+        sys.stdout = sortie  # Les messages des fonctions ne polluent pas le tableau des resultats
+        mesure = MESURES[nom]['grand'] if variante == 'grand' else MESURES[nom]
+        args = mesure['preparation'](G)
+        reinitialiser_pic_memoire()
+        avant = memoire_ko()
+        debut, debut_cpu = time.perf_counter(), time.process_time()
+        mesure['mesure'](G, *args)
+        secondes, cpu = time.perf_counter() - debut, time.process_time() - debut_cpu
+        apres = memoire_ko()
+        memoire = None if avant is None else max(apres[1] - avant[0], 0) / 1024
+        connexion.send({'statut': 'ok', 'secondes': secondes, 'cpu_secondes': cpu, 'memoire_mo': memoire})
+    except Exception as erreur:
+        connexion.send({'statut': 'erreur', 'erreur': f"{type(erreur).__name__}: {erreur}"})
+
+
+def mesurer(G, nom, dossier, delai=DELAI_DEFAUT, variante='exacte'):
+    """
+    Mesure une fonction de MESURES sur G dans un processus fils ; retourne un dictionnaire de resultats.
+    variante='grand' mesure la variante pour grands graphes de la fonction.
+    """
+    contexte = multiprocessing.get_context('fork')  # Le graphe est herite sans copie ni pickle
+    reception, envoi = contexte.Pipe(duplex=False)
+    processus = contexte.Process(target=_executer_mesure, args=(envoi, G, nom, dossier, variante))
+    processus.start()
+    fin = time.perf_counter() + delai
+    while not reception.poll(0.1):
+        if not processus.is_alive() and not reception.poll():
+            # Arret brutal (manque de memoire, signal) : aucun resultat envoye
+            processus.join()
+            return {'statut': 'interrompu', 'erreur': f"code de sortie {processus.exitcode}"}
+        if time.perf_counter() > fin:
+            processus.terminate()
+            processus.join()
+            return {'statut': 'delai depasse', 'secondes': delai}
+    resultat = reception.recv()
+    processus.join()
+    return resultat
+
+
+def executer_benchmark(generateurs=tuple(GENERATEURS), echelles=ECHELLES_DEFAUT, fonctions=tuple(MESURES),
+                       repetitions=1, delai=DELAI_DEFAUT, seed=42, sans_seuils=False):
+    """
+    Mesure chaque fonction sur chaque generateur et chaque echelle (nombre de noeuds).
+    Avec plusieurs repetitions, on garde la duree la plus courte et la memoire la plus elevee.
+    Chaque ligne indique la variante mesuree ('exacte' ou 'grand') ; une mesure omise a le statut
+    'omis' et sa raison. Retourne le document JSON des resultats.
+    """
+    resultats = []
+    with tempfile.TemporaryDirectory(prefix="benchmark_") as dossier:
+        os.makedirs(os.path.join(dossier, "output", "images"))
+        os.makedirs(os.path.join(dossier, "data"))
+        for generateur in generateurs:
+            for n in echelles:
+                debut = time.perf_counter()
+                G = GENERATEURS[generateur](n, seed=seed)
+                G.graph.pop('compact', None)  # Comme un graphe construit ou charge par le projet
+                print(f"\n{generateur} n={n} m={G.number_of_edges()} (genere en {time.perf_counter() - debut:.1f} s)")
+                for nom in fonctions:
+                    variante = _variante(nom, n, sans_seuils)
+                    ligne = {'generateur': generateur, 'noeuds': n, 'aretes': G.number_of_edges(), 'fonction': nom,
+                             'variante': variante}
+                    if variante is None:
+                        ligne['statut'] = 'omis'
+                        ligne['erreur'] = (f"calcul exact au-dela de {MESURES[nom]['seuil']} noeuds sans variante "
+                                           "pour grands graphes (--sans-seuils pour le mesurer)")
+                    else:
+                        essais = [mesurer(G, nom, dossier, delai, variante) for _ in range(repetitions)]
+                        reussis = [e for e in essais if e['statut'] == 'ok']
+                        memoires = [e['memoire_mo'] for e in reussis if e['memoire_mo'] is not None]
+                        ligne.update(essais[0] if not reussis else {
+                            'statut': 'ok',
+                            'secondes': min(e['secondes'] for e in reussis),
+                            'cpu_secondes': min(e['cpu_secondes'] for e in reussis),
+                            'memoire_mo': max(memoires) if memoires else None,
+                        })
+                    resultats.append(ligne)
+                    _afficher_ligne(ligne)
+    return {
+        'date': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'machine': {'systeme': platform.platform(), 'python': platform.python_version(),
+                    'processeur': platform.processor(), 'coeurs': os.cpu_count()},
+        'parametres': {'seed': seed, 'repetitions': repetitions},
+        'resultats': resultats,
+    }
+
+
+def _afficher_ligne(ligne):
+    fonction = ligne['fonction'] + (" (grand)" if ligne['variante'] == 'grand' else "")
+    if ligne['statut'] != 'ok':
+        print(f"   {fonction:40s} {ligne['statut']} {ligne.get('erreur', '')}")
+        return
+    memoire = "?" if ligne['memoire_mo'] is None else f"{ligne['memoire_mo']:.1f} Mo"
+    print(f"   {fonction:40s} {ligne['secondes']:9.3f} s  cpu {ligne['cpu_secondes']:9.3f} s  {memoire:>10s}")
+
+
+def comparer(document, reference, tolerance=TOLERANCE_DEFAUT):
+    """
+    Compare des resultats a une reference (memes generateur, echelle, fonction et variante).
+    Retourne la liste des regressions : (fonction, generateur, noeuds, critere, reference, valeur).
+    Les hausses sous PLANCHER_SECONDES / PLANCHER_MO et les mesures en echec de part et d'autre sont ignorees.
+    """
+    cle = lambda ligne: (ligne['generateur'], ligne['noeuds'], ligne['fonction'], ligne.get('variante', 'exacte'))
+    references = {cle(ligne): ligne for ligne in reference['resultats']}
+    regressions = []
+    for ligne in document['resultats']:
+        ancienne = references.get(cle(ligne))
+        if ancienne is None or ancienne['statut'] != 'ok':
+            continue
+        if ligne['statut'] != 'ok':
+            regressions.append((ligne['fonction'], ligne['generateur'], ligne['noeuds'], ligne['statut'], 'ok', ligne['statut']))
+            continue
+        for critere, plancher in (('secondes', PLANCHER_SECONDES), ('memoire_mo', PLANCHER_MO)):
+            avant, apres = ancienne.get(critere), ligne.get(critere)
+            if avant is None or apres is None:
+                continue
+            if apres > avant * (1 + tolerance) and apres - avant > plancher:
+                regressions.append((ligne['fonction'], ligne['generateur'], ligne['noeuds'], critere, avant, apres))
+    return regressions
+
+
+def mesurer_demarrage(repetitions=5):
+    """
+    Temps d'import de main.py (meilleur de plusieurs interpreteurs neufs, mesure par -X importtime)
+    et bibliotheques lourdes chargees a cette occasion. Retourne (secondes, liste de modules).
+    """
+    code = f"import sys, main; print(','.join(m for m in {MODULES_LOURDS!r} if m in sys.modules))"
+    meilleur, lourds = float('inf'), []
+    for _ in range(repetitions):
+        sortie = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                                check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        # Derniere ligne de -X importtime : "import time: propre | cumule | main"
+        cumule = [ligne.split('|') for ligne in sortie.stderr.splitlines() if ligne.rstrip().endswith('| main')]
+        meilleur = min(meilleur, int(cumule[-1][1]) / 1e6)
+        lourds = [m for m in sortie.stdout.strip().split(',') if m]
+    return meilleur, lourds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mesures de performance sur des reseaux synthetiques")
+    parser.add_argument("--generateurs", nargs="+", choices=list(GENERATEURS), default=list(GENERATEURS))
+    parser.add_argument("--echelles", nargs="+", type=int, default=list(ECHELLES_DEFAUT), metavar="N",
+                        help="nombres de noeuds (ex: 10000 100000 1000000)")
+    parser.add_argument("--fonctions", nargs="+", choices=list(MESURES), default=list(MESURES), metavar="FONCTION",
+                        help=f"fonctions mesurees parmi {', '.join(MESURES)}")
+    parser.add_argument("--repetitions", type=int, default=1, help="repetitions de chaque mesure (meilleure duree)")
+    parser.add_argument("--delai", type=float, default=DELAI_DEFAUT, help="secondes accordees a chaque mesure")
+    parser.add_argument("--seed", type=int, default=42, help="graine des generateurs")
+    parser.add_argument("--sans-seuils", action="store_true", help="mesure les calculs exacts meme au-dela des seuils (au lieu des variantes pour grands graphes)")
+    parser.add_argument("--sortie", default="output/benchmark/resultats.json", help="fichier JSON des resultats")
+    parser.add_argument("--reference", help="resultats de reference a comparer (code de retour 1 si regression)")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE_DEFAUT, help="hausse relative toleree (0.25 = 25%%)")
+    parser.add_argument("--demarrage", action="store_true",
+                        help=f"verifie seulement le temps d'import de main.py (budget {BUDGET_DEMARRAGE} s)")
+    options = parser.parse_args()
+
+    if options.demarrage:
+        secondes, lourds = mesurer_demarrage()
+        print(f"Import de main.py: {secondes:.3f} s (budget {BUDGET_DEMARRAGE} s)")
+        if lourds:
+            print(f"   Bibliotheques chargees inutilement: {', '.join(lourds)}")
+        sys.exit(1 if secondes > BUDGET_DEMARRAGE or lourds else 0)
+
+    document = executer_benchmark(options.generateurs, options.echelles, options.fonctions, options.repetitions,
+                                  options.delai, options.seed, options.sans_seuils)
+    os.makedirs(os.path.dirname(options.sortie) or ".", exist_ok=True)
+    with open(options.sortie, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"\nResultats sauvegardes dans {options.sortie}")
+
+    if options.reference:
+        with open(options.reference) as f:
+            regressions = comparer(document, json.load(f), options.tolerance)
+        for fonction, generateur, n, critere, avant, apres in regressions:
+            print(f"   REGRESSION {fonction} ({generateur}, n={n}) {critere}: {avant} -> {apres}")
+        print(f"{len(regressions)} regression(s) par rapport a {options.reference}")
+        sys.exit(1 if regressions else 0)
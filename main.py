@@ -1,55 +1,121 @@
 ﻿import os #pour la gestion des dossiers et fichiers
+import sys #arguments de la ligne de commande
+import time #mesure de la duree totale
+import argparse #options de la ligne de commande
 # Importation des fonctions depuis les modules src/
-from src.construction_graphe import creer_reseau_social, sauvegarder_graphe
-from src.visualisation import (appliquer_layouts, visualiser_layout_unique, 
-                                visualiser_tous_layouts)
-from src.reduction_dimension import (appliquer_pca, appliquer_tsne, 
-                                     visualiser_reduction_dimension)
-from src.analyse import analyser_reseau, afficher_rapport_analyse, visualiser_metriques
-from src.visualisation_3d import visualisation_3d
-
-def main():
-    
+from src.pipeline import ETAPES, executer_pipeline
+from src.rendu_parallele import demarrer_rendu
+from src.instrumentation import MODES, demarrer_instrumentation, terminer_instrumentation
+from src.vues import TAILLE_VUE
+
+# Sous-commandes de la ligne de commande -> etapes du pipeline (None = toutes)
+COMMANDES = {
+    'analyse': ('analyse',),
+    'layouts': ('layouts',),
+    'reduce': ('reduction',),
+    '3d': ('3d',),
+    'all': None,
+}
+
+def main(etapes=None, forcer=False, rendu_parallele=True, profil=None, figures=True):
+    # etapes : sous-ensemble des etapes a executer (avec leurs dependances), toutes par defaut
+    # forcer : recalcule tout sans utiliser le cache des etapes
+    # rendu_parallele : etapes independantes et figures executees dans un pool de processus
+    # profil : mesure des appels ('temps', 'tracemalloc' ou 'cprofile'), ecrite dans output/profils/
+    # figures : False pour n'afficher que les rapports (matplotlib, scikit-learn et plotly ne sont pas charges
+    #           si les resultats des etapes sont deja en cache)
+
     # Création des dossiers de sortie
     os.makedirs("output/images", exist_ok=True) # Pour sauvegarder les images
     os.makedirs("data", exist_ok=True) # Pour sauvegarder le graphe
 
-    
+
     print("PROJET: Visualisation des Relations dans un Mini Reseau Social")
     print("=" * 70)
-    
-    print("\nEtape 1: Construction du graphe...")
-    G = creer_reseau_social()
-    sauvegarder_graphe(G)
-    print(f"   Graphe cree: {G.number_of_nodes()} noeuds, {G.number_of_edges()} aretes")
-    
-    print("\nEtape 2: Application des techniques de layout...")
-    layouts = appliquer_layouts(G)
-    print(f"   {len(layouts)} layouts generes")
-    
-    for nom, pos in layouts.items():
-        visualiser_layout_unique(G, pos, f"Layout {nom.title()}", f"layout_{nom}")
-    
-    visualiser_tous_layouts(G, layouts)
-    
-    print("\nEtape 3: Reduction de dimension (PCA & t-SNE)...")
-    pos_pca, variance_pca = appliquer_pca(G)
-    pos_tsne = appliquer_tsne(G)
-    visualiser_reduction_dimension(G, pos_pca, pos_tsne, variance_pca)
-    print(f"   Variance expliquee par PCA: {sum(variance_pca)*100:.1f}%")
-    
-    print("\nEtape 4: Analyse des patterns du reseau...")
-    analyse = analyser_reseau(G)
-    afficher_rapport_analyse(analyse, G)
-    visualiser_metriques(G, analyse)
-    
-    print("\nEtape 5: Creation de la visualisation 3D...")
-    visualisation_3d(G)
-    print("   Visualisation 3D sauvegardee (reseau_3d.html)")
-    
+
+    debut = time.perf_counter()
+    if profil is not None:
+        demarrer_instrumentation(profil) # avant le pool : les processus de rendu sont mesures aussi
+    executeur = demarrer_rendu() if rendu_parallele else None
+    executer_pipeline(etapes, forcer=forcer, executeur=executeur, figures=figures)
+    if executeur is not None:
+        executeur.shutdown()
+    if profil is not None:
+        terminer_instrumentation()
+    print(f"   Duree totale: {time.perf_counter() - debut:.1f} s")
+
     print("\n" + "=" * 70)
     print("Projet termine! Toutes les images sont dans output/images/")
     print("=" * 70)
 
+def main_vue(vue, forcer=False, profil=None):
+    # Figures limitees a une vue du reseau (ego, top-k ou echantillon, voir src/vues.py) :
+    # le graphe et l'analyse viennent du pipeline (relus du cache), layouts et rendu ne portent que sur la vue
+    from src.vues import extraire_vue
+    from src.visualisation import visualiser_layout_unique
+    from src.analyse import visualiser_metriques
+    from src.visualisation_3d import visualisation_3d
+
+    os.makedirs("output/images", exist_ok=True)
+    debut = time.perf_counter()
+    if profil is not None:
+        demarrer_instrumentation(profil)
+    resultats = executer_pipeline(['analyse'], forcer=forcer, figures=False)
+    G, analyse = resultats['graphe'], resultats['analyse']
+    if vue['mode'] == 'top':
+        vue['scores'] = analyse[vue['metrique']] # centralites deja calculees par l'etape analyse
+    H = extraire_vue(G, **vue)
+    print(f"\nRendu de la {H.graph['vue']}")
+    visualiser_layout_unique(G, 'spring', "Layout Spring", "vue_layout_spring", vue=H)
+    visualiser_metriques(G, analyse, vue=H, nom_fichier="vue_analyse_metriques")
+    visualisation_3d(G, chemin="output/images/vue_reseau_3d.html", vue=H)
+    if profil is not None:
+        terminer_instrumentation()
+    print(f"   Duree totale: {time.perf_counter() - debut:.1f} s")
+    print("Images de la vue: output/images/vue_*")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Options communes a toutes les sous-commandes
+    communes = argparse.ArgumentParser(add_help=False)
+    communes.add_argument("--forcer", action="store_true", help="ignore le cache des etapes")
+    communes.add_argument("--sequentiel", action="store_true", help="execute tout dans le processus courant")
+    communes.add_argument("--profil", choices=MODES, help="mesure les appels (duree, CPU, memoire) et ecrit une trace JSON")
+    communes.add_argument("--sans-figures", action="store_true", help="rapports texte seulement, sans images")
+
+    parser = argparse.ArgumentParser(description="Visualisation des relations dans un mini reseau social")
+    sous_commandes = parser.add_subparsers(dest="commande", metavar="COMMANDE",
+                                           help=f"{', '.join(COMMANDES)} (all par defaut)")
+    for commande in COMMANDES:
+        sous_parser = sous_commandes.add_parser(commande, parents=[communes],
+                                                help="toutes les etapes" if commande == "all" else f"etape {COMMANDES[commande][0]}")
+        if commande == "all":
+            sous_parser.add_argument("--only", nargs="+", choices=list(ETAPES), metavar="ETAPE",
+                                     help=f"etapes a executer parmi {', '.join(ETAPES)} (dependances incluses)")
+    # Figures d'une partie du reseau seulement
+    parser_vue = sous_commandes.add_parser("vue", parents=[communes], help="figures limitees a une vue du reseau")
+    selection = parser_vue.add_mutually_exclusive_group(required=True)
+    selection.add_argument("--ego", nargs="+", metavar="UTILISATEUR", help="voisinage d'utilisateurs (identifiants ou noms)")
+    selection.add_argument("--top", choices=["degree", "betweenness", "closeness", "eigenvector"],
+                           help="noeuds les plus centraux selon cette centralite")
+    selection.add_argument("--echantillon", action="store_true", help="echantillon aleatoire stratifie par groupe")
+    parser_vue.add_argument("--k", type=int, default=1, help="nombre de sauts de la vue ego")
+    parser_vue.add_argument("--taille", type=int, default=TAILLE_VUE, help="nombre maximal de noeuds de la vue")
+    parser_vue.add_argument("--seed", type=int, default=42, help="graine de l'echantillon")
+    arguments = sys.argv[1:]
+    if not arguments or arguments[0] not in (*COMMANDES, "vue", "-h", "--help"):
+        arguments = ["all"] + arguments  # "python main.py [options]" : comme "python main.py all [options]"
+    options = parser.parse_args(arguments)
+
+    if options.commande == "vue":
+        if options.ego:
+            vue = {'mode': 'ego', 'centres': options.ego, 'k': options.k}
+        elif options.top:
+            vue = {'mode': 'top', 'metrique': f"{options.top}_centrality"}
+        else:
+            vue = {'mode': 'echantillon', 'seed': options.seed}
+        vue['taille'] = options.taille
+        main_vue(vue, forcer=options.forcer, profil=options.profil)
+    else:
+        etapes = getattr(options, "only", None) or COMMANDES[options.commande]
+        main(etapes, forcer=options.forcer, rendu_parallele=not options.sequentiel, profil=options.profil,
+             figures=not options.sans_figures)
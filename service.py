@@ -0,0 +1,24 @@
+import asyncio #boucle du service
+import argparse #options de la ligne de commande
+# Importation des fonctions depuis les modules src/
+from src.service import servir, HOTE_DEFAUT, PORT_DEFAUT
+
+# Service local de requetes sur le reseau (voir src/service.py), par exemple :
+#   python service.py --snapshot data/reseau_social.snap
+#   curl "http://127.0.0.1:8765/top?metrique=betweenness&groupe=Artistes&k=10"
+#   curl "http://127.0.0.1:8765/voisinage?noeud=Alice&k=2"
+#   curl "http://127.0.0.1:8765/communaute?noeud=4217"
+#   curl "http://127.0.0.1:8765/recharger?chemin=data/nouveau.snap"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Service local de requetes sur le reseau social")
+    parser.add_argument("--snapshot", default="data/reseau_social.snap", help="instantane a servir")
+    parser.add_argument("--hote", default=HOTE_DEFAUT, help="adresse d'ecoute")
+    parser.add_argument("--port", type=int, default=PORT_DEFAUT, help="port d'ecoute")
+    parser.add_argument("--socket", help="socket Unix a utiliser au lieu du port TCP")
+    parser.add_argument("--mode", choices=["exacte", "approchee"], help="calcul des centralites (auto par defaut)")
+    options = parser.parse_args()
+    try:
+        asyncio.run(servir(options.snapshot, options.hote, options.port, options.socket, options.mode))
+    except KeyboardInterrupt:
+        print("\nService arrete")
@@ -1,40 +1,69 @@
 ﻿# src/analyse.py
 
+import heapq #sélection des k meilleurs sans trier tout le réseau
 import networkx as nx #manipulation et analyse des graphes
-import matplotlib.pyplot as plt #visualisation graphique
 import numpy as np #calcul numérique
-import pandas as pd #manipulation de données
+from src.cache_metriques import obtenir_metrique #métriques partagées entre les modules
+from src.centralite import centralites_approchees, diametre_rayon_bornes #centralités par échantillonnage, extrémités par encadrement
+from src.layout_force import layout_partage #layout force-dirigé commun à toutes les figures
+from src.communautes import modularite_compact, listes_communautes #partition nœud -> communauté (Louvain)
+from src.rendu_rapide import dessiner_graphe, SEUIL_LABELS #rendu groupé des nœuds et des arêtes
+from src.instrumentation import instrumenter, section #mesure des appels (durée, CPU, mémoire)
+from src.vues import obtenir_vue, restreindre_analyse #sous-graphe dessiné à la place du réseau complet
 
-def analyser_reseau(G): #Cette fonction calcule toutes les métriques importantes du réseau.
+@instrumenter
+def analyser_reseau(G, mode='exacte', echantillon=None, tolerance=0.01, top_k=5, resolution=1.0): #Cette fonction calcule toutes les métriques importantes du réseau.
+    # mode='approchee' : intermédiarité et proximité estimées sur au plus `echantillon` pivots,
+    # jusqu'à une erreur estimée <= tolerance ou jusqu'à départager les top_k premiers
+    # resolution : résolution de la détection de communautés (> 1 : communautés plus petites)
     analyse = {} #Dictionnaire pour stocker les résultats de l'analyse
+    analyse['mode'] = mode
     analyse['nb_noeuds'] = G.number_of_nodes() #Nombre d’utilisateurs
     analyse['nb_aretes'] = G.number_of_edges() #Nombre de relations
     analyse['densite'] = nx.density(G) #Taux de connexions existantes
-    analyse['diametre'] = nx.diameter(G) if nx.is_connected(G) else "Non connexe" #Distance maximale entre deux utilisateurs
-    analyse['rayon'] = nx.radius(G) if nx.is_connected(G) else "Non connexe" #Distance minimale maximale entre un utilisateur et tous les autres
+    # Diamètre et rayon par composante connexe : balayage BFS unique (exact) ou encadrement des excentricités (approché)
+    if mode == 'approchee':
+        composantes = obtenir_metrique(G, 'extremites_bornees', calcul=diametre_rayon_bornes)['composantes']
+    else:
+        composantes = obtenir_metrique(G, 'plus_courts_chemins')['composantes']
+    analyse['composantes'] = composantes #Taille, diamètre et rayon de chaque composante (la plus grande en premier)
+    analyse['nb_composantes'] = len(composantes)
+    analyse['diametre'] = max(c['diametre'] for c in composantes) #Distance maximale entre deux utilisateurs reliés
+    analyse['rayon'] = composantes[0]['rayon'] #Distance minimale maximale entre un utilisateur et tous les autres (plus grande composante)
     analyse['degre_moyen'] = sum(dict(G.degree()).values()) / G.number_of_nodes() #Distance maximale entre deux utilisateurs
      # Mesures de clustering
-    analyse['clustering_moyen'] = nx.average_clustering(G)
-    analyse['clustering_global'] = nx.transitivity(G)
-    analyse['degree_centrality'] = nx.degree_centrality(G) #Popularité des utilisateurs
-    analyse['betweenness_centrality'] = nx.betweenness_centrality(G) #Capacité d’intermédiaire
-    analyse['closeness_centrality'] = nx.closeness_centrality(G) #Rapidité pour atteindre les autres
-    analyse['eigenvector_centrality'] = nx.eigenvector_centrality(G, max_iter=1000) #Influence globale dans le réseau
-    from networkx.algorithms import community
-    communities = community.greedy_modularity_communities(G) #Détection de communautés par maximisation de la modularité
-    analyse['communautes'] = [list(c) for c in communities]
-    analyse['nb_communautes'] = len(communities)
-    analyse['modularite'] = community.modularity(G, communities) #la qualité de la séparation des communautés
+    analyse['clustering_moyen'] = obtenir_metrique(G, 'average_clustering')
+    analyse['clustering_global'] = obtenir_metrique(G, 'transitivity')
+    analyse['degree_centrality'] = obtenir_metrique(G, 'degree_centrality') #Popularité des utilisateurs
+    if mode == 'approchee':
+        approx = obtenir_metrique(G, 'centralites_approchees', calcul=centralites_approchees,
+                                  echantillon=echantillon, tolerance=tolerance, top_k=top_k)
+        analyse['betweenness_centrality'] = approx['betweenness'] #Estimation de la capacité d’intermédiaire
+        analyse['closeness_centrality'] = approx['closeness'] #Estimation de la rapidité pour atteindre les autres
+        analyse['erreur_betweenness'] = approx['erreur_betweenness'] #Demi-largeur de l'intervalle de confiance à 95 %
+        analyse['erreur_closeness'] = approx['erreur_closeness']
+        analyse['nb_pivots'] = approx['nb_pivots']
+    else:
+        analyse['betweenness_centrality'] = obtenir_metrique(G, 'betweenness_centrality') #Capacité d’intermédiaire (Brandes exact, réparti sur tous les cœurs pour les grands graphes)
+        analyse['closeness_centrality'] = obtenir_metrique(G, 'closeness_centrality') #Rapidité pour atteindre les autres
+    analyse['eigenvector_centrality'] = obtenir_metrique(G, 'eigenvector_centrality', max_iter=1000) #Influence globale dans le réseau
+    compact = obtenir_metrique(G, 'graphe_compact')
+    etiquettes = obtenir_metrique(G, 'communautes', resolution=resolution, seed=42) #Détection de communautés par la méthode de Louvain
+    analyse['communaute_noeud'] = etiquettes #Numéro de communauté de chaque nœud (ordre de G.nodes()), 0 = la plus grande
+    analyse['communautes'] = listes_communautes(compact, etiquettes)
+    analyse['nb_communautes'] = len(analyse['communautes'])
+    analyse['modularite'] = modularite_compact(compact, etiquettes, resolution) #la qualité de la séparation des communautés
   ## Identification des utilisateurs influents  
-    # Top 5 selon la centralité de degré
-    top_degree = sorted(analyse['degree_centrality'].items(), key=lambda x: x[1], reverse=True)[:5]
-    # Top 5 selon la centralité d’intermédiaire
-    top_betweenness = sorted(analyse['betweenness_centrality'].items(), key=lambda x: x[1], reverse=True)[:5]
+    # Top k selon la centralité de degré
+    top_degree = heapq.nlargest(top_k, analyse['degree_centrality'].items(), key=lambda x: x[1])
+    # Top k selon la centralité d’intermédiaire
+    top_betweenness = heapq.nlargest(top_k, analyse['betweenness_centrality'].items(), key=lambda x: x[1])
     #Utilisateurs les plus influents
     analyse['top_degree'] = [(G.nodes[n]['nom'], round(v, 3)) for n, v in top_degree]
     analyse['top_betweenness'] = [(G.nodes[n]['nom'], round(v, 3)) for n, v in top_betweenness]
     return analyse
     ##   Affiche un rapport détaillé de l’analyse dans la console.
+@instrumenter
 def afficher_rapport_analyse(analyse, G):
     print("=" * 60)
     print("RAPPORT D'ANALYSE DU RESEAU SOCIAL")
@@ -46,6 +75,10 @@ def afficher_rapport_analyse(analyse, G):
     print(f"Densite du reseau: {analyse['densite']:.4f}")
     print(f"Diametre: {analyse['diametre']}")
     print(f"Rayon: {analyse['rayon']}")
+    if analyse['nb_composantes'] > 1:
+        print(f"Composantes connexes: {analyse['nb_composantes']}")
+        for i, comp in enumerate(analyse['composantes'][:5]):
+            print(f"  Composante {i+1}: {comp['taille']} noeuds, diametre {comp['diametre']}, rayon {comp['rayon']}")
     print(f"Degre moyen: {analyse['degre_moyen']:.2f}")
     print("\nCLUSTERING")
     print("-" * 40)
@@ -63,16 +96,32 @@ def afficher_rapport_analyse(analyse, G):
     print("Par degre de connexion:")
     for nom, score in analyse['top_degree']:
         print(f"  - {nom}: {score}")
-    print("\nPar centralite d'intermediarite:")
+    if analyse.get('mode') == 'approchee':
+        print(f"\nPar centralite d'intermediarite (estimation sur {analyse['nb_pivots']} pivots, "
+              f"erreur +/- {analyse['erreur_betweenness']:.4f}):")
+    else:
+        print("\nPar centralite d'intermediarite:")
     for nom, score in analyse['top_betweenness']:
         print(f"  - {nom}: {score}")
     print("\n" + "=" * 60)
 
-def visualiser_metriques(G, analyse): #Génère 4 visualisations graphiques
+@instrumenter
+def visualiser_metriques(G, analyse, pos=None, vue=None, nom_fichier="analyse_metriques"): #Génère 4 visualisations graphiques (pos : positions du panneau des communautés)
+    # vue : paramètres de extraire_vue (ou vue déjà extraite) ; les 4 graphiques ne portent que sur ses nœuds,
+    # avec les métriques du réseau complet, et le layout n'est calculé que sur la vue
+    import matplotlib.pyplot as plt #import différé : le rapport texte n'en a pas besoin
+    complet = G
     fig, axes = plt.subplots(2, 2, figsize=(14, 12))
+    if vue is not None:
+        G = obtenir_vue(complet, vue)
+        analyse = restreindre_analyse(analyse, G)
+        fig.suptitle(G.graph['vue'], fontsize=12)
     # Graphique 1 : Distribution des degrés
     ax1 = axes[0, 0]
-    degrees = [d for n, d in G.degree()]
+    if vue is None:
+        degrees = [d for n, d in G.degree()]
+    else:
+        degrees = obtenir_metrique(complet, 'degres')[G.graph['origine']].tolist() #Degrés dans le réseau complet
     ax1.hist(degrees, bins=range(min(degrees), max(degrees)+2), edgecolor='black', alpha=0.7, color='#3498db') #Montre la répartition des connexions
     ax1.set_xlabel('Degre')
     ax1.set_ylabel('Frequence')
@@ -89,40 +138,41 @@ def visualiser_metriques(G, analyse): #Génère 4 visualisations graphiques
     width = 0.35
     ax2.bar([i - width/2 for i in x], dc, width, label='Degre', alpha=0.8)
     ax2.bar([i + width/2 for i in x], bc, width, label='Intermediarite', alpha=0.8)
-    ax2.set_xticks(x)
-    ax2.set_xticklabels(noms, rotation=45, ha='right', fontsize=7)
+    if len(nodes) <= SEUIL_LABELS: #Au-delà, noms illisibles et coûteux à dessiner
+        ax2.set_xticks(x)
+        ax2.set_xticklabels(noms, rotation=45, ha='right', fontsize=7)
     ax2.set_ylabel('Centralite')
     ax2.set_title('Comparaison des Centralites')
     ax2.legend()
      # Graphique 3 : Clustering
     ax3 = axes[1, 0]
-    clustering = nx.clustering(G)
-    clust_values = [clustering[n] for n in nodes]
+    if vue is None:
+        clustering = obtenir_metrique(G, 'clustering')
+        clust_values = [clustering[n] for n in nodes]
+    else:
+        clust_values = obtenir_metrique(complet, 'triangles_clustering')[1][G.graph['origine']] #Clustering dans le réseau complet
     colors = ['#FF6B6B' if G.nodes[n]['groupe'] == 'Etudiants' else '#4ECDC4' if G.nodes[n]['groupe'] == 'Professionnels' else '#FFE66D' for n in nodes]
     ax3.bar(x, clust_values, color=colors, alpha=0.8, edgecolor='black')
-    ax3.set_xticks(x)
-    ax3.set_xticklabels(noms, rotation=45, ha='right', fontsize=7)
+    if len(nodes) <= SEUIL_LABELS: #Au-delà, noms illisibles et coûteux à dessiner
+        ax3.set_xticks(x)
+        ax3.set_xticklabels(noms, rotation=45, ha='right', fontsize=7)
     ax3.set_ylabel('Coefficient de Clustering')
     ax3.set_title('Clustering par Utilisateur')
     ax3.axhline(analyse['clustering_moyen'], color='red', linestyle='--', label=f"Moyenne: {analyse['clustering_moyen']:.2f}")
     ax3.legend()
     # Graphique 4 : Visualisation du réseau et communautés
     ax4 = axes[1, 1]
-    pos = nx.spring_layout(G, seed=42)
-    couleurs_comm = plt.cm.Set3(np.linspace(0, 1, len(analyse['communautes'])))
-    node_colors = []
-    for node in G.nodes():
-        for i, comm in enumerate(analyse['communautes']):
-            if node in comm:
-                node_colors.append(couleurs_comm[i])
-                break
-    nx.draw_networkx_nodes(G, pos, node_color=node_colors, node_size=300, alpha=0.8, ax=ax4)
-    nx.draw_networkx_edges(G, pos, alpha=0.4, ax=ax4)
-    labels = {n: G.nodes[n]['nom'] for n in G.nodes()}
-    nx.draw_networkx_labels(G, pos, labels, font_size=6, ax=ax4)
+    if pos is None:
+        pos = layout_partage(G) #Même layout que la figure "spring", calculé une seule fois (sur la vue s'il y en a une)
+    couleurs_comm = plt.cm.Set3(np.linspace(0, 1, analyse['nb_communautes']))
+    node_colors = couleurs_comm[analyse['communaute_noeud']] #Une couleur par nœud en O(N)
+    labels = {n: G.nodes[n]['nom'] for n in G.nodes()} if G.number_of_nodes() <= SEUIL_LABELS else None
+    dessiner_graphe(G, pos, ax=ax4, node_color=node_colors, node_size=300, alpha_noeuds=0.8,
+                    alpha_aretes=0.4, labels=labels, font_size=6)
     ax4.set_title(f"Communautes Detectees ({analyse['nb_communautes']} communautes)")
     ax4.axis('off')
     #Sauvegarde de la figure
     plt.tight_layout()
-    plt.savefig("output/images/analyse_metriques.png", dpi=300, bbox_inches='tight')
+    with section("savefig", G):
+        plt.savefig(f"output/images/{nom_fichier}.png", dpi=300, bbox_inches='tight')
     plt.close()
\ No newline at end of file
@@ -0,0 +1,111 @@
+# src/cache_layouts.py
+# Cache disque des positions des layouts, d'une exécution à l'autre.
+# Clé : nom du layout + paramètres + empreinte du graphe.
+# Si le graphe a peu changé depuis une exécution précédente, les positions en cache servent
+# de point de départ (démarrage à chaud) au lieu de tout recalculer.
+# Le dossier est borné en taille : les entrées les moins récemment utilisées sont supprimées.
+
+import os                       # Fichiers du cache et dates d'accès
+import glob                     # Recherche des entrées d'un même layout
+import hashlib                  # Empreintes du graphe et des paramètres
+import tempfile                 # Fichier temporaire propre à chaque écriture
+import numpy as np              # Positions stockées en .npz
+from src.cache_metriques import obtenir_metrique
+
+
+DOSSIER_CACHE = "output/cache_layouts"
+TAILLE_MAX_OCTETS = 500 * 1024 ** 2  # Taille maximale du dossier de cache
+SEUIL_RECOUVREMENT = 0.9             # Part minimale de nœuds communs pour un démarrage à chaud
+NB_CANDIDATS = 5                     # Entrées récentes examinées pour un démarrage à chaud
+
+
+def _identifiants(noeuds):
+    # Identifiants relisibles sans pickle : entiers ou chaînes
+    noeuds = np.asarray(noeuds)
+    return noeuds.astype(np.int64) if noeuds.dtype.kind in 'iu' else noeuds.astype(str)
+
+
+def empreinte_graphe(G):
+    """Empreinte des nœuds et des arêtes du graphe (à partir de sa représentation CSR)."""
+    C = obtenir_metrique(G, 'graphe_compact')
+    h = hashlib.blake2b(digest_size=16)
+    for tableau in (_identifiants(C['noeuds']), C['indptr'], C['indices']):
+        h.update(np.ascontiguousarray(tableau).tobytes())
+    return h.hexdigest()
+
+
+def _empreinte_parametres(parametres):
+    return hashlib.blake2b(repr(sorted(parametres.items())).encode(), digest_size=8).hexdigest()
+
+
+def _lire(chemin):
+    with np.load(chemin) as donnees:
+        return donnees['noeuds'], donnees['positions']
+
+
+def _ecrire(chemin, noeuds, positions):
+    # Nom temporaire unique : deux processus peuvent écrire la même entrée en même temps
+    # (suffixe .tmp : jamais pris pour une entrée du cache par les recherches *.npz)
+    descripteur, temporaire = tempfile.mkstemp(dir=os.path.dirname(chemin), suffix=".tmp")
+    try:
+        with os.fdopen(descripteur, 'wb') as f:
+            np.savez(f, noeuds=_identifiants(noeuds), positions=positions)
+        os.replace(temporaire, chemin)
+    except BaseException:
+        os.remove(temporaire)
+        raise
+
+
+def _meilleur_candidat(fichiers, noeuds):
+    # Entrée récente partageant le plus de nœuds avec le graphe actuel (au moins SEUIL_RECOUVREMENT)
+    actuels = _identifiants(noeuds)
+    meilleur, recouvrement_max = None, SEUIL_RECOUVREMENT
+    for chemin in sorted(fichiers, key=os.path.getmtime, reverse=True)[:NB_CANDIDATS]:
+        anciens, positions = _lire(chemin)
+        if anciens.dtype.kind != actuels.dtype.kind:
+            continue
+        recouvrement = np.isin(actuels, anciens).mean()
+        if recouvrement >= recouvrement_max:
+            meilleur, recouvrement_max = (anciens, positions), recouvrement
+    return meilleur
+
+
+def nettoyer_cache(dossier=DOSSIER_CACHE, taille_max=TAILLE_MAX_OCTETS):
+    """Supprime les entrées les moins récemment utilisées tant que le dossier dépasse taille_max."""
+    fichiers = sorted(glob.glob(os.path.join(dossier, "*.npz")), key=os.path.getmtime)
+    total = sum(os.path.getsize(f) for f in fichiers)
+    while fichiers and total > taille_max:
+        chemin = fichiers.pop(0)
+        total -= os.path.getsize(chemin)
+        os.remove(chemin)
+
+
+def layout_en_cache(G, nom, calcul, demarrage_a_chaud=False, dossier=DOSSIER_CACHE,
+                    taille_max=TAILLE_MAX_OCTETS, **parametres):
+    """
+    Retourne les positions du layout `nom` de G, en passant par le cache disque.
+    - calcul(G, **parametres) calcule le layout ; si demarrage_a_chaud, il accepte aussi
+      pos_initiales={noeud: position} et n'itère que jusqu'à convergence
+    - une entrée identique (même graphe, mêmes paramètres) est relue telle quelle ;
+      sinon, une entrée récente du même layout sur un graphe proche sert de point de départ
+    """
+    os.makedirs(dossier, exist_ok=True)
+    noeuds = list(G.nodes())
+    prefixe = os.path.join(dossier, f"{nom}_{_empreinte_parametres(parametres)}_")
+    chemin = prefixe + empreinte_graphe(G) + ".npz"
+
+    if os.path.exists(chemin):
+        os.utime(chemin)  # Date d'accès pour l'éviction LRU
+        _, positions = _lire(chemin)
+        return dict(zip(noeuds, positions))
+
+    candidat = _meilleur_candidat(glob.glob(prefixe + "*.npz"), noeuds) if demarrage_a_chaud else None
+    if candidat is not None:
+        anciens, positions = candidat
+        pos = calcul(G, pos_initiales=dict(zip(anciens.tolist(), positions)), **parametres)
+    else:
+        pos = calcul(G, **parametres)
+
+    _ecrire(chemin, noeuds, np.array([pos[n] for n in noeuds]))
+    nettoyer_cache(dossier, taille_max)
+    return pos
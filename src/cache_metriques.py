@@ -0,0 +1,286 @@
+# src/cache_metriques.py
+# Cache partagé des métriques du graphe : chaque métrique n'est calculée
+# qu'une seule fois par version du graphe, puis réutilisée par tous les
+# modules (analyse, réduction de dimension, visualisations).
+# Les structures du cache sont protégées par un verrou : le service (src/service.py) construit
+# les index d'un nouvel instantané dans un autre fil ; les calculs eux-mêmes se font hors verrou.
+
+import weakref                      # Pour oublier un graphe dès qu'il est détruit
+import itertools                    # Parcours des listes d'adjacence sans boucle Python
+import threading                    # Verrou des structures du cache
+import numpy as np                  # Comparaison de la représentation CSR au graphe
+from collections import OrderedDict # Pour l'éviction LRU
+from scipy.sparse.csgraph import connected_components  # Composantes connexes sur CSR
+from src.centralite import balayage_plus_courts_chemins  # Un seul balayage BFS pour plusieurs métriques
+from src.graphe_compact import (creer_graphe_compact, nb_noeuds, nb_aretes, en_dictionnaire,
+                                degres_compact, degree_centrality_compact, clustering_compact,
+                                pagerank_compact, matrice_adjacence)  # Noyaux vectorisés sur CSR
+from src.communautes import louvain_compact  # Communautés (tableau nœud -> communauté)
+from src.spectral import spectre_laplacien, vecteur_propre_dominant  # Solveur creux de vecteurs propres
+
+
+# Nombre maximal de valeurs conservées, toutes métriques et tous graphes confondus
+# (un dictionnaire {noeud: score} compte pour autant de valeurs que de noeuds)
+TAILLE_MAX = 5_000_000
+
+
+def _depuis_balayage(cle):
+    # Extrait une métrique du balayage des plus courts chemins (calculé une seule fois)
+    def calcul(G):
+        return obtenir_metrique(G, 'plus_courts_chemins')[cle]
+    return calcul
+
+
+def _meme_structure(C, G):
+    # Vrai si le graphe compact C a exactement les nœuds (dans le même ordre) et les arêtes de G.
+    # Vérification vectorisée, bien moins coûteuse qu'une reconstruction ; une arête remplacée
+    # par une autre (mêmes effectifs) est détectée. Les attributs des nœuds ne sont pas comparés.
+    n = G.number_of_nodes()
+    if nb_noeuds(C) != n or nb_aretes(C) != G.number_of_edges():
+        return False
+    noeuds = C['noeuds']
+    if noeuds.dtype.kind not in 'iuU' or list(G._adj) != noeuds.tolist():
+        return False
+    degres = np.fromiter(map(len, G._adj.values()), dtype=np.int64, count=n)
+    if not np.array_equal(degres, np.diff(C['indptr'])):
+        return False
+    voisins = itertools.chain.from_iterable(G._adj.values())
+    if noeuds.dtype.kind == 'U':
+        voisins = np.array(list(voisins), dtype=noeuds.dtype)
+    else:
+        voisins = np.fromiter(voisins, dtype=noeuds.dtype, count=int(degres.sum()))
+    tri = np.argsort(noeuds, kind='stable')
+    indices = tri[np.minimum(np.searchsorted(noeuds[tri], voisins), n - 1)]
+    if not np.array_equal(noeuds[indices], voisins):
+        return False
+    lignes = np.repeat(np.arange(n, dtype=np.int64), degres) * n
+    return np.array_equal(np.sort(lignes + indices), lignes + C['indices'])
+
+
+def _graphe_compact(G):
+    # Réutilise la représentation CSR d'origine si G en est la vue NetworkX et n'a pas été modifié
+    # (sinon elle est oubliée et reconstruite). Après une modification des seuls attributs des nœuds,
+    # appeler invalider_cache(G).
+    C = G.graph.get('compact')
+    if C is not None:
+        if _meme_structure(C, G):
+            return C
+        del G.graph['compact']
+    return creer_graphe_compact(G)
+
+
+def _compact(G):
+    return obtenir_metrique(G, 'graphe_compact')
+
+
+def _clustering(G):
+    return en_dictionnaire(_compact(G), obtenir_metrique(G, 'triangles_clustering')[1])
+
+
+def _average_clustering(G):
+    return float(obtenir_metrique(G, 'triangles_clustering')[1].mean())
+
+
+def _transitivity(G):
+    # 3 x triangles / triades connexes, comme nx.transitivity
+    triangles, _ = obtenir_metrique(G, 'triangles_clustering')
+    d = obtenir_metrique(G, 'degres').astype(float)
+    triades = (d * (d - 1)).sum()
+    return float(2 * triangles.sum() / triades) if triades > 0 else 0.0
+
+
+def _composantes_connexes(G):
+    # Numéro de composante connexe de chaque nœud (ordre de G.nodes())
+    return connected_components(matrice_adjacence(_compact(G)), directed=False)[1]
+
+
+def _communautes(G, **params):
+    # Partition de Louvain ; après une modification incrémentale (src/incremental.py),
+    # la partition précédente sert de point de départ
+    precedente = G.graph.get('communautes_precedentes', {}).pop(tuple(sorted(params.items())), None)
+    return louvain_compact(_compact(G), partition_initiale=precedente, **params)
+
+
+def _spectre_laplacien(G, **params):
+    # Démarrage à chaud depuis les vecteurs de la version précédente du graphe, s'il y en a une
+    precedente = valeur_precedente(G, 'spectre_laplacien', **params)
+    return spectre_laplacien(_compact(G), vecteurs_initiaux=None if precedente is None else precedente[1], **params)
+
+
+def _vecteur_propre_adjacence(G, **params):
+    return vecteur_propre_dominant(_compact(G), vecteur_initial=valeur_precedente(G, 'vecteur_propre_adjacence', **params),
+                                   **params)
+
+
+# Fonctions de calcul connues du cache : nom -> fonction(G, **params)
+METRIQUES = {
+    'graphe_compact': _graphe_compact,
+    'index_noeuds': lambda G: {noeud: i for i, noeud in enumerate(G.nodes())},
+    'degres': lambda G: degres_compact(_compact(G)),
+    'degree_centrality': lambda G: en_dictionnaire(_compact(G), degree_centrality_compact(_compact(G))),
+    'plus_courts_chemins': balayage_plus_courts_chemins,
+    'betweenness_centrality': _depuis_balayage('betweenness'),
+    'closeness_centrality': _depuis_balayage('closeness'),
+    'eccentricite': _depuis_balayage('eccentricite'),
+    'spectre_laplacien': _spectre_laplacien,
+    'vecteur_propre_adjacence': _vecteur_propre_adjacence,
+    'eigenvector_centrality': lambda G, **p: en_dictionnaire(_compact(G), obtenir_metrique(G, 'vecteur_propre_adjacence', **p)),
+    'pagerank': lambda G, **p: en_dictionnaire(_compact(G), pagerank_compact(_compact(G), **p)),
+    'triangles_clustering': lambda G: clustering_compact(_compact(G)),
+    'clustering': _clustering,
+    'average_clustering': _average_clustering,
+    'transitivity': _transitivity,
+    'composantes_connexes': _composantes_connexes,
+    'communautes': _communautes,
+}
+
+_entrees = OrderedDict()  # (id(G), nom, params) -> (version, valeur, taille), du plus ancien au plus récent
+_graphes_suivis = {}      # id(G) -> finaliseur weakref (purge du cache à la destruction du graphe)
+_taille_totale = 0
+_statistiques = {'succes': 0, 'echecs': 0, 'evictions': 0}
+_verrou = threading.RLock()  # Réentrant : un finaliseur (_purger) peut s'exécuter pendant une section verrouillée
+
+
+def enregistrer_metrique(nom, calcul):
+    """
+    Déclare (ou remplace) la fonction de calcul d'une métrique.
+    calcul(G, **params) doit retourner la valeur à mettre en cache.
+    """
+    METRIQUES[nom] = calcul
+
+
+def version_graphe(G):
+    """
+    Signature peu coûteuse de l'état du graphe : nombre de noeuds,
+    nombre d'arêtes et compteur de modifications explicites.
+    Un ajout ou une suppression change la signature ; pour une modification
+    qui conserve les effectifs (ex. remplacer une arête), appeler invalider_cache(G).
+    """
+    return (G.number_of_nodes(), G.number_of_edges(), G.graph.get('version_cache', 0))
+
+
+def _taille(valeur):
+    # Estimation du nombre de valeurs stockées
+    if hasattr(valeur, 'size'):
+        return int(valeur.size)
+    if isinstance(valeur, tuple):
+        return sum(_taille(v) for v in valeur)
+    if isinstance(valeur, dict):
+        return max(sum(_taille(v) for v in valeur.values()), 1)
+    if isinstance(valeur, (list, set)):
+        return max(len(valeur), 1)
+    return 1
+
+
+def _suivre(G):
+    # Purge automatique des entrées quand le graphe est détruit (évite la réutilisation d'id)
+    cle = id(G)
+    if cle not in _graphes_suivis:
+        _graphes_suivis[cle] = weakref.finalize(G, _purger, cle)
+
+
+def _supprimer_entrees(cle_graphe):
+    global _taille_totale
+    for cle in [c for c in _entrees if c[0] == cle_graphe]:
+        _taille_totale -= _entrees.pop(cle)[2]
+
+
+def _purger(cle_graphe):
+    with _verrou:
+        _supprimer_entrees(cle_graphe)
+        _graphes_suivis.pop(cle_graphe, None)
+
+
+def _evincer():
+    # Supprime les entrées les moins récemment utilisées jusqu'à repasser sous TAILLE_MAX
+    # (l'entrée la plus récente est toujours conservée)
+    global _taille_totale
+    while _taille_totale > TAILLE_MAX and len(_entrees) > 1:
+        _, (_, _, taille) = _entrees.popitem(last=False)
+        _taille_totale -= taille
+        _statistiques['evictions'] += 1
+
+
+def obtenir_metrique(G, nom, calcul=None, **params):
+    """
+    Retourne la métrique `nom` du graphe G, calculée une seule fois par version du graphe.
+    - calcul : fonction(G, **params) à utiliser si la métrique n'est pas enregistrée
+    - params : paramètres de la métrique (font partie de la clé du cache)
+    La valeur retournée est partagée : elle ne doit pas être modifiée par l'appelant.
+    """
+    cle = (id(G), nom, tuple(sorted(params.items())))
+    version = version_graphe(G)
+
+    with _verrou:
+        entree = _entrees.get(cle)
+        if entree is not None and entree[0] == version:
+            _entrees.move_to_end(cle)
+            _statistiques['succes'] += 1
+            return entree[1]
+        _statistiques['echecs'] += 1
+
+    if calcul is None:
+        calcul = METRIQUES[nom]
+    valeur = calcul(G, **params)
+    deposer_metrique(G, nom, valeur, **params)
+    return valeur
+
+
+def valeur_precedente(G, nom, **params):
+    """
+    Dernière valeur connue de la métrique, même si le graphe a changé depuis (None si absente).
+    Sert de point de départ aux calculs itératifs après une petite modification du graphe.
+    """
+    with _verrou:
+        entree = _entrees.get((id(G), nom, tuple(sorted(params.items()))))
+    return None if entree is None else entree[1]
+
+
+def deposer_metrique(G, nom, valeur, **params):
+    """
+    Place dans le cache une métrique déjà connue (ex. relue depuis un instantané),
+    pour la version actuelle du graphe.
+    """
+    global _taille_totale
+    cle = (id(G), nom, tuple(sorted(params.items())))
+    taille = _taille(valeur)
+    with _verrou:
+        if cle in _entrees:
+            _taille_totale -= _entrees.pop(cle)[2]
+        _suivre(G)
+        _entrees[cle] = (version_graphe(G), valeur, taille)
+        _taille_totale += taille
+        _evincer()
+
+
+def invalider_cache(G=None):
+    """
+    Crochet d'invalidation à appeler après une modification du graphe.
+    Sans argument, vide entièrement le cache.
+    """
+    global _taille_totale
+    with _verrou:
+        if G is None:
+            _entrees.clear()
+            _taille_totale = 0
+            return
+        G.graph['version_cache'] = G.graph.get('version_cache', 0) + 1
+        G.graph.pop('compact', None)  # La représentation CSR d'origine ne correspond plus au graphe
+        _supprimer_entrees(id(G))
+
+
+def metriques_en_cache(G):
+    """
+    Métriques de G présentes dans le cache : liste de (nom, params, a_jour).
+    Une entrée qui n'est plus à jour sera recalculée au prochain accès.
+    """
+    version = version_graphe(G)
+    with _verrou:
+        return [(nom, dict(params), entree[0] == version)
+                for (cle_graphe, nom, params), entree in _entrees.items() if cle_graphe == id(G)]
+
+
+def statistiques_cache():
+    """Retourne le nombre de succès, d'échecs, d'évictions et la taille occupée du cache."""
+    with _verrou:
+        return dict(_statistiques, entrees=len(_entrees), taille=_taille_totale)
@@ -0,0 +1,95 @@
+# src/caracteristiques.py
+# Matrice de caractéristiques des nœuds (une ligne par nœud, une colonne par caractéristique),
+# utilisée par la PCA et le t-SNE.
+# La matrice est préallouée (float64 ou float32, en mémoire ou projetée sur disque avec np.memmap)
+# et remplie colonne par colonne, par blocs de nœuds : aucune liste Python intermédiaire.
+# Les colonnes sont enregistrées dans COLONNES ; chacune s'appuie sur les métriques du cache partagé,
+# si bien qu'ajouter une colonne ne reparcourt pas le graphe pour les autres.
+
+import numpy as np                      # Matrice préallouée
+import networkx as nx                   # k-cœurs
+from src.cache_metriques import obtenir_metrique
+
+
+TAILLE_BLOC = 100_000  # Nœuds écrits à la fois dans la matrice
+
+
+def _depuis_dictionnaire(nom, calcul=None):
+    # Colonne tirée d'une métrique {noeud: valeur} du cache
+    def colonne(G, noeuds, bloc):
+        valeurs = obtenir_metrique(G, nom, calcul=calcul)
+        return np.fromiter((valeurs[n] for n in noeuds[bloc]), dtype=float)
+    return colonne
+
+
+def _depuis_tableau(nom, indice=None):
+    # Colonne tirée d'une métrique du cache déjà sous forme de tableau aligné sur G.nodes()
+    def colonne(G, noeuds, bloc):
+        valeurs = obtenir_metrique(G, nom)
+        return (valeurs if indice is None else valeurs[indice])[bloc]
+    return colonne
+
+
+def _degree_centrality(G, noeuds, bloc):
+    n = len(noeuds)
+    return obtenir_metrique(G, 'degres')[bloc] / (n - 1) if n > 1 else np.ones(n)[bloc]
+
+
+def _age(G, noeuds, bloc):
+    # Attribut "age" des utilisateurs (-1 si inconnu)
+    return np.fromiter((G.nodes[n].get('age', -1) for n in noeuds[bloc]), dtype=float)
+
+
+# Colonnes disponibles : nom -> fonction(G, noeuds, bloc) retournant les valeurs des nœuds noeuds[bloc]
+# (noeuds = liste des nœuds dans l'ordre de G.nodes(), bloc = tranche de cette liste)
+COLONNES = {
+    'degree_centrality': _degree_centrality,                                   # Importance selon le nombre de connexions
+    'betweenness_centrality': _depuis_dictionnaire('betweenness_centrality'),  # Rôle de pont dans le graphe
+    'closeness_centrality': _depuis_dictionnaire('closeness_centrality'),      # Proximité avec les autres nœuds
+    'clustering': _depuis_tableau('triangles_clustering', 1),                  # Niveau de regroupement local
+    'degre': _depuis_tableau('degres'),                                        # Nombre réel de connexions
+    'pagerank': _depuis_dictionnaire('pagerank'),                              # Influence par marche aléatoire
+    'k_coeur': _depuis_dictionnaire('k_coeur', calcul=nx.core_number),         # Appartenance au cœur dense du réseau
+    'age': _age,                                                               # Attribut des utilisateurs
+}
+
+# Colonnes utilisées par défaut (celles de la matrice d'origine, dans le même ordre)
+COLONNES_DEFAUT = ('degree_centrality', 'betweenness_centrality', 'closeness_centrality', 'clustering', 'degre')
+
+# Colonnes par défaut d'un grand graphe : sans les centralités exactes
+# (balayage de tous les plus courts chemins, en O(n·m))
+COLONNES_GRAND = ('degree_centrality', 'clustering', 'degre', 'pagerank')
+
+
+def enregistrer_colonne(nom, calcul):
+    """
+    Déclare (ou remplace) une colonne de caractéristiques.
+    calcul(G, noeuds, bloc) doit retourner les valeurs des nœuds noeuds[bloc]
+    (noeuds : liste des nœuds dans l'ordre de G.nodes(), bloc : tranche de cette liste).
+    """
+    COLONNES[nom] = calcul
+
+
+def construire_matrice(G, colonnes=COLONNES_DEFAUT, dtype='float64', chemin=None, taille_bloc=TAILLE_BLOC):
+    """
+    Construit la matrice n x len(colonnes) des caractéristiques des nœuds de G.
+    - dtype : 'float64' ou 'float32' (moitié moins de mémoire)
+    - chemin : fichier .npy ; la matrice est alors projetée sur disque (np.memmap) au lieu d'être en mémoire
+    Retourne (matrice, liste des nœuds).
+    """
+    nodes = list(G.nodes())
+    forme = (len(nodes), len(colonnes))
+    if chemin is None:
+        matrice = np.empty(forme, dtype=dtype)
+    else:
+        matrice = np.lib.format.open_memmap(chemin, mode='w+', dtype=dtype, shape=forme)
+
+    # Calcul et écriture par blocs de nœuds : seules les valeurs d'un bloc existent hors de la matrice
+    for debut in range(0, len(nodes), taille_bloc):
+        bloc = slice(debut, debut + taille_bloc)
+        for j, nom in enumerate(colonnes):
+            matrice[bloc, j] = COLONNES[nom](G, nodes, bloc)
+
+    if chemin is not None:
+        matrice.flush()
+    return matrice, nodes
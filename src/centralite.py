@@ -0,0 +1,371 @@
+# src/centralite.py
+# Centralités d'intermédiarité et de proximité par parcours en largeur (algorithme de Brandes),
+# avec un mode approché par échantillonnage de pivots pour les grands graphes.
+# Le balayage exact est réparti sur plusieurs processus au-delà de SEUIL_PARALLELE nœuds :
+# l'adjacence (CSR) est placée une seule fois en mémoire partagée et lue sans copie par chaque processus.
+
+import os            # Nombre de cœurs
+import itertools     # Concaténation des listes de voisins
+import numpy as np   # Calcul numérique (accumulation des contributions)
+import random        # Tirage des pivots
+
+
+Z_95 = 1.96  # Quantile de la loi normale pour un intervalle de confiance à 95 %
+
+SEUIL_PARALLELE = 2000   # Nombre de nœuds à partir duquel le balayage exact est parallèle
+NB_PROCESSUS = None      # Processus du balayage parallèle (None = tous les cœurs disponibles)
+NB_BLOCS = 64            # Blocs de sources au plus : un tableau de dépendances renvoyé par bloc
+                         # (de quoi équilibrer la charge sur une trentaine de cœurs)
+
+# Adjacence partagée, ouverte une fois par processus du balayage parallèle
+_PARTAGE = {}
+
+
+def indexer_graphe(G):
+    """
+    Convertit le graphe en listes d'adjacence indexées par des entiers 0..n-1.
+    Retourne (noeuds, voisins) où voisins[i] est la liste des indices voisins du nœud noeuds[i].
+    """
+    noeuds = list(G.nodes())
+    index = {n: i for i, n in enumerate(noeuds)}
+    voisins = [[index[v] for v in G[n] if v != n] for n in noeuds]
+    return noeuds, voisins
+
+
+def _adjacence_csr(voisins):
+    # Listes d'adjacence -> (indptr, indices) : voisins de i = indices[indptr[i]:indptr[i + 1]]
+    n = len(voisins)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, voisins), dtype=np.int64, count=n), out=indptr[1:])
+    indices = np.fromiter(itertools.chain.from_iterable(voisins), dtype=np.int32, count=int(indptr[-1]))
+    return indptr, indices
+
+
+def _bfs_brandes(indptr, indices, s):
+    """
+    Parcours en largeur depuis s (phase 1 de Brandes) sur l'adjacence CSR (indptr, indices),
+    lue par tranches : des memoryview, pour obtenir des entiers Python sans copie.
+    Retourne l'ordre de visite, les prédécesseurs, le nombre de plus courts chemins et les distances.
+    """
+    n = len(indptr) - 1
+    dist = [-1] * n
+    sigma = [0] * n
+    pred = [[] for _ in range(n)]
+    dist[s] = 0
+    sigma[s] = 1
+    ordre = [s]
+    i = 0
+    while i < len(ordre):
+        v = ordre[i]
+        i += 1
+        dv = dist[v] + 1
+        for w in indices[indptr[v]:indptr[v + 1]]:
+            if dist[w] < 0:
+                dist[w] = dv
+                ordre.append(w)
+            if dist[w] == dv:
+                sigma[w] += sigma[v]
+                pred[w].append(v)
+    return ordre, pred, sigma, dist
+
+
+def _dependances(ordre, pred, sigma, s):
+    """Phase 2 de Brandes : dépendances delta_s(v) accumulées en ordre inverse de visite."""
+    delta = [0.0] * len(sigma)
+    for w in reversed(ordre):
+        coeff = (1.0 + delta[w]) / sigma[w]
+        for v in pred[w]:
+            delta[v] += sigma[v] * coeff
+    delta[s] = 0.0
+    return delta
+
+
+def _echelle_betweenness(n):
+    # Même normalisation que nx.betweenness_centrality(G, normalized=True) pour un graphe non orienté
+    return 1.0 / ((n - 1) * (n - 2)) if n > 2 else 0.0
+
+
+def _separation_top_k(scores, erreurs, top_k):
+    # Vrai si les top_k premiers sont séparés des suivants compte tenu des intervalles de confiance
+    if top_k is None or top_k >= len(scores):
+        return False
+    ordre = np.argsort(-scores)
+    haut, bas = ordre[:top_k], ordre[top_k:]
+    return np.min(scores[haut] - erreurs[haut]) > np.max(scores[bas] + erreurs[bas])
+
+
+def centralites_approchees(G, echantillon=None, tolerance=0.01, top_k=None, taille_lot=32, seed=42):
+    """
+    Estime les centralités d'intermédiarité et de proximité à partir d'un échantillon de pivots.
+    - echantillon : nombre maximal de pivots (None = tous les nœuds, soit le calcul exact)
+    - tolerance : demi-largeur visée de l'intervalle de confiance à 95 % (pire nœud)
+    - top_k : si fourni, s'arrête dès que les top_k nœuds par intermédiarité sont départagés
+    - taille_lot : nombre de pivots tirés entre deux tests d'arrêt
+    Les pivots sont tirés sans remise : avec echantillon = n, le résultat est exact.
+    Retourne un dictionnaire {betweenness, closeness, erreur_betweenness, erreur_closeness, nb_pivots}.
+    """
+    noeuds, voisins = indexer_graphe(G)
+    indptr, indices = map(memoryview, _adjacence_csr(voisins))
+    n = len(noeuds)
+    if n == 0:
+        return {'betweenness': {}, 'closeness': {}, 'erreur_betweenness': 0.0,
+                'erreur_closeness': 0.0, 'nb_pivots': 0}
+    budget = n if echantillon is None else max(1, min(echantillon, n))
+    pivots = list(range(n))
+    random.Random(seed).shuffle(pivots)
+
+    # Sommes (et sommes des carrés) des contributions par pivot
+    somme_delta = np.zeros(n)
+    somme_delta2 = np.zeros(n)
+    somme_dist = np.zeros(n)
+    somme_dist2 = np.zeros(n)
+    somme_atteint = np.zeros(n)
+    echelle = _echelle_betweenness(n)
+
+    k = 0
+    while k < budget:
+        for s in pivots[k:min(k + taille_lot, budget)]:
+            ordre, pred, sigma, dist = _bfs_brandes(indptr, indices, s)
+            delta = np.asarray(_dependances(ordre, pred, sigma, s))
+            d = np.asarray(dist, dtype=float)
+            atteint = d > 0
+            d[~atteint] = 0.0
+            somme_delta += delta
+            somme_delta2 += delta * delta
+            somme_dist += d
+            somme_dist2 += d * d
+            somme_atteint += atteint
+        k = min(k + taille_lot, budget)
+
+        # Estimateurs sans biais (extrapolation n/k) et erreurs standard avec correction de population finie
+        correction = np.sqrt(max(n - k, 0) / (n - 1)) if n > 1 else 0.0
+        moy_delta = somme_delta / k
+        var_delta = np.maximum(somme_delta2 / k - moy_delta ** 2, 0.0)
+        betweenness = n * echelle * moy_delta
+        err_betweenness = Z_95 * n * echelle * np.sqrt(var_delta / k) * correction
+
+        total_dist = n * somme_dist / k
+        atteints = n * somme_atteint / k
+        var_dist = np.maximum(somme_dist2 / k - (somme_dist / k) ** 2, 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            closeness = np.where(total_dist > 0, atteints ** 2 / (total_dist * max(n - 1, 1)), 0.0)
+            erreur_relative = np.where(total_dist > 0, n * np.sqrt(var_dist / k) * correction / total_dist, 0.0)
+        err_closeness = Z_95 * closeness * erreur_relative
+
+        precis = err_betweenness.max() <= tolerance and err_closeness.max() <= tolerance
+        # Au moins deux lots avant de se fier à la variance empirique
+        if k >= min(2 * taille_lot, budget) and (precis or _separation_top_k(betweenness, err_betweenness, top_k)):
+            break
+
+    return {
+        'betweenness': dict(zip(noeuds, betweenness.tolist())),
+        'closeness': dict(zip(noeuds, closeness.tolist())),
+        'erreur_betweenness': float(err_betweenness.max()),
+        'erreur_closeness': float(err_closeness.max()),
+        'nb_pivots': k,
+    }
+
+
+def _composantes(voisins):
+    # Composantes connexes (listes d'indices), de la plus grande à la plus petite
+    n = len(voisins)
+    vu = [False] * n
+    composantes = []
+    for s in range(n):
+        if vu[s]:
+            continue
+        vu[s] = True
+        composante = [s]
+        i = 0
+        while i < len(composante):
+            for w in voisins[composante[i]]:
+                if not vu[w]:
+                    vu[w] = True
+                    composante.append(w)
+            i += 1
+        composantes.append(composante)
+    composantes.sort(key=len, reverse=True)
+    return composantes
+
+
+def _resume_composantes(composantes, ecc):
+    # Diamètre et rayon de chaque composante à partir des excentricités de ses nœuds
+    return [{'taille': len(c), 'diametre': max(ecc[i] for i in c), 'rayon': min(ecc[i] for i in c)}
+            for c in composantes]
+
+
+def _blocs_sources(n):
+    # Découpage fixe des sources en au plus NB_BLOCS blocs contigus, qui ne dépend que de n :
+    # les sommes partielles de chaque bloc sont additionnées dans le même ordre en séquentiel
+    # et en parallèle (résultats identiques au bit près, quel que soit le nombre de processus)
+    taille = max(1, -(-n // NB_BLOCS))
+    return [range(debut, min(debut + taille, n)) for debut in range(0, n, taille)]
+
+
+def _balayer_bloc(indptr, indices, sources):
+    """Brandes depuis chaque source du bloc : (somme des dépendances, excentricités, proximités des sources)."""
+    n = len(indptr) - 1
+    betweenness = np.zeros(n)
+    ecc, closeness = [], []
+    for s in sources:
+        ordre, pred, sigma, dist = _bfs_brandes(indptr, indices, s)
+        # ordre ne contient que la composante de s, par distance croissante
+        ecc.append(dist[ordre[-1]])
+        total = sum(dist[v] for v in ordre)
+        atteints = len(ordre) - 1
+        closeness.append(atteints / total * atteints / (n - 1) if total > 0 else 0.0)
+        betweenness += _dependances(ordre, pred, sigma, s)
+    return betweenness, ecc, closeness
+
+
+def _reduire_blocs(resultats, n):
+    # Somme des dépendances partielles dans l'ordre des blocs, concaténation des valeurs par source
+    betweenness = np.zeros(n)
+    ecc, closeness = [], []
+    for partielle, ecc_bloc, closeness_bloc in resultats:
+        betweenness += partielle
+        ecc.extend(ecc_bloc)
+        closeness.extend(closeness_bloc)
+    return betweenness, ecc, closeness
+
+
+def _ouvrir_adjacence(nom_indptr, nom_indices, n, m):
+    # Initialisation d'un processus : vues sans copie sur l'adjacence en mémoire partagée
+    from multiprocessing import shared_memory
+    memoires = [shared_memory.SharedMemory(name=nom) for nom in (nom_indptr, nom_indices)]
+    _PARTAGE['memoires'] = memoires
+    _PARTAGE['indptr'] = memoires[0].buf[:8 * (n + 1)].cast('q')
+    _PARTAGE['indices'] = memoires[1].buf[:4 * m].cast('i')
+
+
+def _balayer_bloc_partage(sources):
+    return _balayer_bloc(_PARTAGE['indptr'], _PARTAGE['indices'], sources)
+
+
+def _balayage_parallele(indptr, indices, blocs, nb_processus):
+    """
+    Balayage des blocs de sources dans nb_processus processus.
+    L'adjacence CSR est copiée une fois en mémoire partagée ; chaque processus ne reçoit que
+    des bornes de blocs et renvoie, par bloc, un seul tableau de dépendances déjà sommées.
+    """
+    from multiprocessing import shared_memory
+    from concurrent.futures import ProcessPoolExecutor
+    n, m = len(indptr) - 1, len(indices)
+    memoires = [shared_memory.SharedMemory(create=True, size=max(taille, 8)) for taille in (8 * (n + 1), 4 * m)]
+    try:
+        np.ndarray(n + 1, dtype=np.int64, buffer=memoires[0].buf)[:] = indptr
+        np.ndarray(m, dtype=np.int32, buffer=memoires[1].buf)[:] = indices
+        with ProcessPoolExecutor(max_workers=nb_processus, initializer=_ouvrir_adjacence,
+                                 initargs=(memoires[0].name, memoires[1].name, n, m)) as pool:
+            return _reduire_blocs(pool.map(_balayer_bloc_partage, blocs), n)
+    finally:
+        for memoire in memoires:
+            memoire.close()
+            memoire.unlink()
+
+
+def _nb_coeurs():
+    # Cœurs utilisables par ce processus (affinité, quotas de conteneur), et non ceux de la machine
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def balayage_plus_courts_chemins(G, nb_processus=None):
+    """
+    Un seul parcours en largeur par nœud pour obtenir à la fois :
+    excentricités, centralité de proximité, centralité d'intermédiarité (exacte),
+    ainsi que le diamètre et le rayon de chaque composante connexe.
+    Les scores sont normalisés comme nx.closeness_centrality et nx.betweenness_centrality.
+    - nb_processus : processus du balayage (par défaut NB_PROCESSUS, sinon les cœurs disponibles) ;
+      en dessous de SEUIL_PARALLELE nœuds le balayage reste séquentiel.
+      Le résultat est identique quel que soit le nombre de processus.
+    """
+    noeuds, voisins = indexer_graphe(G)
+    indptr, indices = _adjacence_csr(voisins)
+    n = len(noeuds)
+    nb_processus = nb_processus or NB_PROCESSUS or _nb_coeurs()
+    blocs = _blocs_sources(n)
+    if nb_processus > 1 and n >= SEUIL_PARALLELE:
+        betweenness, ecc, closeness = _balayage_parallele(indptr, indices, blocs, min(nb_processus, len(blocs)))
+    else:
+        vues = memoryview(indptr), memoryview(indices)
+        betweenness, ecc, closeness = _reduire_blocs((_balayer_bloc(*vues, bloc) for bloc in blocs), n)
+    betweenness = betweenness.tolist()
+    echelle = _echelle_betweenness(n)
+    composantes = _composantes(voisins)
+    return {
+        'eccentricite': dict(zip(noeuds, ecc)),
+        'closeness': dict(zip(noeuds, closeness)),
+        'betweenness': {noeuds[i]: b * echelle for i, b in enumerate(betweenness)},
+        'composantes': _resume_composantes(composantes, ecc),
+    }
+
+
+def _bfs_distances(voisins, s):
+    # Distances depuis s (-1 pour les nœuds non atteints)
+    dist = [-1] * len(voisins)
+    dist[s] = 0
+    file = [s]
+    i = 0
+    while i < len(file):
+        v = file[i]
+        i += 1
+        for w in voisins[v]:
+            if dist[w] < 0:
+                dist[w] = dist[v] + 1
+                file.append(w)
+    return dist
+
+
+def _extremites_composante(voisins, composante):
+    """
+    Diamètre et rayon exacts d'une composante par encadrement des excentricités
+    (BoundingDiameters, Takes & Kosters) : chaque parcours resserre les bornes de tous
+    les nœuds, et l'on s'arrête dès que diamètre et rayon sont déterminés.
+    Retourne (diametre, rayon, nombre de parcours effectués).
+    """
+    idx = np.asarray(composante)
+    m = len(idx)
+    if m == 1:
+        return 0, 0, 0
+    borne_inf = np.zeros(m)
+    borne_sup = np.full(m, np.inf)
+    deja = np.zeros(m, dtype=bool)
+    diam_inf, rayon_sup = 0, np.inf
+    nb_parcours = 0
+    cherche_diametre = True
+    while True:
+        diam_sup = borne_sup.max()
+        rayon_inf = borne_inf.min()
+        if diam_inf >= diam_sup and rayon_sup <= rayon_inf:
+            break
+        # Alterne entre le nœud qui peut avoir la plus grande et la plus petite excentricité
+        if cherche_diametre and diam_inf < diam_sup:
+            choix = np.where(deja, -np.inf, borne_sup).argmax()
+        else:
+            choix = np.where(deja, np.inf, borne_inf).argmin()
+        cherche_diametre = not cherche_diametre
+        deja[choix] = True
+        d = np.asarray(_bfs_distances(voisins, int(idx[choix])))[idx]
+        e = int(d.max())
+        nb_parcours += 1
+        borne_inf = np.maximum(borne_inf, np.maximum(d, e - d))
+        borne_sup = np.minimum(borne_sup, e + d)
+        diam_inf = max(diam_inf, e)
+        rayon_sup = min(rayon_sup, e)
+    return int(diam_inf), int(rayon_sup), nb_parcours
+
+
+def diametre_rayon_bornes(G):
+    """
+    Diamètre et rayon exacts de chaque composante connexe sans calculer toutes les
+    excentricités : adapté aux très grands graphes (quelques parcours par composante en pratique).
+    """
+    _, voisins = indexer_graphe(G)
+    resultats = []
+    for composante in _composantes(voisins):
+        diametre, rayon, nb_parcours = _extremites_composante(voisins, composante)
+        resultats.append({'taille': len(composante), 'diametre': diametre, 'rayon': rayon,
+                          'nb_parcours': nb_parcours})
+    return {'composantes': resultats}
@@ -0,0 +1,116 @@
+# src/chargement_flux.py
+# Chargement en flux d'une liste d'arêtes trop grande pour tenir dans un seul DataFrame :
+# le CSV (éventuellement compressé .gz) est lu par blocs de taille bornée, les identifiants
+# quelconques sont renumérotés en entiers denses, les doublons sont supprimés au fil de l'eau
+# et le résultat est un graphe compact (voir src/graphe_compact.py).
+
+import re                       # Identifiants écrits comme des entiers
+import time                     # Mesure du débit
+import numpy as np              # Tableaux d'indices et de clés d'arêtes
+import pandas as pd             # Lecture CSV par blocs (compression détectée par l'extension)
+from src.graphe_compact import graphe_depuis_aretes
+
+
+MOTIF_ENTIER = re.compile(r'-?(0|[1-9][0-9]*)')  # Écriture canonique d'un entier (ni zéro initial, ni '+', ni '²')
+
+
+def _renumeroter(valeurs, index):
+    """
+    Convertit un bloc d'identifiants en indices denses.
+    `index` (dictionnaire identifiant -> indice) est complété avec les nouveaux identifiants ;
+    seules les valeurs distinctes du bloc passent par Python.
+    """
+    codes, distincts = pd.factorize(valeurs)
+    correspondance = np.empty(len(distincts), dtype=np.int64)
+    for i, identifiant in enumerate(distincts):
+        j = index.get(identifiant)
+        if j is None:
+            j = index[identifiant] = len(index)
+        correspondance[i] = j
+    return correspondance[codes]
+
+
+def _fusionner(cles):
+    # Dédoublonne les clés d'arêtes accumulées en un seul tableau trié
+    return np.unique(np.concatenate(cles)) if cles else np.empty(0, dtype=np.int64)
+
+
+def _identifiants(index):
+    # Identifiants d'origine dans l'ordre des indices ; entiers seulement si chacun s'écrit
+    # exactement ainsi ('007' et '7' restent deux chaînes distinctes)
+    noeuds = np.array(list(index), dtype=str)
+    if len(noeuds) and all(MOTIF_ENTIER.fullmatch(s) for s in noeuds.tolist()):
+        entiers = [int(s) for s in noeuds.tolist()]
+        if np.iinfo(np.int64).min <= min(entiers) and max(entiers) <= np.iinfo(np.int64).max:
+            return np.array(entiers, dtype=np.int64)
+    return noeuds
+
+
+def _lire_utilisateurs(chemin, index, taille_bloc):
+    # Attributs en colonnes, alignés sur les indices des nœuds (les utilisateurs sans arête sont ajoutés)
+    blocs = []
+    for bloc in pd.read_csv(chemin, chunksize=taille_bloc, dtype={'id': str}):
+        bloc['indice'] = _renumeroter(bloc['id'].to_numpy(), index)
+        blocs.append(bloc.drop(columns='id'))
+    utilisateurs = pd.concat(blocs).drop_duplicates('indice', keep='last').set_index('indice')
+    utilisateurs = utilisateurs.reindex(range(len(index)))
+
+    attributs, categories = {}, {}
+    if 'nom' in utilisateurs:
+        attributs['nom'] = utilisateurs['nom'].fillna('').astype(str).to_numpy(dtype=str)
+    if 'age' in utilisateurs:
+        attributs['age'] = utilisateurs['age'].fillna(-1).to_numpy(dtype=np.int32)
+    if 'groupe' in utilisateurs:
+        groupes = utilisateurs['groupe'].fillna('Inconnu').astype(str)
+        codes, modalites = pd.factorize(groupes, sort=True)
+        attributs['groupe'] = codes.astype(np.int8)
+        categories['groupe'] = list(modalites)
+    return attributs, categories
+
+
+def charger_aretes_par_blocs(chemin, taille_bloc=1_000_000, colonnes=("source", "cible"),
+                             chemin_utilisateurs=None, afficher_progression=True, seuil_fusion=20_000_000):
+    """
+    Charge une liste d'arêtes CSV (ou .csv.gz) par blocs de `taille_bloc` lignes.
+    - colonnes : noms des deux colonnes d'extrémités
+    - chemin_utilisateurs : CSV optionnel (colonnes id, nom, age, groupe) lu lui aussi par blocs
+    - seuil_fusion : nombre de clés en attente au-delà duquel on dédoublonne (borne la mémoire)
+    La mémoire de pointe reste de l'ordre d'un bloc plus les clés d'arêtes uniques (8 octets par arête).
+    Retourne un graphe compact.
+    """
+    index = {}
+    cles, en_attente = [], 0
+    nb_lignes = 0
+    debut = time.perf_counter()
+
+    for bloc in pd.read_csv(chemin, chunksize=taille_bloc, usecols=list(colonnes), dtype=str):
+        bloc = bloc.dropna()
+        sources = _renumeroter(bloc[colonnes[0]].to_numpy(), index)
+        cibles = _renumeroter(bloc[colonnes[1]].to_numpy(), index)
+        # Clé unique d'arête non orientée : (min << 32) | max, boucles ignorées
+        u, v = np.minimum(sources, cibles), np.maximum(sources, cibles)
+        garder = u != v
+        cles.append(np.unique((u[garder] << 32) | v[garder]))
+        en_attente += len(cles[-1])
+        if en_attente > seuil_fusion:
+            cles = [_fusionner(cles)]
+            en_attente = len(cles[0])
+
+        nb_lignes += len(bloc)
+        if afficher_progression:
+            duree = time.perf_counter() - debut
+            print(f"   {nb_lignes:,} lignes lues, {len(index):,} noeuds "
+                  f"({nb_lignes / max(duree, 1e-9):,.0f} lignes/s)")
+
+    cles = _fusionner(cles)
+    attributs, categories = {}, {}
+    if chemin_utilisateurs is not None:
+        attributs, categories = _lire_utilisateurs(chemin_utilisateurs, index, taille_bloc)
+
+    C = graphe_depuis_aretes(cles >> 32, cles & 0xFFFFFFFF, len(index), _identifiants(index),
+                             attributs, categories)
+    if afficher_progression:
+        duree = time.perf_counter() - debut
+        print(f"   Chargement termine: {len(index):,} noeuds, {len(cles):,} aretes uniques "
+              f"en {duree:.1f} s ({nb_lignes / max(duree, 1e-9):,.0f} lignes/s)")
+    return C
@@ -0,0 +1,144 @@
+# src/communautes.py
+# Détection de communautés de type Louvain sur la représentation compacte (CSR) du graphe :
+#   1. déplacement local : chaque nœud rejoint la communauté voisine qui augmente le plus la modularité ;
+#   2. agrégation : chaque communauté devient un nœud (produit creux Pᵀ A P) et on recommence.
+# Comme dans Leiden, les communautés finales non connexes sont scindées en parties connexes.
+# Le résultat est un tableau nœud -> communauté (communautés numérotées de la plus grande à la plus petite),
+# ce qui rend la coloration et le rapport en O(N). Une partition précédente peut servir de point de départ.
+
+import numpy as np                               # Étiquettes et degrés
+from collections import deque                    # File des nœuds à réexaminer
+from scipy import sparse                         # Agrégation des communautés
+from scipy.sparse.csgraph import connected_components  # Scission des communautés non connexes
+from src.graphe_compact import matrice_adjacence, aretes
+
+
+def _deplacer_noeuds(A, communautes, resolution, rng):
+    # Déplacement local sur le graphe pondéré A (boucles sur la diagonale), avec file de nœuds
+    # comme dans Leiden : après un déplacement, seuls les voisins concernés sont réexaminés.
+    # Un nœud ne change de communauté que si le gain de modularité est strictement positif.
+    n = A.shape[0]
+    indptr, indices, poids = A.indptr.tolist(), A.indices.tolist(), A.data.tolist()
+    degres = np.asarray(A.sum(axis=1)).ravel()
+    m2 = degres.sum()
+    tot = np.bincount(communautes, weights=degres, minlength=n).tolist()
+    comm, deg = communautes.tolist(), degres.tolist()
+
+    file = deque(rng.permutation(n).tolist())
+    en_file = [True] * n
+    while file:
+        i = file.popleft()
+        en_file[i] = False
+        ci, ki = comm[i], deg[i]
+        liens = {}  # Poids des arêtes de i vers chaque communauté voisine
+        for a in range(indptr[i], indptr[i + 1]):
+            j = indices[a]
+            if j != i:
+                liens[comm[j]] = liens.get(comm[j], 0.0) + poids[a]
+        tot[ci] -= ki
+        facteur = resolution * ki / m2
+        meilleure, gain_max = ci, liens.get(ci, 0.0) - facteur * tot[ci]
+        for c, w in liens.items():
+            gain = w - facteur * tot[c]
+            if gain > gain_max + 1e-12:
+                meilleure, gain_max = c, gain
+        tot[meilleure] += ki
+        if meilleure != ci:
+            comm[i] = meilleure
+            for a in range(indptr[i], indptr[i + 1]):
+                j = indices[a]
+                if not en_file[j] and comm[j] != meilleure:
+                    en_file[j] = True
+                    file.append(j)
+    return np.array(comm, dtype=np.int64)
+
+
+def _renumeroter(etiquettes):
+    # Étiquettes denses 0..k-1
+    return np.unique(etiquettes, return_inverse=True)[1].astype(np.int64)
+
+
+def _partition_initiale(partition, n):
+    # Étiquettes de départ ; les nœuds sans communauté (< 0) forment chacun la leur
+    etiquettes = np.asarray(partition, dtype=np.int64).copy()
+    nouveaux = etiquettes < 0
+    etiquettes[nouveaux] = etiquettes.max(initial=-1) + 1 + np.arange(nouveaux.sum())
+    return _renumeroter(etiquettes) if n else etiquettes
+
+
+def _niveaux(A, communautes, resolution, rng):
+    # Déplacement local puis agrégation, jusqu'à ce qu'aucune communauté ne fusionne
+    etiquettes = np.arange(A.shape[0], dtype=np.int64)  # Nœud -> nœud du niveau courant
+    niveau = A
+    while True:
+        communautes = _renumeroter(_deplacer_noeuds(niveau, communautes, resolution, rng))
+        etiquettes = communautes[etiquettes]
+        k = communautes.max() + 1
+        if k == niveau.shape[0]:
+            return etiquettes
+        # Agrégation : une communauté = un nœud, poids internes sur la diagonale
+        P = sparse.csr_matrix((np.ones(len(communautes)), (np.arange(len(communautes)), communautes)),
+                              shape=(len(communautes), k))
+        niveau = (P.T @ niveau @ P).tocsr()
+        communautes = np.arange(k, dtype=np.int64)
+
+
+def louvain_compact(C, resolution=1.0, seed=42, partition_initiale=None, max_cycles=10):
+    """
+    Communautés du graphe compact C par la méthode de Louvain.
+    - resolution : > 1 favorise des communautés plus petites, < 1 plus grandes
+    - seed : ordre de parcours des nœuds (résultat reproductible)
+    - partition_initiale : tableau nœud -> communauté d'une détection précédente (-1 pour
+      un nouveau nœud) ; seul le voisinage des changements est alors réellement retravaillé
+    - max_cycles : nombre maximal de reprises de l'algorithme à partir de son propre résultat
+    Retourne un tableau d'entiers nœud -> communauté, la communauté 0 étant la plus grande.
+    """
+    rng = np.random.default_rng(seed)
+    A = matrice_adjacence(C, float)
+    n = A.shape[0]
+    if A.nnz == 0:
+        return np.arange(n, dtype=np.int64)
+
+    etiquettes = np.arange(n, dtype=np.int64) if partition_initiale is None else \
+        _partition_initiale(partition_initiale, n)
+    modularite = -np.inf
+    for _ in range(max_cycles):
+        # Nouveau cycle à partir de la partition obtenue : les nœuds peuvent encore changer
+        # de communauté individuellement, ce que les niveaux agrégés ne permettent plus
+        nouvelles = _niveaux(A, etiquettes, resolution, rng)
+        nouvelle_modularite = modularite_compact(C, nouvelles, resolution)
+        if nouvelle_modularite <= modularite + 1e-7:
+            break
+        etiquettes, modularite = nouvelles, nouvelle_modularite
+
+    # Scission des communautés non connexes : composantes du sous-graphe des arêtes internes
+    sources, cibles = aretes(C)
+    internes = etiquettes[sources] == etiquettes[cibles]
+    interne = sparse.csr_matrix((np.ones(internes.sum()), (sources[internes], cibles[internes])), shape=(n, n))
+    _, etiquettes = connected_components(interne, directed=False)
+
+    # Numérotation de la plus grande communauté à la plus petite
+    tailles = np.bincount(etiquettes)
+    rang = np.empty(len(tailles), dtype=np.int64)
+    rang[np.argsort(-tailles, kind='stable')] = np.arange(len(tailles))
+    return rang[etiquettes]
+
+
+def modularite_compact(C, etiquettes, resolution=1.0):
+    """Modularité de la partition `etiquettes` (même définition que nx.community.modularity)."""
+    sources, cibles = aretes(C)
+    m = len(sources)
+    if m == 0:
+        return 0.0
+    degres = np.diff(C['indptr']).astype(float)
+    internes = np.bincount(etiquettes[sources][etiquettes[sources] == etiquettes[cibles]],
+                           minlength=etiquettes.max() + 1)
+    sommes = np.bincount(etiquettes, weights=degres)
+    return float((internes / m - resolution * (sommes / (2 * m)) ** 2).sum())
+
+
+def listes_communautes(C, etiquettes):
+    """Liste des nœuds de chaque communauté (dans l'ordre des numéros), en O(N)."""
+    ordre = np.argsort(etiquettes, kind='stable')
+    coupures = np.cumsum(np.bincount(etiquettes))[:-1]
+    return [groupe.tolist() for groupe in np.split(np.asarray(C['noeuds'])[ordre], coupures)]
@@ -2,8 +2,11 @@
 
 import networkx as nx
 import random
-import pandas as pd
+import numpy as np
+from src.graphe_compact import creer_graphe_compact, graphe_depuis_aretes
+from src.instrumentation import instrumenter
 
+@instrumenter
 def creer_reseau_social():
     G = nx.Graph()
     utilisateurs = [
@@ -48,13 +51,44 @@ def creer_reseau_social():
     G.add_edges_from(relations)
     return G
 
-def sauvegarder_graphe(G, chemin="data/reseau_social.csv"):
+@instrumenter
+def creer_reseau_social_compact():
+    # Même réseau en représentation CSR (voir src/graphe_compact.py)
+    return creer_graphe_compact(creer_reseau_social())
+
+@instrumenter
+def sauvegarder_graphe(G, chemin="data/reseau_social.csv", chemin_utilisateurs=None):
+    # Export CSV des arêtes ; les attributs des nœuds vont dans chemin_utilisateurs si fourni
+    # (pour un rechargement rapide et complet, voir src/snapshot.py)
+    import pandas as pd  # Import différé : seulement pour les fichiers CSV
     edges_data = [(u, v) for u, v in G.edges()]
     df = pd.DataFrame(edges_data, columns=["source", "cible"])
     df.to_csv(chemin, index=False)
+    if chemin_utilisateurs is not None:
+        utilisateurs = pd.DataFrame([{"id": n, **attrs} for n, attrs in G.nodes(data=True)])
+        utilisateurs.to_csv(chemin_utilisateurs, index=False)
     print(f"Graphe sauvegarde dans {chemin}")
 
-def charger_graphe(chemin="data/reseau_social.csv"):
+@instrumenter
+def charger_graphe(chemin="data/reseau_social.csv", chemin_utilisateurs=None):
+    import pandas as pd  # Import différé : seulement pour les fichiers CSV
     df = pd.read_csv(chemin)
     G = nx.from_pandas_edgelist(df, "source", "cible")
+    if chemin_utilisateurs is not None:
+        # Import CSV complet : les attributs (nom, age, groupe) sont rattachés aux nœuds
+        utilisateurs = pd.read_csv(chemin_utilisateurs).set_index("id")
+        G.add_nodes_from(utilisateurs.index)
+        nx.set_node_attributes(G, utilisateurs.to_dict(orient="index"))
     return G
+
+@instrumenter
+def charger_graphe_compact(chemin="data/reseau_social.csv", chemin_utilisateurs=None):
+    # Même chargement, résultat en représentation CSR (voir src/graphe_compact.py)
+    if chemin_utilisateurs is not None:
+        return creer_graphe_compact(charger_graphe(chemin, chemin_utilisateurs))
+    import pandas as pd  # Import différé : seulement pour les fichiers CSV
+    df = pd.read_csv(chemin)
+    # Identifiants renumérotés 0..n-1 sans passer par un nx.Graph
+    noeuds, codes = np.unique(np.concatenate([df["source"].to_numpy(), df["cible"].to_numpy()]), return_inverse=True)
+    m = len(df)
+    return graphe_depuis_aretes(codes[:m], codes[m:], len(noeuds), noeuds)
@@ -0,0 +1,105 @@
+# src/generateurs.py
+# Générateurs de réseaux sociaux synthétiques, reproductibles (graine fixe), pour tester
+# et mesurer le projet au-delà des 25 utilisateurs de creer_reseau_social :
+#   - modèle à blocs stochastiques (SBM) reprenant les groupes Etudiants / Professionnels / Artistes,
+#     la plupart des liens restant à l'intérieur d'un groupe ;
+#   - graphe à degrés en loi de puissance (modèle de Chung-Lu), avec quelques utilisateurs très connectés.
+# Les arêtes sont tirées de façon vectorisée (pas de boucle Python sur les paires) puis
+# dédupliquées par graphe_depuis_aretes : 1 million de nœuds se génèrent en quelques secondes.
+
+import numpy as np                                            # Tirages vectorisés
+from src.graphe_compact import graphe_depuis_aretes, vers_networkx
+
+
+GROUPES = ('Etudiants', 'Professionnels', 'Artistes')
+PROPORTIONS_GROUPES = (0.40, 0.36, 0.24)   # Comme le réseau d'origine (10, 9 et 6 utilisateurs sur 25)
+AGES_GROUPES = {'Etudiants': (18, 26), 'Professionnels': (25, 61), 'Artistes': (20, 51)}  # [min, max[
+
+
+def _attributs(groupes, rng):
+    # Colonnes nom / age / groupe du graphe compact (groupe codé en entiers, comme creer_graphe_compact)
+    n = len(groupes)
+    ages = np.empty(n, dtype=np.int32)
+    for code, nom in enumerate(GROUPES):
+        dans_groupe = groupes == code
+        ages[dans_groupe] = rng.integers(*AGES_GROUPES[nom], size=dans_groupe.sum())
+    noms = np.char.add('Utilisateur ', np.arange(1, n + 1).astype(str))
+    modalites = sorted(GROUPES)
+    codes = np.array([modalites.index(g) for g in GROUPES], dtype=np.int8)[groupes]
+    return {'nom': noms, 'age': ages, 'groupe': codes}, {'groupe': modalites}
+
+
+def _graphe(sources, cibles, groupes, rng):
+    # Identifiants 1..n comme dans creer_reseau_social
+    n = len(groupes)
+    attributs, categories = _attributs(groupes, rng)
+    return graphe_depuis_aretes(sources, cibles, n, np.arange(1, n + 1), attributs, categories)
+
+
+def reseau_sbm_compact(n, degre_moyen=10, part_interne=0.8, proportions=PROPORTIONS_GROUPES, seed=42):
+    """
+    Réseau à blocs stochastiques de n utilisateurs répartis entre Etudiants, Professionnels et Artistes.
+    - degre_moyen : nombre moyen de connexions par utilisateur
+    - part_interne : part des liens entre membres d'un même groupe
+    Les doublons (rares pour un graphe peu dense) sont retirés : le degré moyen obtenu est
+    très légèrement inférieur à celui demandé.
+    Résultat en représentation CSR (voir src/graphe_compact.py).
+    """
+    rng = np.random.default_rng(seed)
+    tailles = np.floor(np.asarray(proportions) * n).astype(np.int64)
+    tailles[0] += n - tailles.sum()
+    debuts = np.concatenate([[0], np.cumsum(tailles)])
+    groupes = np.repeat(np.arange(len(tailles)), tailles)
+
+    # Nombre de liens attendu pour chaque paire de groupes, proportionnel au nombre de paires possibles
+    total = n * degre_moyen / 2
+    paires = np.triu(np.outer(tailles, tailles), 1).astype(float)
+    np.fill_diagonal(paires, tailles * (tailles - 1) / 2)
+    interne, externe = np.diag(paires).sum(), np.triu(paires, 1).sum()
+    attendus = np.where(np.eye(len(tailles), dtype=bool),
+                        total * part_interne * paires / max(interne, 1),
+                        total * (1 - part_interne) * paires / max(externe, 1))
+
+    sources, cibles = [], []
+    for a, b in zip(*np.nonzero(attendus)):
+        # Nombre de liens binomial puis extrémités uniformes dans chacun des deux groupes
+        k = rng.binomial(int(paires[a, b]), min(attendus[a, b] / paires[a, b], 1.0))
+        sources.append(rng.integers(debuts[a], debuts[a + 1], size=k))
+        cibles.append(rng.integers(debuts[b], debuts[b + 1], size=k))
+    return _graphe(np.concatenate(sources), np.concatenate(cibles), groupes, rng)
+
+
+def reseau_puissance_compact(n, degre_moyen=10, exposant=2.5, proportions=PROPORTIONS_GROUPES, seed=42):
+    """
+    Réseau de n utilisateurs dont les degrés suivent une loi de puissance P(d) ~ d^-exposant
+    (modèle de Chung-Lu : chaque extrémité est tirée avec une probabilité proportionnelle
+    au poids de l'utilisateur). Les groupes sont tirés au hasard selon proportions.
+    Résultat en représentation CSR (voir src/graphe_compact.py).
+    """
+    rng = np.random.default_rng(seed)
+    poids = np.arange(1, n + 1, dtype=float) ** (-1 / (exposant - 1))
+    probabilites = poids / poids.sum()
+    m = int(round(n * degre_moyen / 2))
+    sources = rng.choice(n, size=m, p=probabilites)
+    cibles = rng.choice(n, size=m, p=probabilites)
+    # Les utilisateurs les plus connectés ne sont pas tous au début de la liste
+    permutation = rng.permutation(n)
+    groupes = rng.choice(len(proportions), size=n, p=proportions)
+    return _graphe(permutation[sources], permutation[cibles], groupes, rng)
+
+
+def reseau_sbm(n, degre_moyen=10, part_interne=0.8, proportions=PROPORTIONS_GROUPES, seed=42):
+    """Réseau de reseau_sbm_compact sous forme de nx.Graph."""
+    return vers_networkx(reseau_sbm_compact(n, degre_moyen, part_interne, proportions, seed))
+
+
+def reseau_puissance(n, degre_moyen=10, exposant=2.5, proportions=PROPORTIONS_GROUPES, seed=42):
+    """Réseau de reseau_puissance_compact sous forme de nx.Graph."""
+    return vers_networkx(reseau_puissance_compact(n, degre_moyen, exposant, proportions, seed))
+
+
+# Générateurs disponibles pour les mesures de performance (voir benchmark.py)
+GENERATEURS = {
+    'sbm': reseau_sbm,
+    'puissance': reseau_puissance,
+}
@@ -0,0 +1,318 @@
+# src/graphe_compact.py
+# Représentation compacte du réseau : adjacence CSR en tableaux NumPy (indices int32)
+# et attributs des nœuds (nom, age, groupe) stockés en colonnes.
+# Les métriques de base y sont calculées de façon vectorisée ; une vue NetworkX
+# reste disponible pour le code de visualisation.
+
+import numpy as np                      # Tableaux compacts et calcul vectorisé
+import scipy.sparse as sp               # Matrices creuses (produits matrice-vecteur)
+import networkx as nx                   # Vue NetworkX pour les visualisations
+
+
+ATTRIBUTS = ('nom', 'age', 'groupe')  # Attributs des utilisateurs conservés en colonnes
+
+
+def _type_indptr(nb_entrees):
+    # int32 tant que possible, int64 au-delà de 2^31 entrées
+    return np.int32 if nb_entrees < np.iinfo(np.int32).max else np.int64
+
+
+def graphe_depuis_aretes(sources, cibles, n, noeuds=None, attributs=None, categories=None):
+    """
+    Construit un graphe compact non orienté à partir de deux tableaux d'indices 0..n-1.
+    Les boucles et les arêtes en double sont supprimées.
+    - noeuds : identifiants d'origine des nœuds (par défaut 0..n-1)
+    - attributs : {nom_colonne: tableau de longueur n}
+    - categories : {nom_colonne: liste des modalités} pour les colonnes codées en entiers
+    """
+    sources = np.asarray(sources, dtype=np.int64)
+    cibles = np.asarray(cibles, dtype=np.int64)
+    u = np.minimum(sources, cibles)
+    v = np.maximum(sources, cibles)
+    garder = u != v
+    cles = np.unique(u[garder] * n + v[garder])  # Déduplication des arêtes
+    u, v = cles // n, cles % n
+
+    lignes = np.concatenate([u, v])
+    colonnes = np.concatenate([v, u])
+    ordre = np.lexsort((colonnes, lignes))
+    indptr = np.zeros(n + 1, dtype=_type_indptr(len(lignes)))
+    np.cumsum(np.bincount(lignes, minlength=n), out=indptr[1:])
+
+    return {
+        'noeuds': np.arange(n) if noeuds is None else np.asarray(noeuds),
+        'indptr': indptr,
+        'indices': colonnes[ordre].astype(np.int32),
+        'attributs': dict(attributs or {}),
+        'categories': dict(categories or {}),
+    }
+
+
+def creer_graphe_compact(G):
+    """
+    Convertit un graphe NetworkX en graphe compact.
+    Le groupe est codé en entiers (int8) avec la liste des modalités à part.
+    """
+    noeuds = list(G.nodes())
+    index = {n: i for i, n in enumerate(noeuds)}
+    m = G.number_of_edges()
+    sources = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.int64, count=m)
+    cibles = np.fromiter((index[v] for _, v in G.edges()), dtype=np.int64, count=m)
+
+    attributs, categories = {}, {}
+    donnees = G.nodes
+    if all('nom' in donnees[n] for n in noeuds):
+        attributs['nom'] = np.array([donnees[n]['nom'] for n in noeuds], dtype=str)
+    if all('age' in donnees[n] for n in noeuds):
+        attributs['age'] = np.array([donnees[n]['age'] for n in noeuds], dtype=np.int32)
+    if all('groupe' in donnees[n] for n in noeuds):
+        modalites = sorted({donnees[n]['groupe'] for n in noeuds})
+        code = {g: i for i, g in enumerate(modalites)}
+        attributs['groupe'] = np.array([code[donnees[n]['groupe']] for n in noeuds], dtype=np.int8)
+        categories['groupe'] = modalites
+
+    return graphe_depuis_aretes(sources, cibles, len(noeuds), noeuds, attributs, categories)
+
+
+def nb_noeuds(C):
+    return len(C['indptr']) - 1
+
+
+def nb_aretes(C):
+    return len(C['indices']) // 2
+
+
+def aretes(C):
+    """Tableaux (sources, cibles) des arêtes, chacune une seule fois (source < cible)."""
+    lignes = np.repeat(np.arange(nb_noeuds(C), dtype=np.int32), np.diff(C['indptr']))
+    garder = lignes < C['indices']
+    return lignes[garder], C['indices'][garder]
+
+
+def valeur_attribut(C, nom, i):
+    """Valeur d'origine de l'attribut `nom` du nœud d'indice i (modalité décodée pour les catégories)."""
+    valeur = C['attributs'][nom][i]
+    if nom in C['categories']:
+        return C['categories'][nom][int(valeur)]
+    return valeur.item() if hasattr(valeur, 'item') else valeur
+
+
+def vers_networkx(C):
+    """
+    Vue NetworkX du graphe compact (pour les fonctions de visualisation).
+    Le graphe compact d'origine est conservé dans G.graph['compact'].
+    """
+    G = nx.Graph()
+    noeuds = C['noeuds'].tolist()
+    colonnes = list(C['attributs'])
+    G.add_nodes_from(
+        (noeuds[i], {nom: valeur_attribut(C, nom, i) for nom in colonnes})
+        for i in range(len(noeuds))
+    )
+    sources, cibles = aretes(C)
+    G.add_edges_from(zip([noeuds[i] for i in sources.tolist()], [noeuds[j] for j in cibles.tolist()]))
+    G.graph['compact'] = C
+    return G
+
+
+def en_dictionnaire(C, valeurs):
+    """Associe chaque identifiant de nœud à sa valeur : {noeud: valeur}."""
+    return dict(zip(C['noeuds'].tolist(), np.asarray(valeurs).tolist()))
+
+
+def matrice_adjacence(C, dtype=np.float64):
+    """Matrice d'adjacence creuse SciPy qui partage les tableaux indptr/indices du graphe compact."""
+    n = nb_noeuds(C)
+    donnees = np.ones(len(C['indices']), dtype=dtype)
+    return sp.csr_matrix((donnees, C['indices'], C['indptr']), shape=(n, n))
+
+
+# MÉTRIQUES VECTORISÉES
+
+def degres_compact(C):
+    return np.diff(C['indptr'])
+
+
+def degree_centrality_compact(C):
+    n = nb_noeuds(C)
+    return degres_compact(C) / (n - 1) if n > 1 else np.ones(n)
+
+
+def _orienter(C):
+    # Orientation de chaque arête vers le nœud de plus haut rang (degré, puis indice) :
+    # chaque triangle x < y < z n'apparaît qu'une fois et le degré sortant reste borné par sqrt(2m)
+    n = nb_noeuds(C)
+    d = degres_compact(C)
+    rang = np.empty(n, dtype=np.int64)
+    rang[np.lexsort((np.arange(n), d))] = np.arange(n)
+    sources = np.repeat(np.arange(n), d)
+    garder = rang[sources] < rang[C['indices']]
+    return sp.csr_matrix((np.ones(garder.sum(), dtype=np.int64), (sources[garder], C['indices'][garder])),
+                         shape=(n, n))
+
+
+def _blocs_lignes(travail, budget):
+    # Découpe les lignes en blocs consécutifs d'au plus `budget` produits élémentaires (au moins une ligne)
+    cumul = np.cumsum(travail)
+    bornes = [0]
+    while bornes[-1] < len(travail):
+        deja = cumul[bornes[-1] - 1] if bornes[-1] else 0
+        fin = np.searchsorted(cumul, deja + budget, side='right')
+        bornes.append(max(fin, bornes[-1] + 1))
+    return zip(bornes[:-1], bornes[1:])
+
+
+def _travail_lignes(L):
+    # Produits élémentaires par ligne de L @ L et de Lᵀ @ L
+    LT = L.T.tocsr()
+    sortants = np.diff(L.indptr)
+    return (L, L @ sortants, False), (LT, LT @ sortants, True)
+
+
+def _triangles_matriciel(L, budget, travaux):
+    # Pour x < y < z : ((L @ L) ∘ L)[x, z] compte le triangle pour x,
+    # ((Lᵀ @ L) ∘ L)[y, z] le compte pour y (lignes) et pour z (colonnes)
+    triangles = np.zeros(L.shape[0], dtype=np.int64)
+    for M, travail, pour_z in travaux:
+        for a, b in _blocs_lignes(travail, budget):
+            P = (M[a:b] @ L).multiply(L[a:b])
+            triangles[a:b] += np.asarray(P.sum(axis=1)).ravel()
+            if pour_z:
+                triangles += np.asarray(P.sum(axis=0)).ravel()
+    return triangles
+
+
+def _triangles_iterateur(L):
+    # Itération sur les nœuds : les voisins sortants des voisins sortants de x sont comparés
+    # à ceux de x par marquage ; la mémoire reste de l'ordre du voisinage d'un nœud
+    n = L.shape[0]
+    indptr, indices = L.indptr, L.indices
+    triangles = np.zeros(n, dtype=np.int64)
+    marque = np.zeros(n, dtype=bool)
+    for x in np.flatnonzero(np.diff(indptr) >= 2):
+        voisins = indices[indptr[x]:indptr[x + 1]]
+        debuts, longueurs = indptr[voisins], indptr[voisins + 1] - indptr[voisins]
+        total = longueurs.sum()
+        if total == 0:
+            continue
+        decalages = np.repeat(debuts - (np.cumsum(longueurs) - longueurs), longueurs)
+        candidats = indices[np.arange(total) + decalages]
+        marque[voisins] = True
+        fermes = marque[candidats]
+        marque[voisins] = False
+        triangles[x] += fermes.sum()
+        triangles[voisins] += np.bincount(np.repeat(np.arange(len(voisins)), longueurs)[fermes],
+                                          minlength=len(voisins))
+        np.add.at(triangles, candidats[fermes], 1)
+    return triangles
+
+
+def clustering_compact(C, methode='auto', budget=20_000_000):
+    """
+    Triangles et coefficient de clustering local de chaque nœud, en une passe.
+    Les arêtes sont orientées par degré croissant (chaque triangle compté une fois, même
+    autour des très gros hubs), puis :
+    - methode='matriciel' : produits creux (L @ L) ∘ L et (Lᵀ @ L) ∘ L par blocs de lignes
+      d'au plus `budget` produits élémentaires (mémoire bornée) ;
+    - methode='iterateur' : itération sur les nœuds, plus lente mais de mémoire minimale ;
+    - methode='auto' : matriciel, sauf si une seule ligne dépasse le budget (degrés très asymétriques).
+    Le clustering moyen et la transitivité s'en déduisent directement (voir cache_metriques).
+    """
+    d = degres_compact(C)
+    L = _orienter(C)
+    travaux = _travail_lignes(L)
+    if methode == 'auto':
+        trop_lourde = any(len(travail) and travail.max() > budget for _, travail, _ in travaux)
+        methode = 'iterateur' if trop_lourde else 'matriciel'
+    triangles = _triangles_iterateur(L) if methode == 'iterateur' else _triangles_matriciel(L, budget, travaux)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        clustering = np.where(d > 1, 2.0 * triangles / (d * (d - 1.0)), 0.0)
+    return triangles, clustering
+
+
+def pagerank_compact(C, alpha=0.85, max_iter=100, tol=1e-06):
+    """PageRank par itération de puissance creuse (mêmes conventions que nx.pagerank)."""
+    n = nb_noeuds(C)
+    A = matrice_adjacence(C)
+    d = degres_compact(C).astype(float)
+    pendants = d == 0
+    inverse = np.divide(1.0, d, out=np.zeros(n), where=~pendants)
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        x_prec = x
+        x = alpha * (A.T @ (x_prec * inverse)) + (alpha * x_prec[pendants].sum() + 1.0 - alpha) / n
+        if np.abs(x - x_prec).sum() < n * tol:
+            return x
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+
+def eigenvector_compact(C, max_iter=1000, tol=1e-06):
+    """Centralité de vecteur propre par itération de puissance sur (A + I), comme nx.eigenvector_centrality."""
+    n = nb_noeuds(C)
+    if n == 0:
+        raise nx.NetworkXPointlessConcept("cannot compute centrality for the null graph")
+    A = matrice_adjacence(C)
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        x_prec = x
+        x = x_prec + A @ x_prec
+        x /= np.linalg.norm(x) or 1.0
+        if np.abs(x - x_prec).sum() < n * tol:
+            return x
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+
+def positions_voisins(indptr, lignes):
+    """Positions dans `indices` de tous les voisins des nœuds `lignes` (tranches CSR concaténées, sans boucle)."""
+    lignes = np.asarray(lignes, dtype=np.int64)
+    debuts = indptr[lignes].astype(np.int64)
+    longueurs = indptr[lignes + 1].astype(np.int64) - debuts
+    return np.arange(longueurs.sum()) + np.repeat(debuts - np.cumsum(longueurs) + longueurs, longueurs)
+
+
+def voisinage_compact(C, sources, k=1, limite=None):
+    """
+    Parcours en largeur limité à k sauts depuis les indices `sources` (réseau ego).
+    Chaque niveau est développé d'un seul bloc à partir des tranches CSR de la frontière :
+    le coût dépend de la taille du voisinage, pas de celle du graphe.
+    - limite : nombre maximal de nœuds retournés (le parcours s'arrête au niveau qui la dépasse,
+      complété par les premiers nœuds de ce niveau)
+    Retourne (indices des nœuds atteints, distance de chacun), dans l'ordre du parcours.
+    """
+    indptr, indices = C['indptr'], C['indices']
+    frontiere = np.unique(np.asarray(sources, dtype=np.int64))
+    atteints, distances = [frontiere], [np.zeros(len(frontiere), dtype=np.int32)]
+    vus = set(frontiere.tolist())
+    total = len(frontiere)
+    for d in range(1, k + 1):
+        if len(frontiere) == 0 or (limite is not None and total >= limite):
+            break
+        voisins = np.unique(indices[positions_voisins(indptr, frontiere)])
+        frontiere = np.array([v for v in voisins.tolist() if v not in vus], dtype=np.int64)
+        vus.update(frontiere.tolist())
+        atteints.append(frontiere)
+        distances.append(np.full(len(frontiere), d, dtype=np.int32))
+        total += len(frontiere)
+    atteints, distances = np.concatenate(atteints), np.concatenate(distances)
+    if limite is not None:
+        atteints, distances = atteints[:limite], distances[:limite]
+    return atteints, distances
+
+
+def sous_graphe_compact(C, selection):
+    """
+    Sous-graphe induit par les nœuds d'indices `selection` (coût proportionnel à leurs degrés).
+    Les nœuds gardent l'ordre croissant de leurs indices ; la clé 'origine' du résultat
+    contient l'indice de chacun dans C.
+    """
+    selection = np.unique(np.asarray(selection, dtype=np.int64))
+    longueurs = C['indptr'][selection + 1].astype(np.int64) - C['indptr'][selection]
+    lignes = np.repeat(np.arange(len(selection)), longueurs)
+    voisins = C['indices'][positions_voisins(C['indptr'], selection)].astype(np.int64)
+    rangs = np.minimum(np.searchsorted(selection, voisins), len(selection) - 1)
+    garder = selection[rangs] == voisins  # Voisins eux-mêmes sélectionnés
+    sous = graphe_depuis_aretes(lignes[garder], rangs[garder], len(selection), noeuds=C['noeuds'][selection],
+                                attributs={nom: colonne[selection] for nom, colonne in C['attributs'].items()},
+                                categories=C['categories'])
+    sous['origine'] = selection
+    return sous
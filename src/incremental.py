@@ -0,0 +1,129 @@
+# src/incremental.py
+# Mise à jour incrémentale des métriques après un lot d'ajouts et de suppressions d'arêtes.
+# Métriques maintenues sans recalcul complet (coût proportionnel au lot et aux degrés concernés) :
+#   degrés, centralité de degré, triangles et clustering (local, moyen, global), composantes connexes.
+# La densité se déduit directement des effectifs (nx.density est en O(1)).
+# Les autres métriques du cache deviennent périmées et sont recalculées au prochain accès ;
+# la partition en communautés est alors affinée à partir de la précédente (voir src/communautes.py).
+
+import numpy as np              # Tableaux des métriques maintenues
+from collections import deque   # Parcours en largeur lors des suppressions
+from src.cache_metriques import obtenir_metrique, deposer_metrique, metriques_en_cache
+
+
+def _voisins_communs(G, u, v):
+    # Intersection des voisinages en parcourant le plus petit
+    petit, grand = sorted((G[u], G[v]), key=len)
+    return [w for w in petit if w in grand]
+
+
+def _cote_separe(G, u, v):
+    # Parcours alternés depuis u et v après la suppression de l'arête (u, v) :
+    # None si u et v restent reliés, sinon les nœuds du côté épuisé en premier (le plus petit)
+    vus, files = ({u}, {v}), (deque([u]), deque([v]))
+    while True:
+        for k in (0, 1):
+            if not files[k]:
+                return vus[k]
+            x = files[k].popleft()
+            for y in G[x]:
+                if y in vus[1 - k]:
+                    return None
+                if y not in vus[k]:
+                    vus[k].add(y)
+                    files[k].append(y)
+
+
+def _racine(parent, c):
+    # Union-find sur les numéros de composantes (avec compression de chemin)
+    while parent.get(c, c) != c:
+        parent[c] = parent.get(parent[c], parent[c])
+        c = parent[c]
+    return c
+
+
+def appliquer_modifications(G, ajouts=(), suppressions=()):
+    """
+    Applique à G un lot de suppressions puis d'ajouts d'arêtes (paires (u, v) ; les nœuds
+    inconnus sont créés) et met à jour les métriques maintenues dans le cache.
+    Les autres métriques sont marquées périmées (voir metriques_en_cache) et recalculées à la demande.
+    Retourne le nombre d'arêtes réellement supprimées et ajoutées.
+    """
+    # État courant des métriques maintenues (calculé une fois s'il n'est pas déjà en cache)
+    index = dict(obtenir_metrique(G, 'index_noeuds'))
+    degres = obtenir_metrique(G, 'degres').tolist()
+    triangles = obtenir_metrique(G, 'triangles_clustering')[0].tolist()
+    composantes = obtenir_metrique(G, 'composantes_connexes').tolist()
+    # Partitions à affiner : celles à jour, et celles laissées en attente par un lot précédent
+    partitions = dict(G.graph.get('communautes_precedentes', {}))
+    partitions.update({tuple(sorted(params.items())): obtenir_metrique(G, nom, **params)
+                       for nom, params, a_jour in metriques_en_cache(G) if nom == 'communautes' and a_jour})
+    prochaine = max(composantes, default=-1) + 1  # Prochain numéro de composante libre
+    bilan = {'supprimees': 0, 'ajoutees': 0}
+
+    for u, v in suppressions:
+        if u == v or not G.has_edge(u, v):
+            continue
+        communs = _voisins_communs(G, u, v)
+        for w in communs:
+            triangles[index[w]] -= 1
+        for x in (u, v):
+            triangles[index[x]] -= len(communs)
+            degres[index[x]] -= 1
+        G.remove_edge(u, v)
+        bilan['supprimees'] += 1
+        cote = _cote_separe(G, u, v)
+        if cote is not None:  # La composante est coupée en deux
+            for x in cote:
+                composantes[index[x]] = prochaine
+            prochaine += 1
+
+    parent = {}
+    for u, v in ajouts:
+        if u == v or G.has_edge(u, v):
+            continue
+        for x in (u, v):
+            if x not in index:  # Nouveau nœud : ajouté en fin, comme dans G.nodes()
+                index[x] = len(index)
+                degres.append(0)
+                triangles.append(0)
+                composantes.append(prochaine)
+                prochaine += 1
+        communs = _voisins_communs(G, u, v) if u in G and v in G else []
+        for w in communs:
+            triangles[index[w]] += 1
+        for x in (u, v):
+            triangles[index[x]] += len(communs)
+            degres[index[x]] += 1
+        G.add_edge(u, v)
+        bilan['ajoutees'] += 1
+        a, b = _racine(parent, composantes[index[u]]), _racine(parent, composantes[index[v]])
+        if a != b:  # Fusion de deux composantes
+            parent[a] = b
+
+    # Numéros de composantes définitifs (racines de l'union-find, renumérotées de 0 à k-1)
+    composantes = np.array([_racine(parent, c) for c in composantes], dtype=np.int64)
+    composantes = np.unique(composantes, return_inverse=True)[1]
+
+    # Nouvelle version du graphe : toutes les entrées existantes deviennent périmées
+    G.graph['version_cache'] = G.graph.get('version_cache', 0) + 1
+    G.graph.pop('compact', None)
+
+    n = len(index)
+    d = np.array(degres, dtype=np.int64)
+    t = np.array(triangles, dtype=np.int64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        clustering = np.where(d > 1, 2.0 * t / (d * (d - 1.0)), 0.0)
+    deposer_metrique(G, 'index_noeuds', index)
+    deposer_metrique(G, 'degres', d)
+    deposer_metrique(G, 'degree_centrality', dict(zip(index, (d / (n - 1) if n > 1 else np.ones(n)).tolist())))
+    deposer_metrique(G, 'triangles_clustering', (t, clustering))
+    deposer_metrique(G, 'composantes_connexes', composantes)
+    obtenir_metrique(G, 'average_clustering')  # Dérivés des tableaux maintenus, sans parcours du graphe
+    obtenir_metrique(G, 'transitivity')
+
+    # Les partitions en communautés seront affinées à partir des précédentes au prochain accès
+    G.graph['communautes_precedentes'] = {
+        params: np.concatenate([etiquettes, np.full(n - len(etiquettes), -1)])
+        for params, etiquettes in partitions.items()}
+    return bilan
@@ -0,0 +1,225 @@
+# src/instrumentation.py
+# Mesure des appels aux fonctions publiques du projet (décorateur @instrumenter) et des
+# portions coûteuses à l'intérieur de celles-ci (blocs `with section(...)`, ex. savefig).
+# Pour chaque appel : durée, temps CPU, pic de mémoire résidente et taille du graphe traité.
+# Désactivée par défaut (un simple test par appel) ; activée pour une exécution par
+# demarrer_instrumentation(mode) :
+#   - 'temps'       : durée, CPU, pic RSS ;
+#   - 'tracemalloc' : en plus, pic des allocations Python/NumPy de chaque appel ;
+#   - 'cprofile'    : en plus, profil cProfile de chaque appel de premier niveau (fichier .prof fusionné).
+# terminer_instrumentation écrit un fichier JSON au format "trace event" (lisible par
+# chrome://tracing ou Perfetto) contenant aussi la liste des appels et un résumé par fonction,
+# à comparer d'une version à l'autre. Les appels exécutés dans les processus de rendu (fork)
+# sont recueillis dans des fichiers annexes puis fusionnés.
+
+import os                       # Identifiant du processus, fichiers annexes
+import glob                     # Fichiers annexes des processus fils
+import json                     # Fichier de trace
+import time                     # Durées et temps CPU
+import threading                # Identifiant du fil d'exécution (trace)
+import functools                # Décorateur
+from contextlib import contextmanager  # Blocs mesurés
+import cProfile                 # Profil détaillé (mode 'cprofile')
+import pstats                   # Fusion des profils
+import tracemalloc              # Allocations Python (mode 'tracemalloc')
+
+
+MODES = ('temps', 'tracemalloc', 'cprofile')
+DOSSIER_PROFILS = "output/profils"
+
+# État de la session de mesure (hérité par les processus créés par fork)
+_SESSION = {'actif': False, 'mode': None, 'pid': None, 'origine': 0.0, 'chemin': None,
+            'appels': [], 'profondeur': 0, 'nb_profils': 0}
+
+
+def memoire_ko():
+    """(mémoire résidente actuelle, pic) du processus en Ko ; None si /proc n'est pas disponible."""
+    try:
+        with open("/proc/self/status") as f:
+            valeurs = dict(ligne.split(':', 1) for ligne in f)
+        return int(valeurs['VmRSS'].split()[0]), int(valeurs['VmHWM'].split()[0])
+    except (OSError, KeyError):
+        return None
+
+
+def reinitialiser_pic_memoire():
+    """Ramène le pic de mémoire résidente (VmHWM) à la mémoire actuelle (Linux ; sans effet ailleurs)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _taille_graphe(valeurs):
+    # (nœuds, arêtes) du premier graphe trouvé : nx.Graph ou graphe compact (dictionnaire CSR)
+    for valeur in valeurs:
+        if hasattr(valeur, 'number_of_nodes'):
+            return valeur.number_of_nodes(), valeur.number_of_edges()
+        if isinstance(valeur, dict) and 'indptr' in valeur and 'indices' in valeur:
+            return len(valeur['indptr']) - 1, len(valeur['indices']) // 2
+    return None, None
+
+
+def _fichier_annexe():
+    return f"{_SESSION['chemin']}.{os.getpid()}.jsonl"
+
+
+def _enregistrer(appel):
+    # Dans le processus principal : en mémoire ; dans un processus fils : fichier annexe
+    if os.getpid() == _SESSION['pid']:
+        _SESSION['appels'].append(appel)
+    else:
+        with open(_fichier_annexe(), "a") as f:
+            f.write(json.dumps(appel) + "\n")
+
+
+def _mesurer(nom, calcul, arguments):
+    # Exécute calcul() en mesurant durée, CPU et mémoire ; retourne son résultat
+    # (taille du graphe : premier graphe parmi les arguments, sinon le résultat)
+    premier_niveau = _SESSION['profondeur'] == 0
+    mode = _SESSION['mode']
+    if premier_niveau:
+        reinitialiser_pic_memoire()
+        if mode == 'tracemalloc':
+            tracemalloc.reset_peak()
+    profil = cProfile.Profile() if mode == 'cprofile' and premier_niveau else None
+    avant = memoire_ko()
+    debut, debut_cpu = time.perf_counter(), time.process_time()
+    _SESSION['profondeur'] += 1
+    resultat = None
+    try:
+        if profil is not None:
+            profil.enable()
+        resultat = calcul()
+    finally:
+        if profil is not None:
+            profil.disable()
+        _SESSION['profondeur'] -= 1
+        fin, fin_cpu = time.perf_counter(), time.process_time()
+        apres = memoire_ko()
+        noeuds, aretes = _taille_graphe((*arguments, resultat))
+        appel = {
+            'nom': nom, 'categorie': 'fonction', 'pid': os.getpid(), 'fil': threading.get_ident(),
+            'debut': debut - _SESSION['origine'], 'duree': fin - debut, 'cpu': fin_cpu - debut_cpu,
+            'rss_mo': None if apres is None else apres[0] / 1024,
+            'pic_rss_mo': None if apres is None else apres[1] / 1024,  # Pic depuis l'appel de premier niveau
+            'delta_rss_mo': None if apres is None else (apres[0] - avant[0]) / 1024,
+            'noeuds': noeuds, 'aretes': aretes, 'profondeur': _SESSION['profondeur'],
+        }
+        if mode == 'tracemalloc':
+            appel['pic_python_mo'] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        if profil is not None:
+            _SESSION['nb_profils'] += 1
+            profil.dump_stats(f"{_SESSION['chemin']}.{os.getpid()}.{_SESSION['nb_profils']}.prof")
+        _enregistrer(appel)
+    return resultat
+
+
+def instrumenter(fonction):
+    """Décorateur : mesure chaque appel de la fonction quand l'instrumentation est active."""
+    nom = f"{fonction.__module__.rsplit('.', 1)[-1]}.{fonction.__name__}"
+
+    @functools.wraps(fonction)
+    def enveloppe(*args, **kwargs):
+        if not _SESSION['actif']:
+            return fonction(*args, **kwargs)
+        return _mesurer(nom, lambda: fonction(*args, **kwargs), (*args, *kwargs.values()))
+    return enveloppe
+
+
+@contextmanager
+def section(nom, G=None):
+    """Bloc mesuré à l'intérieur d'une fonction : `with section('savefig'): ...` (sans effet si inactive)."""
+    if not _SESSION['actif']:
+        yield
+        return
+    debut, debut_cpu = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        fin, fin_cpu = time.perf_counter(), time.process_time()
+        memoire = memoire_ko()
+        noeuds, aretes = _taille_graphe((G,))
+        _enregistrer({
+            'nom': nom, 'categorie': 'section', 'pid': os.getpid(), 'fil': threading.get_ident(),
+            'debut': debut - _SESSION['origine'], 'duree': fin - debut, 'cpu': fin_cpu - debut_cpu,
+            'rss_mo': None if memoire is None else memoire[0] / 1024,
+            'pic_rss_mo': None if memoire is None else memoire[1] / 1024,
+            'delta_rss_mo': None, 'noeuds': noeuds, 'aretes': aretes, 'profondeur': _SESSION['profondeur'],
+        })
+
+
+def demarrer_instrumentation(mode='temps', chemin=None):
+    """
+    Active la mesure des appels pour l'exécution en cours (mode parmi MODES).
+    À appeler avant de créer les processus de rendu pour que ceux-ci soient mesurés aussi.
+    chemin : fichier JSON de sortie (par défaut output/profils/profil_<date>.json).
+    """
+    if mode not in MODES:
+        raise ValueError(f"Mode d'instrumentation inconnu: {mode} (choix: {', '.join(MODES)})")
+    chemin = chemin or os.path.join(DOSSIER_PROFILS, f"profil_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+    if mode == 'tracemalloc':
+        tracemalloc.start()
+    _SESSION.update(actif=True, mode=mode, pid=os.getpid(), origine=time.perf_counter(), chemin=chemin,
+                    appels=[], profondeur=0, nb_profils=0)
+
+
+def _resume(appels):
+    # Totaux par fonction (appels de premier niveau et sections), triés par durée décroissante
+    resume = {}
+    for appel in appels:
+        ligne = resume.setdefault(appel['nom'], {'appels': 0, 'duree': 0.0, 'cpu': 0.0, 'pic_rss_mo': None,
+                                                 'noeuds_max': None})
+        ligne['appels'] += 1
+        ligne['duree'] += appel['duree']
+        ligne['cpu'] += appel['cpu']
+        for cle, valeur in (('pic_rss_mo', appel['pic_rss_mo']), ('noeuds_max', appel['noeuds'])):
+            if valeur is not None:
+                ligne[cle] = valeur if ligne[cle] is None else max(ligne[cle], valeur)
+    return dict(sorted(resume.items(), key=lambda element: -element[1]['duree']))
+
+
+def terminer_instrumentation(afficher=True):
+    """
+    Désactive la mesure et écrit le fichier de la session : événements de trace (traceEvents),
+    liste des appels et résumé par fonction. Retourne le chemin du fichier.
+    """
+    if not _SESSION['actif']:
+        return None
+    chemin, mode = _SESSION['chemin'], _SESSION['mode']
+    appels = list(_SESSION['appels'])
+    for annexe in glob.glob(f"{chemin}.*.jsonl"):
+        with open(annexe) as f:
+            appels.extend(json.loads(ligne) for ligne in f)
+        os.remove(annexe)
+    appels.sort(key=lambda appel: appel['debut'])
+    if mode == 'tracemalloc':
+        tracemalloc.stop()
+    if mode == 'cprofile':
+        profils = sorted(glob.glob(f"{chemin}.*.prof"))
+        if profils:
+            pstats.Stats(*profils).dump_stats(os.path.splitext(chemin)[0] + ".prof")
+            for profil in profils:
+                os.remove(profil)
+    _SESSION.update(actif=False, appels=[])
+
+    evenements = [{
+        'name': appel['nom'], 'cat': appel['categorie'], 'ph': 'X', 'pid': appel['pid'], 'tid': appel['fil'],
+        'ts': appel['debut'] * 1e6, 'dur': appel['duree'] * 1e6,
+        'args': {cle: valeur for cle, valeur in appel.items()
+                 if cle not in ('nom', 'categorie', 'pid', 'fil', 'debut', 'duree') and valeur is not None},
+    } for appel in appels]
+    resume = _resume([appel for appel in appels if appel['profondeur'] == 0 or appel['categorie'] == 'section'])
+    with open(chemin, "w") as f:
+        json.dump({'traceEvents': evenements, 'displayTimeUnit': 'ms', 'mode': mode,
+                   'appels': appels, 'resume': resume}, f, indent=1)
+
+    if afficher:
+        print(f"\nProfil ({mode}) sauvegarde dans {chemin}")
+        for nom, ligne in list(resume.items())[:15]:
+            pic = "" if ligne['pic_rss_mo'] is None else f", pic {ligne['pic_rss_mo']:.0f} Mo"
+            taille = "" if ligne['noeuds_max'] is None else f", {ligne['noeuds_max']} noeuds"
+            print(f"   {nom}: {ligne['duree']:.2f} s (cpu {ligne['cpu']:.2f} s, {ligne['appels']} appel(s){pic}{taille})")
+    return chemin
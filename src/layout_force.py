@@ -0,0 +1,293 @@
+# src/layout_force.py
+# Layout force-dirigé (modèle de Fruchterman-Reingold, comme nx.spring_layout) vectorisé
+# pour les grands graphes, en 2D comme en 3D :
+#   - répulsion exacte par blocs pour les petits graphes ;
+#   - au-delà, approximation de type Barnes-Hut sur une grille hiérarchique (quadtree/octree) :
+#     les cellules éloignées agissent par leur barycentre, les cellules voisines exactement ;
+#   - grossissement multiniveau (regroupement autour de centres indépendants) pour démarrer
+#     d'une esquisse globale au lieu de positions aléatoires ;
+#   - démarrage à chaud optionnel à partir de positions existantes.
+
+import itertools                # Décalages entre cellules de la grille
+import numpy as np              # Calcul vectorisé
+import networkx as nx           # Graphe d'entrée
+from src.graphe_compact import creer_graphe_compact, aretes, nb_noeuds
+from src.cache_metriques import obtenir_metrique
+from src.cache_layouts import layout_en_cache
+
+
+# Paramètres partagés par tous les appels du projet (layouts 2D, panneau des communautés, 3D)
+PARAMETRES_SPRING = {'iterations': 50, 'seed': 42}
+
+SEUIL_EXACT = 2000      # Nombre de nœuds jusqu'auquel la répulsion est calculée exactement
+TAILLE_GROSSIERE = 50   # Taille du niveau le plus grossier de la hiérarchie multiniveau
+
+
+def _repulsion_exacte(pos, k2, taille_bloc=1024):
+    # Somme exacte des forces k²·delta/d², par blocs de lignes pour borner la mémoire
+    force = np.zeros_like(pos)
+    for debut in range(0, len(pos), taille_bloc):
+        delta = pos[debut:debut + taille_bloc, None, :] - pos[None, :, :]
+        d2 = np.maximum((delta ** 2).sum(axis=-1), 1e-4)
+        force[debut:debut + taille_bloc] = k2 * (delta / d2[..., None]).sum(axis=1)
+    return force
+
+
+def _ajouter(force, lignes, valeurs):
+    # force[lignes] += valeurs, avec accumulation des doublons
+    for a in range(force.shape[1]):
+        force[:, a] += np.bincount(lignes, weights=valeurs[:, a], minlength=len(force))
+
+
+def _decalages_lointains(dim):
+    # Pour chaque parité de cellule : décalages vers les enfants des voisines de la cellule parente
+    # qui ne sont pas voisines de la cellule elle-même (liste d'interaction)
+    bases = np.array(list(itertools.product(range(-2, 4), repeat=dim)))
+    decalages = {}
+    for parite in itertools.product((0, 1), repeat=dim):
+        d = bases - np.array(parite)
+        decalages[parite] = d[np.abs(d).max(axis=1) > 1]
+    return decalages
+
+
+def _repulsion_grille(pos, k2, occupation_max=8, taille_bloc=4096, paires_max=4_000_000):
+    """
+    Répulsion approchée sur une grille hiérarchique : à chaque niveau l, un nœud interagit
+    avec les barycentres des cellules enfants des voisines de sa cellule parente qui ne sont pas
+    voisines de sa propre cellule (liste d'interaction de Barnes-Hut / FMM) ; au niveau le plus fin,
+    les nœuds des cellules voisines sont traités exactement.
+    La grille est raffinée jusqu'à ce qu'aucune cellule ne contienne plus de occupation_max nœuds
+    (profondeur limitée), et bordée de 3 cellules vides : aucun test de bornes n'est nécessaire.
+    """
+    n, dim = pos.shape
+    niveau_max = 10 if dim == 2 else 7
+    mini = pos.min(axis=0)
+    etendue = (pos.max(axis=0) - mini).max() or 1.0
+    unite = (pos - mini) / (etendue * (1 + 1e-9))
+    force = np.zeros_like(pos)
+    lointains = _decalages_lointains(dim)
+
+    for niveau in range(2, niveau_max + 1):
+        m = 2 ** niveau
+        cote = m + 6
+        pas_lineaires = cote ** np.arange(dim - 1, -1, -1)
+        cellule = np.minimum((unite * m).astype(np.int64), m - 1)
+        lin = (cellule + 3) @ pas_lineaires
+        masse = np.bincount(lin, minlength=cote ** dim).astype(float)
+        barycentre = np.stack([np.bincount(lin, weights=pos[:, a], minlength=cote ** dim) for a in range(dim)], axis=1)
+        barycentre /= np.maximum(masse, 1)[:, None]
+        code_parite = (cellule % 2) @ (2 ** np.arange(dim - 1, -1, -1))
+
+        # Champ lointain : barycentres des cellules de la liste d'interaction
+        for code, decalages in enumerate(lointains.values()):
+            membres = np.nonzero(code_parite == code)[0]
+            decalages_lin = decalages @ pas_lineaires
+            for debut in range(0, len(membres), taille_bloc):
+                i = membres[debut:debut + taille_bloc]
+                j = lin[i][:, None] + decalages_lin[None, :]
+                delta = pos[i][:, None, :] - barycentre[j]
+                d2 = np.maximum(np.einsum('ijk,ijk->ij', delta, delta), 1e-4)
+                force[i] += k2 * np.einsum('ij,ijk->ik', masse[j] / d2, delta)
+        if masse.max() <= occupation_max:
+            break
+
+    # Champ proche : interactions exactes avec les nœuds des cellules voisines (niveau le plus fin),
+    # par blocs de nœuds pour borner le nombre de paires traitées à la fois
+    ordre = np.argsort(lin, kind='stable')
+    debut_cellule = np.concatenate([[0], np.cumsum(masse.astype(np.int64))])
+    voisines = np.array(list(itertools.product((-1, 0, 1), repeat=dim))) @ pas_lineaires
+    cumul = np.cumsum(masse[lin[:, None] + voisines[None, :]].sum(axis=1))
+    debut = 0
+    while debut < n:
+        deja = cumul[debut - 1] if debut else 0
+        fin = max(int(np.searchsorted(cumul, deja + paires_max, side='right')), debut + 1)
+        t = (lin[debut:fin, None] + voisines[None, :]).ravel()
+        nb = masse[t].astype(np.int64)
+        src = np.repeat(np.repeat(np.arange(debut, fin), len(voisines)), nb)
+        rang = np.arange(nb.sum()) - np.repeat(np.cumsum(nb) - nb, nb)
+        j = ordre[np.repeat(debut_cellule[t], nb) + rang]
+        autre = src != j
+        src, j = src[autre], j[autre]
+        delta = pos[src] - pos[j]
+        d2 = np.maximum(np.einsum('ij,ij->i', delta, delta), 1e-4)
+        _ajouter(force, src, k2 * delta / d2[:, None])
+        debut = fin
+    return force
+
+
+def _iterer(pos, sources, cibles, k, iterations, temperature, seuil_exact, tolerance):
+    # Itérations de Fruchterman-Reingold avec refroidissement linéaire (comme nx.spring_layout)
+    n = len(pos)
+    k2 = k * k
+    pas = temperature / (iterations + 1)
+    for _ in range(iterations):
+        if n <= seuil_exact:
+            deplacement = _repulsion_exacte(pos, k2)
+        else:
+            deplacement = _repulsion_grille(pos, k2)
+        delta = pos[sources] - pos[cibles]
+        distance = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 0.01)
+        attraction = delta * (distance / k)[:, None]
+        _ajouter(deplacement, sources, -attraction)
+        _ajouter(deplacement, cibles, attraction)
+
+        longueur = np.maximum(np.sqrt((deplacement ** 2).sum(axis=1)), 0.01)
+        variation = deplacement * (temperature / longueur)[:, None]
+        pos = pos + variation
+        temperature -= pas
+        if np.linalg.norm(variation) / n < tolerance:
+            break
+    return pos
+
+
+def _regrouper(indptr, indices, rng, tours=3):
+    """
+    Un niveau de grossissement : des centres indépendants (maxima locaux d'une priorité aléatoire)
+    absorbent leurs voisins. Retourne le numéro de groupe de chaque nœud et le nombre de groupes.
+    """
+    n = len(indptr) - 1
+    degre = np.diff(indptr)
+    lignes = np.repeat(np.arange(n), degre)
+    priorite = rng.random(n)
+    parent = np.full(n, -1)
+    a_voisins = degre > 0
+    debuts = indptr[:-1][a_voisins]
+
+    def max_voisins(valeurs):
+        resultat = np.full(n, -1.0)
+        if len(indices):
+            resultat[a_voisins] = np.maximum.reduceat(valeurs[indices], debuts)
+        return resultat
+
+    for _ in range(tours):
+        libre = parent < 0
+        p = np.where(libre, priorite, -1.0)
+        nouveaux = libre & (p > max_voisins(p))
+        parent[nouveaux] = np.nonzero(nouveaux)[0]
+        # Un nœud libre rejoint le centre voisin de plus forte priorité
+        est_centre = parent == np.arange(n)
+        pc = np.where(est_centre, priorite, -1.0)
+        meilleur = max_voisins(pc)
+        candidat = parent[lignes] < 0
+        candidat &= (pc[indices] == meilleur[lignes]) & (meilleur[lignes] >= 0)
+        noeud, premier = np.unique(lignes[candidat], return_index=True)
+        parent[noeud] = indices[candidat][premier]
+    seuls = parent < 0
+    parent[seuls] = np.nonzero(seuls)[0]
+    groupes, parent = np.unique(parent, return_inverse=True)
+    return parent, len(groupes)
+
+
+def _hierarchie(C, rng):
+    # Suite de graphes de plus en plus grossiers : [(groupe de chaque nœud du niveau précédent, arêtes)]
+    sources, cibles = aretes(C)
+    indptr, indices, n = C['indptr'], C['indices'], nb_noeuds(C)
+    niveaux = []
+    while n > TAILLE_GROSSIERE and len(niveaux) < 30:
+        groupe, n_grossier = _regrouper(indptr, indices, rng)
+        if n_grossier > 0.9 * n:
+            break
+        u, v = groupe[sources], groupe[cibles]
+        garder = u != v
+        cles = np.unique(np.minimum(u, v)[garder] * n_grossier + np.maximum(u, v)[garder])
+        sources, cibles = cles // n_grossier, cles % n_grossier
+        lignes = np.concatenate([sources, cibles])
+        ordre = np.argsort(lignes, kind='stable')
+        indices = np.concatenate([cibles, sources])[ordre]
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(lignes, minlength=n_grossier))])
+        niveaux.append((groupe, sources, cibles))
+        n = n_grossier
+    return niveaux
+
+
+def _normaliser(pos, echelle):
+    # Centre et met à l'échelle dans [-echelle, echelle] (comme nx.rescale_layout)
+    pos = pos - pos.mean(axis=0)
+    limite = np.abs(pos).max()
+    return pos * (echelle / limite) if limite > 0 else pos
+
+
+def layout_force(G, dim=2, k=None, iterations=50, seed=42, pos_initiales=None,
+                 multiniveau=None, seuil_exact=SEUIL_EXACT, tolerance=1e-4, echelle=1):
+    """
+    Layout force-dirigé pour G (nx.Graph ou graphe compact), en dimension 2 ou 3.
+    - k : distance idéale entre nœuds (défaut 1/sqrt(n), comme NetworkX)
+    - pos_initiales : {noeud: position} pour un démarrage à chaud ; les nœuds absents
+      sont placés au barycentre de leurs voisins connus. Le refroidissement part alors
+      d'une température plus basse et s'arrête dès la convergence.
+    - multiniveau : esquisse sur une hiérarchie de graphes grossiers (défaut : au-delà de seuil_exact nœuds)
+    Retourne {noeud: position} normalisé dans [-echelle, echelle].
+    """
+    C = creer_graphe_compact(G) if isinstance(G, nx.Graph) else G
+    noeuds = C['noeuds'].tolist()
+    n = len(noeuds)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {noeuds[0]: np.zeros(dim)}
+    rng = np.random.default_rng(seed)
+    sources, cibles = aretes(C)
+    sources, cibles = sources.astype(np.int64), cibles.astype(np.int64)
+
+    if pos_initiales is not None:
+        pos = _positions_initiales(C, noeuds, pos_initiales, dim, rng)
+        nb_connus = sum(1 for n_ in noeuds if n_ in pos_initiales)
+        temperature = 0.1 * (1 - nb_connus / n) + 0.02  # Peu de nouveaux nœuds : on bouge peu
+        pos = _iterer(pos, sources, cibles, k or np.sqrt(1.0 / n), iterations, temperature, seuil_exact, tolerance)
+        return dict(zip(noeuds, _normaliser(pos, echelle)))
+
+    if multiniveau is None:
+        multiniveau = n > seuil_exact
+    niveaux = _hierarchie(C, rng) if multiniveau else []
+
+    # Niveau le plus grossier : départ aléatoire dans le cube unité
+    n_niveau = n if not niveaux else int(niveaux[-1][0].max()) + 1
+    pos = rng.random((n_niveau, dim))
+    temperature = 0.1
+    for groupe, s, c in reversed(niveaux):
+        pos = _iterer(pos, s, c, np.sqrt(1.0 / n_niveau), iterations, temperature, seuil_exact, tolerance)
+        # Prolongement : chaque nœud part de la position de son groupe, légèrement perturbée
+        n_niveau = len(groupe)
+        pos = pos[groupe] + rng.normal(scale=0.1 * np.sqrt(1.0 / n_niveau), size=(n_niveau, dim))
+        temperature = 0.05  # Les niveaux plus fins ne font qu'affiner l'esquisse
+    pos = _iterer(pos, sources, cibles, k or np.sqrt(1.0 / n), iterations, temperature, seuil_exact, tolerance)
+    return dict(zip(noeuds, _normaliser(pos, echelle)))
+
+
+def _positions_initiales(C, noeuds, pos_initiales, dim, rng):
+    # Positions connues ramenées dans le cube unité ; nœuds nouveaux au barycentre de leurs voisins connus.
+    # Les coordonnées absentes (ex. passage d'un layout 2D à 3D) sont tirées au hasard.
+    n = len(noeuds)
+    pos = rng.random((n, dim))
+    connus = np.zeros(n, dtype=bool)
+    d = dim
+    for i, noeud in enumerate(noeuds):
+        p = pos_initiales.get(noeud)
+        if p is not None:
+            d = min(len(p), dim)
+            pos[i, :d] = p[:d]
+            connus[i] = True
+    if connus.any():
+        mini = pos[connus, :d].min(axis=0)
+        etendue = (pos[connus, :d].max(axis=0) - mini).max() or 1.0
+        pos[connus, :d] = (pos[connus, :d] - mini) / etendue
+    for i in np.nonzero(~connus)[0]:
+        voisins = C['indices'][C['indptr'][i]:C['indptr'][i + 1]]
+        voisins = voisins[connus[voisins]]
+        if len(voisins):
+            pos[i] = pos[voisins].mean(axis=0) + rng.normal(scale=0.01, size=dim)
+    return pos
+
+
+def layout_partage(G, dim=2):
+    """
+    Layout force-dirigé de G avec les paramètres communs du projet, calculé une seule fois
+    par version du graphe puis réutilisé par toutes les figures (layouts, métriques, 3D).
+    Les positions sont aussi conservées sur disque : l'exécution suivante les relit, ou
+    repart d'elles si le graphe n'a que peu changé.
+    """
+    return obtenir_metrique(G, 'layout_force', calcul=_layout_force_disque, dim=dim, **PARAMETRES_SPRING)
+
+
+def _layout_force_disque(G, **parametres):
+    return layout_en_cache(G, 'force', layout_force, demarrage_a_chaud=True, **parametres)
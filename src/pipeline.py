@@ -0,0 +1,334 @@
+# src/pipeline.py
+# Exécution du projet sous forme de graphe de dépendances entre étapes :
+#   graphe -> layouts, 3d
+#   graphe -> metriques -> reduction, analyse
+# Chaque étape a une clé calculée à partir de ses entrées (code de sa fonction de calcul et de tout
+# ce qu'elle utilise dans src/, clés des étapes amont). Son résultat est mis en cache sur disque sous
+# cette clé : une étape dont la clé n'a pas changé est relue au lieu d'être recalculée. Les figures ont
+# leur propre clé (clé de l'étape + code de la fonction de rendu) : modifier une couleur ne relance
+# que le rendu, modifier un commentaire ne relance rien.
+# Les étapes indépendantes s'exécutent en parallèle dans le pool de rendu (src/rendu_parallele.py).
+
+import os                       # Fichiers du cache
+import ast                      # Code des fonctions dont dépend chaque étape
+import functools                # Modules de src/ analysés une seule fois
+import json                     # Clés des figures déjà produites
+import time                     # Durée de chaque étape
+import pickle                   # Résultats des étapes
+import hashlib                  # Clés des étapes et des figures
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from src.construction_graphe import creer_reseau_social, sauvegarder_graphe
+from src.snapshot import sauvegarder_snapshot
+from src.cache_metriques import obtenir_metrique, deposer_metrique
+from src.visualisation import appliquer_layouts, visualiser_layout_unique, visualiser_tous_layouts
+from src.reduction_dimension import appliquer_pca, appliquer_tsne, visualiser_reduction_dimension
+from src.analyse import analyser_reseau, afficher_rapport_analyse, visualiser_metriques
+from src.visualisation_3d import visualisation_3d
+from src.layout_force import layout_partage
+from src.rendu_parallele import soumettre_figure, attendre_figures
+
+
+DOSSIER_PIPELINE = "output/cache_pipeline"
+# Métriques coûteuses utilisées à la fois par l'analyse et la réduction de dimension : calculées
+# une seule fois par l'étape 'metriques' (les étapes s'exécutent dans des processus distincts)
+METRIQUES_PARTAGEES = ('plus_courts_chemins', 'triangles_clustering')
+DOSSIER_SRC = os.path.dirname(os.path.abspath(__file__))
+MODULES_IGNORES = ('src.instrumentation',)  # Mesures seulement : sans effet sur les résultats
+
+
+# Calcul des étapes (exécuté dans le pool : arguments et résultats doivent être picklables)
+
+def _construire_graphe():
+    G = creer_reseau_social()
+    sauvegarder_graphe(G)
+    sauvegarder_snapshot(G)  # Instantané binaire avec les attributs des nœuds
+    return G
+
+
+def _calculer_metriques(G):
+    return {nom: obtenir_metrique(G, nom) for nom in METRIQUES_PARTAGEES}
+
+
+def _deposer_metriques(G, metriques):
+    # Le cache des métriques est propre à chaque processus : on y replace les valeurs de l'étape 'metriques'
+    for nom, valeur in metriques.items():
+        deposer_metrique(G, nom, valeur)
+
+
+def _reduire(G, metriques):
+    _deposer_metriques(G, metriques)
+    pos_pca, variance_pca = appliquer_pca(G)
+    return pos_pca, variance_pca, appliquer_tsne(G)
+
+
+def _analyser(G, metriques):
+    _deposer_metriques(G, metriques)
+    return analyser_reseau(G)
+
+
+def _layout_3d(G):
+    return layout_partage(G, dim=3)
+
+
+# Figures de chaque étape : liste de (nom, fichier produit, fonction, arguments)
+
+def _figures_layouts(layouts, G):
+    figures = [(f"layout_{nom}", f"output/images/layout_{nom}.png", visualiser_layout_unique,
+                (G, pos, f"Layout {nom.title()}", f"layout_{nom}")) for nom, pos in layouts.items()]
+    figures.append(("comparaison_layouts", "output/images/comparaison_layouts.png",
+                    visualiser_tous_layouts, (G, layouts)))
+    return figures
+
+
+def _figures_reduction(reduction, G, metriques):
+    pos_pca, variance_pca, pos_tsne = reduction
+    return [("reduction_dimension", "output/images/reduction_dimension.png",
+             visualiser_reduction_dimension, (G, pos_pca, pos_tsne, variance_pca))]
+
+
+def _figures_analyse(analyse, G, metriques, layouts):
+    # Positions du layout spring déjà calculées par l'étape 'layouts' (pas de second calcul au rendu)
+    return [("analyse_metriques", "output/images/analyse_metriques.png", visualiser_metriques,
+             (G, analyse, layouts.get('spring')))]
+
+
+def _figures_3d(pos_3d, G):
+    return [("reseau_3d", "output/images/reseau_3d.html", visualisation_3d, (G, pos_3d))]
+
+
+# Résumés affichés dans le processus principal à la fin de chaque étape
+
+def _rapport_graphe(G):
+    print(f"   Graphe cree: {G.number_of_nodes()} noeuds, {G.number_of_edges()} aretes")
+
+
+def _rapport_layouts(layouts, G):
+    print(f"   {len(layouts)} layouts generes")
+
+
+def _rapport_reduction(reduction, G, metriques):
+    print(f"   Variance expliquee par PCA: {sum(reduction[1])*100:.1f}%")
+
+
+def _rapport_analyse(analyse, G, metriques):
+    afficher_rapport_analyse(analyse, G)
+
+
+ETAPES = {
+    'graphe': {'titre': "Construction du graphe", 'dependances': (), 'calcul': _construire_graphe,
+               'fichiers': ("data/reseau_social.csv",),
+               'rapport': _rapport_graphe},
+    'layouts': {'titre': "Application des techniques de layout", 'dependances': ('graphe',),
+                'calcul': appliquer_layouts, 'rapport': _rapport_layouts, 'figures': _figures_layouts},
+    'metriques': {'titre': "Calcul des metriques partagees", 'dependances': ('graphe',),
+                  'calcul': _calculer_metriques},
+    'reduction': {'titre': "Reduction de dimension (PCA & t-SNE)", 'dependances': ('graphe', 'metriques'),
+                  'calcul': _reduire, 'rapport': _rapport_reduction, 'figures': _figures_reduction},
+    'analyse': {'titre': "Analyse des patterns du reseau", 'dependances': ('graphe', 'metriques'),
+                'calcul': _analyser, 'rapport': _rapport_analyse, 'figures': _figures_analyse,
+                'dependances_figures': ('layouts',)},
+    '3d': {'titre': "Creation de la visualisation 3D", 'dependances': ('graphe',), 'calcul': _layout_3d,
+           'figures': _figures_3d},
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _definitions(module):
+    # Définitions de premier niveau d'un module de src/ : nom -> nœud de l'arbre syntaxique
+    # (fonction, classe ou affectation), ou (module, nom d'origine) pour un nom importé
+    with open(os.path.join(DOSSIER_SRC, module.rsplit('.', 1)[-1] + ".py"), encoding='utf-8-sig') as f:
+        arbre = ast.parse(f.read())
+    definitions = {}
+    for noeud in arbre.body:
+        if isinstance(noeud, ast.ImportFrom):
+            for alias in noeud.names:
+                definitions[alias.asname or alias.name] = (noeud.module, alias.name)
+        elif isinstance(noeud, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            definitions[noeud.name] = noeud
+        elif isinstance(noeud, (ast.Assign, ast.AnnAssign)):
+            for cible in (noeud.targets if isinstance(noeud, ast.Assign) else [noeud.target]):
+                for nom in ast.walk(cible):
+                    if isinstance(nom, ast.Name):
+                        definitions[nom.id] = noeud
+    return definitions
+
+
+def _references(noeud):
+    # Noms utilisés par une définition, sous forme (module ou None, nom) ; les décorateurs
+    # (instrumentation) sont ignorés : ils ne changent pas le résultat
+    if isinstance(noeud, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        racines = [noeud.args, *noeud.body]
+    elif isinstance(noeud, ast.ClassDef):
+        racines = [*noeud.bases, *noeud.body]
+    else:
+        racines = [noeud]
+    for racine in racines:
+        for sous in ast.walk(racine):
+            if isinstance(sous, ast.Name):
+                yield None, sous.id
+            elif isinstance(sous, ast.ImportFrom):  # Import différé à l'intérieur d'une fonction
+                for alias in sous.names:
+                    yield sous.module, alias.name
+
+
+def _code_utilise(fonctions):
+    # Code des fonctions données et de tout ce qu'elles utilisent dans src/ (fonctions, constantes,
+    # tables comme METRIQUES), de proche en proche. Les bibliothèques externes ne sont pas suivies.
+    # Les noms sont résolus statiquement : un nom local homonyme d'une fonction l'inclut en trop, sans risque.
+    code, a_visiter = {}, [(f.__module__, f.__name__) for f in fonctions]
+    while a_visiter:
+        module, nom = a_visiter.pop()
+        if not module or not module.startswith('src.') or module in MODULES_IGNORES or (module, nom) in code:
+            continue
+        definition = _definitions(module).get(nom)
+        if isinstance(definition, tuple):
+            a_visiter.append(definition)
+        elif definition is not None:
+            code[module, nom] = ast.dump(definition)
+            a_visiter.extend((m or module, r) for m, r in _references(definition))
+    return [code[cle] for cle in sorted(code)]
+
+
+def _empreinte(*elements, fonctions=()):
+    # Empreinte de valeurs simples et du code des fonctions données (commentaires et mise en forme exclus)
+    h = hashlib.blake2b(digest_size=16)
+    for element in elements:
+        h.update(repr(element).encode())
+    for code in _code_utilise(fonctions):
+        h.update(code.encode())
+    return h.hexdigest()
+
+
+def selectionner_etapes(noms=None, figures=False):
+    """
+    Étapes demandées et leurs dépendances, dans un ordre compatible avec les dépendances.
+    figures=True : ajoute aussi les étapes dont les figures des étapes demandées ont besoin.
+    """
+    ordre = []
+
+    def visiter(nom):
+        if nom not in ordre:
+            etape = ETAPES[nom]
+            for dependance in etape['dependances'] + (etape.get('dependances_figures', ()) if figures else ()):
+                visiter(dependance)
+            ordre.append(nom)
+
+    for nom in noms or ETAPES:
+        visiter(nom)
+    return ordre
+
+
+def cles_etapes(ordre):
+    """Clé de chaque étape : code de sa fonction de calcul (et de ce qu'elle utilise) et clés de ses dépendances."""
+    cles = {}
+    for nom in ordre:
+        etape = ETAPES[nom]
+        cles[nom] = _empreinte(nom, [cles[d] for d in etape['dependances']], fonctions=(etape['calcul'],))
+    return cles
+
+
+def _executer_etape(nom, args):
+    debut = time.perf_counter()
+    return ETAPES[nom]['calcul'](*args), time.perf_counter() - debut
+
+
+def _soumettre(executeur, fonction, *args):
+    # Même principe que soumettre_figure : Future immédiat sans pool
+    if executeur is not None:
+        return executeur.submit(fonction, *args)
+    tache = Future()
+    tache.set_result(fonction(*args))
+    return tache
+
+
+def _lire_resultat(chemin):
+    with open(chemin, 'rb') as f:
+        return pickle.load(f)
+
+
+def _ecrire_resultat(dossier, nom, cle, resultat):
+    # Écriture atomique, puis suppression des anciennes versions de l'étape
+    chemin = os.path.join(dossier, f"{nom}_{cle}.pkl")
+    with open(chemin + ".tmp", 'wb') as f:
+        pickle.dump(resultat, f, pickle.HIGHEST_PROTOCOL)
+    os.replace(chemin + ".tmp", chemin)
+    for fichier in os.listdir(dossier):
+        if fichier.startswith(nom + "_") and fichier.endswith(".pkl") and fichier != os.path.basename(chemin):
+            os.remove(os.path.join(dossier, fichier))
+
+
+def _a_jour(chemin, fichiers):
+    return os.path.exists(chemin) and all(os.path.exists(f) for f in fichiers)
+
+
+def executer_pipeline(noms=None, forcer=False, executeur=None, dossier=DOSSIER_PIPELINE, figures=True):
+    """
+    Exécute les étapes `noms` (toutes par défaut) et leurs dépendances.
+    - forcer : ignore le cache et recalcule tout
+    - executeur : pool de processus (voir demarrer_rendu) ; sans pool, tout s'exécute en séquence
+    - figures : False pour n'afficher que les rapports (aucune bibliothèque de dessin chargée)
+    Les étapes à jour sont relues depuis le cache, leurs figures ne sont refaites que si
+    le code de rendu a changé. Retourne {étape: résultat}.
+    """
+    os.makedirs(dossier, exist_ok=True)
+    ordre = selectionner_etapes(noms, figures)
+    demandees = set(noms or ETAPES) if figures else set()
+    cles = cles_etapes(ordre)
+    chemin_figures = os.path.join(dossier, "figures.json")
+    cles_figures = {}
+    if os.path.exists(chemin_figures):
+        with open(chemin_figures) as f:
+            cles_figures = json.load(f)
+
+    resultats, en_cours, restantes, taches_figures = {}, {}, list(ordre), []
+    a_dessiner = []  # Étapes terminées dont les figures attendent encore des dépendances_figures
+
+    def dessiner(nom):
+        etape = ETAPES[nom]
+        dependances = etape['dependances'] + etape.get('dependances_figures', ())
+        args = tuple(resultats[d] for d in dependances)
+        for nom_figure, fichier, fonction, arguments in etape['figures'](resultats[nom], *args):
+            cle = _empreinte(cles[nom], *[cles[d] for d in etape.get('dependances_figures', ())], fonctions=(fonction,))
+            if not forcer and cles_figures.get(nom_figure) == cle and os.path.exists(fichier):
+                continue
+            cles_figures[nom_figure] = cle
+            taches_figures.append(soumettre_figure(executeur, nom_figure, fonction, *arguments))
+
+    def terminer(nom, duree):
+        etape = ETAPES[nom]
+        print(f"\nEtape {nom}: {etape['titre']} ({'cache' if duree is None else f'{duree:.1f} s'})")
+        args = tuple(resultats[d] for d in etape['dependances'])
+        if 'rapport' in etape:
+            etape['rapport'](resultats[nom], *args)
+        if nom in demandees and 'figures' in etape:
+            a_dessiner.append(nom)
+        for attente in [n for n in a_dessiner if all(d in resultats for d in ETAPES[n].get('dependances_figures', ()))]:
+            a_dessiner.remove(attente)
+            dessiner(attente)
+
+    while restantes or en_cours:
+        # Lance toutes les étapes dont les dépendances sont disponibles
+        for nom in [n for n in restantes if all(d in resultats for d in ETAPES[n]['dependances'])]:
+            restantes.remove(nom)
+            chemin = os.path.join(dossier, f"{nom}_{cles[nom]}.pkl")
+            if not forcer and _a_jour(chemin, ETAPES[nom].get('fichiers', ())):
+                resultats[nom] = _lire_resultat(chemin)
+                terminer(nom, None)
+            else:
+                args = tuple(resultats[d] for d in ETAPES[nom]['dependances'])
+                en_cours[_soumettre(executeur, _executer_etape, nom, args)] = nom
+        if not en_cours:
+            continue
+        finies, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+        for tache in finies:
+            nom = en_cours.pop(tache)
+            resultats[nom], duree = tache.result()
+            _ecrire_resultat(dossier, nom, cles[nom], resultats[nom])
+            terminer(nom, duree)
+
+    if taches_figures:
+        print("\nRendu des figures...")
+        attendre_figures(taches_figures)
+    with open(chemin_figures, 'w') as f:
+        json.dump(cles_figures, f, indent=1)
+    return resultats
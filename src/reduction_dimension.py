@@ -3,97 +3,166 @@
 
 
 import numpy as np                          # Manipulation de tableaux numériques
-from sklearn.decomposition import PCA       # Algorithme PCA (réduction de dimension)
-from sklearn.manifold import TSNE            # Algorithme t-SNE (visualisation)
-import networkx as nx                       # Manipulation de graphes
-import matplotlib.pyplot as plt             # Visualisation graphique
+from src.cache_metriques import obtenir_metrique  # Métriques partagées avec analyse.py
+from src.caracteristiques import construire_matrice, COLONNES_DEFAUT, COLONNES_GRAND, TAILLE_BLOC  # Matrice préallouée, colonnes enregistrées
+from src.rendu_rapide import dessiner_graphe, SEUIL_LABELS  # Rendu groupé pour les grands graphes
+from src.instrumentation import instrumenter, section  # Mesure des appels (durée, CPU, mémoire)
 
+# scikit-learn, openTSNE et matplotlib ne sont importés que dans les fonctions qui s'en servent
 
 
-# CRÉATION DE LA MATRICE DE CARACTÉRISTIQUES DES NŒUDS
+SEUIL_GRAND_GRAPHE = 10_000  # Nombre de nœuds à partir duquel le mode "grand graphe" est choisi
+TAILLE_BLOC_PCA = 50_000     # Lignes de la matrice traitées à la fois par la PCA incrémentale
+
+
+def _opentsne():
+    # t-SNE FFT à voisins approchés (optionnel, mode grand graphe) ; None s'il n'est pas installé
+    try:
+        import openTSNE
+    except ImportError:
+        return None
+    return openTSNE
 
-def creer_matrice_caracteristiques(G):
-    """
-    Transforme un graphe NetworkX en une matrice numérique
-    où chaque ligne représente un nœud et chaque colonne
-    une caractéristique du nœud.
-    """
 
-    # Calcul des mesures de centralité pour chaque nœud
-    degree_centrality = nx.degree_centrality(G)        # Centralité de degré
-    betweenness_centrality = nx.betweenness_centrality(G)  # Centralité d'intermédiarité
-    closeness_centrality = nx.closeness_centrality(G)  # Centralité de proximité
-    clustering_coef = nx.clustering(G)                 # Coefficient de clustering
+def _grand_graphe(G, mode):
+    # mode='auto' : grand graphe au-delà de SEUIL_GRAND_GRAPHE nœuds ; sinon 'exact' ou 'grand'
+    return G.number_of_nodes() >= SEUIL_GRAND_GRAPHE if mode == 'auto' else mode == 'grand'
 
-    # Liste des nœuds du graphe
-    nodes = list(G.nodes())
 
-    # Liste qui contiendra les vecteurs de caractéristiques
-    features = []
+def _colonnes(G, colonnes, mode):
+    # Colonnes demandées, ou par défaut selon la taille du graphe (grand graphe : sans balayage exact)
+    if colonnes is not None:
+        return tuple(colonnes)
+    return COLONNES_GRAND if _grand_graphe(G, mode) else COLONNES_DEFAUT
 
-    # Construction du vecteur de caractéristiques pour chaque nœud
-    for node in nodes:
-        feature_vector = [
-            degree_centrality[node],        # Importance selon le nombre de connexions
-            betweenness_centrality[node],   # Rôle de pont dans le graphe
-            closeness_centrality[node],     # Proximité avec les autres nœuds
-            clustering_coef[node],          # Niveau de regroupement local
-            G.degree(node)                  # Nombre réel de connexions
-        ]
-        features.append(feature_vector)
 
-    # Retourne la matrice des caractéristiques et la liste des nœuds
-    return np.array(features), nodes
+
+# CRÉATION DE LA MATRICE DE CARACTÉRISTIQUES DES NŒUDS
+
+@instrumenter
+def creer_matrice_caracteristiques(G, colonnes=None, dtype='float64', chemin=None, taille_bloc=TAILLE_BLOC):
+    """
+    Transforme un graphe NetworkX en une matrice numérique
+    où chaque ligne représente un nœud et chaque colonne
+    une caractéristique du nœud (voir src/caracteristiques.py).
+    - colonnes : par défaut COLONNES_DEFAUT, ou COLONNES_GRAND au-delà de SEUIL_GRAND_GRAPHE nœuds
+    - dtype : 'float32' divise la mémoire par deux
+    - chemin : fichier .npy pour une matrice projetée sur disque
+    - taille_bloc : nœuds calculés à la fois pendant le remplissage
+    La matrice est mise en cache : PCA et t-SNE partagent le même calcul
+    et la lisent directement, sans copie ni conversion.
+    """
+    return obtenir_metrique(G, 'matrice_caracteristiques', calcul=construire_matrice,
+                            colonnes=_colonnes(G, colonnes, 'auto'), dtype=dtype, chemin=chemin,
+                            taille_bloc=taille_bloc)
 
 
 
 # APPLICATION DE LA PCA (RÉDUCTION LINÉAIRE)
 
-def appliquer_pca(G, n_components=2):
+@instrumenter
+def appliquer_pca(G, n_components=2, mode='auto', taille_bloc=TAILLE_BLOC_PCA, colonnes=None,
+                  dtype='float64', chemin_matrice=None, bloc_matrice=TAILLE_BLOC):
     """
     Applique la PCA pour réduire la dimension des données du graphe.
+    En mode grand graphe, la PCA est ajustée bloc par bloc (IncrementalPCA) :
+    la mémoire de travail reste bornée par taille_bloc lignes, et les colonnes par défaut
+    (COLONNES_GRAND) évitent le balayage exact des plus courts chemins.
+    chemin_matrice / bloc_matrice : matrice des caractéristiques projetée sur disque
+    et taille de ses blocs de remplissage (voir creer_matrice_caracteristiques).
     """
+    positions_pca, variance_expliquee, nodes = obtenir_metrique(G, 'projection_pca', calcul=_projeter_pca,
+                                                                n_components=n_components,
+                                                                grand=_grand_graphe(G, mode), taille_bloc=taille_bloc,
+                                                                colonnes=_colonnes(G, colonnes, mode), dtype=dtype,
+                                                                chemin_matrice=chemin_matrice, bloc_matrice=bloc_matrice)
 
-    # Création de la matrice de caractéristiques
-    features, nodes = creer_matrice_caracteristiques(G)
+    # Association de chaque nœud à ses coordonnées PCA
+    pos = dict(zip(nodes, positions_pca))
 
-    # Initialisation de la PCA
-    pca = PCA(n_components=n_components)
+    return pos, variance_expliquee
 
-    # Réduction de dimension (projection en 2D)
-    positions_pca = pca.fit_transform(features)
 
-    # Association de chaque nœud à ses coordonnées PCA
-    pos = {nodes[i]: positions_pca[i] for i in range(len(nodes))}
+def _projeter_pca(G, n_components, grand, taille_bloc, colonnes, dtype, chemin_matrice=None, bloc_matrice=TAILLE_BLOC):
+    # Projection PCA mise en cache : elle sert aussi d'initialisation au t-SNE
+    from sklearn.decomposition import PCA, IncrementalPCA  # PCA exacte, ou par blocs pour les grands graphes
 
-    # Pourcentage de variance expliquée par chaque composante
-    variance_expliquee = pca.explained_variance_ratio_
+    # Création de la matrice de caractéristiques
+    features, nodes = creer_matrice_caracteristiques(G, colonnes, dtype, chemin_matrice, bloc_matrice)
+
+    if not grand:
+        # Initialisation de la PCA
+        pca = PCA(n_components=n_components)
+
+        # Réduction de dimension (projection en 2D)
+        positions_pca = pca.fit_transform(features)
+    else:
+        # Ajustement puis projection par blocs de lignes (vues sur la matrice, sans copie intégrale)
+        pca = IncrementalPCA(n_components=n_components)
+        blocs = [slice(debut, debut + taille_bloc) for debut in range(0, len(features), taille_bloc)]
+        for bloc in blocs:
+            if len(features[bloc]) >= n_components:  # partial_fit exige au moins n_components lignes
+                pca.partial_fit(features[bloc])
+        positions_pca = np.concatenate([pca.transform(features[bloc]) for bloc in blocs])
 
-    return pos, variance_expliquee
+    # Pourcentage de variance expliquée par chaque composante
+    return positions_pca, pca.explained_variance_ratio_, nodes
 
 
 
 # APPLICATION DU t-SNE (RÉDUCTION NON LINÉAIRE)
 
-def appliquer_tsne(G, n_components=2, perplexity=5):
+@instrumenter
+def appliquer_tsne(G, n_components=2, perplexity=5, mode='auto', n_jobs=None, colonnes=None,
+                   dtype='float64', chemin_matrice=None, bloc_matrice=TAILLE_BLOC):
     """
     Applique t-SNE pour une visualisation basée sur
     la similarité locale entre les nœuds.
+    L'initialisation reprend la projection PCA (calculée une seule fois, partagée avec appliquer_pca).
+    En mode grand graphe : voisins approchés et gradient par FFT (openTSNE) si disponible,
+    sinon approximation de Barnes-Hut de scikit-learn ; n_jobs threads pour la recherche de voisins.
+    colonnes / chemin_matrice / bloc_matrice : comme pour appliquer_pca (même matrice partagée).
     """
 
     # Création de la matrice de caractéristiques
-    features, nodes = creer_matrice_caracteristiques(G)
-
-    # Initialisation de t-SNE
-    tsne = TSNE(
-        n_components=n_components,   # Dimension finale (2D)
-        perplexity=perplexity,       # Taille du voisinage
-        random_state=42,              # Résultats reproductibles
-        max_iter=1000                 # Nombre d'itérations
-    )
-
-    # Réduction de dimension
-    positions_tsne = tsne.fit_transform(features)
+    grand = _grand_graphe(G, mode)
+    colonnes = _colonnes(G, colonnes, mode)
+    features, nodes = creer_matrice_caracteristiques(G, colonnes, dtype, chemin_matrice, bloc_matrice)
+
+    # Initialisation par la PCA, mise à l'échelle comme init='pca' de scikit-learn
+    positions_pca = obtenir_metrique(G, 'projection_pca', calcul=_projeter_pca, n_components=n_components,
+                                     grand=grand, taille_bloc=TAILLE_BLOC_PCA, colonnes=colonnes,
+                                     dtype=dtype, chemin_matrice=chemin_matrice, bloc_matrice=bloc_matrice)[0]
+    initialisation = positions_pca / (np.std(positions_pca[:, 0]) or 1.0) * 1e-4
+
+    openTSNE = _opentsne() if grand else None
+    if openTSNE is not None:
+        # Voisins approchés (Annoy) et gradient interpolé par FFT : quasi linéaire en nombre de nœuds
+        positions_tsne = np.asarray(openTSNE.TSNE(
+            n_components=n_components,
+            perplexity=perplexity,
+            initialization=initialisation,
+            neighbors='approx',
+            negative_gradient_method='fft',
+            n_jobs=n_jobs or 1,
+            random_state=42,
+        ).fit(features))
+    else:
+        from sklearn.manifold import TSNE  # Algorithme t-SNE (visualisation)
+
+        # Initialisation de t-SNE
+        tsne = TSNE(
+            n_components=n_components,   # Dimension finale (2D)
+            perplexity=perplexity,       # Taille du voisinage
+            init=initialisation,         # Projection PCA partagée
+            method='barnes_hut',         # Gradient approché en O(N log N)
+            n_jobs=n_jobs,               # Threads pour la recherche des voisins
+            random_state=42,              # Résultats reproductibles
+            max_iter=1000                 # Nombre d'itérations
+        )
+
+        # Réduction de dimension
+        positions_tsne = tsne.fit_transform(features)
 
     # Association de chaque nœud à ses coordonnées t-SNE
     pos = {nodes[i]: positions_tsne[i] for i in range(len(nodes))}
@@ -104,12 +173,15 @@ def appliquer_tsne(G, n_components=2, perplexity=5):
 
 # VISUALISATION PCA VS t-SNE
 
+@instrumenter
 def visualiser_reduction_dimension(G, pos_pca, pos_tsne, variance_pca):
     """
     Affiche le graphe avec deux méthodes de réduction
     de dimension : PCA et t-SNE.
     """
 
+    import matplotlib.pyplot as plt  # Visualisation graphique (import différé)
+
     # Création de deux graphiques côte à côte
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
 
@@ -129,15 +201,13 @@ def visualiser_reduction_dimension(G, pos_pca, pos_tsne, variance_pca):
 
     # GRAPHE AVEC PCA
 
-    nx.draw_networkx_nodes(G, pos_pca, node_color=node_colors,
-                           node_size=300, alpha=0.8, ax=ax1)
+    # Labels des nœuds (nom si disponible, sinon ID), seulement pour les graphes de taille lisible
+    labels = None
+    if G.number_of_nodes() <= SEUIL_LABELS:
+        labels = {n: G.nodes[n].get('nom', str(n)) for n in G.nodes()}
 
-    nx.draw_networkx_edges(G, pos_pca, alpha=0.4,
-                           width=1, edge_color='gray', ax=ax1)
-
-    # Labels des nœuds (nom si disponible, sinon ID)
-    labels = {n: G.nodes[n].get('nom', str(n)) for n in G.nodes()}
-    nx.draw_networkx_labels(G, pos_pca, labels, font_size=7, ax=ax1)
+    dessiner_graphe(G, pos_pca, ax=ax1, node_color=node_colors, node_size=300,
+                    alpha_noeuds=0.8, labels=labels, font_size=7)
 
     # Titre avec la variance expliquée
     ax1.set_title(
@@ -149,13 +219,8 @@ def visualiser_reduction_dimension(G, pos_pca, pos_tsne, variance_pca):
     
     # GRAPHE AVEC t-SNE
     
-    nx.draw_networkx_nodes(G, pos_tsne, node_color=node_colors,
-                           node_size=300, alpha=0.8, ax=ax2)
-
-    nx.draw_networkx_edges(G, pos_tsne, alpha=0.4,
-                           width=1, edge_color='gray', ax=ax2)
-
-    nx.draw_networkx_labels(G, pos_tsne, labels, font_size=7, ax=ax2)
+    dessiner_graphe(G, pos_tsne, ax=ax2, node_color=node_colors, node_size=300,
+                    alpha_noeuds=0.8, labels=labels, font_size=7)
 
     ax2.set_title("t-SNE Layout", fontsize=12)
     ax2.axis('off')
@@ -166,6 +231,7 @@ def visualiser_reduction_dimension(G, pos_pca, pos_tsne, variance_pca):
 
     # Ajustement et sauvegarde
     plt.tight_layout()
-    plt.savefig("output/images/reduction_dimension.png",
-                dpi=300, bbox_inches='tight')
+    with section("savefig", G):
+        plt.savefig("output/images/reduction_dimension.png",
+                    dpi=300, bbox_inches='tight')
     plt.close()
@@ -0,0 +1,50 @@
+# src/rendu_parallele.py
+# Étape de rendu concurrente : les fonctions de visualisation (génération de la figure et
+# sauvegarde PNG/HTML) sont exécutées dans un pool de processus avec le backend non interactif Agg.
+# Les étapes de calcul soumettent leurs figures dès que les données sont prêtes et continuent ;
+# la durée totale tend vers celle de la figure la plus lente.
+
+import time                                          # Durée de chaque figure
+from concurrent.futures import ProcessPoolExecutor, Future
+
+
+def _initialiser_processus():
+    # Backend sans affichage : les figures ne sont que sauvegardées
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _executer_figure(nom, fonction, args, kwargs):
+    # Exécute une fonction de visualisation et retourne sa durée (le résultat n'est pas renvoyé :
+    # seules les images sauvegardées comptent)
+    debut = time.perf_counter()
+    fonction(*args, **kwargs)
+    return nom, time.perf_counter() - debut
+
+
+def demarrer_rendu(nb_processus=None):
+    """Crée le pool de processus de rendu (nb_processus : par défaut le nombre de cœurs)."""
+    return ProcessPoolExecutor(max_workers=nb_processus, initializer=_initialiser_processus)
+
+
+def soumettre_figure(executeur, nom, fonction, *args, **kwargs):
+    """
+    Soumet fonction(*args, **kwargs) au pool de rendu et retourne immédiatement un Future.
+    Sans pool (executeur=None), la figure est produite tout de suite dans le processus courant.
+    """
+    if executeur is not None:
+        return executeur.submit(_executer_figure, nom, fonction, args, kwargs)
+    tache = Future()
+    tache.set_result(_executer_figure(nom, fonction, args, kwargs))
+    return tache
+
+
+def attendre_figures(taches):
+    """
+    Attend la fin de toutes les figures soumises, affiche la durée de chacune
+    et retourne {nom_figure: durée en secondes}.
+    """
+    durees = dict(tache.result() for tache in taches)
+    for nom, duree in sorted(durees.items(), key=lambda x: x[1], reverse=True):
+        print(f"   Figure {nom}: {duree:.2f} s")
+    return durees
@@ -0,0 +1,77 @@
+# src/rendu_rapide.py
+# Rendu rapide d'un graphe dans un axe matplotlib, pour les grands réseaux :
+#   - toutes les arêtes dans un seul LineCollection construit à partir d'un tableau NumPy
+#     de segments, tous les nœuds dans un seul scatter (rastérisés dans les fichiers vectoriels) ;
+#   - pas d'étiquettes au-delà d'un nombre de nœuds ;
+#   - au-delà d'un nombre d'arêtes, les arêtes sont agrégées en une carte de densité
+#     (mémoire bornée, indépendante du nombre d'artistes).
+
+import numpy as np                               # Tableaux de positions et de segments
+from src.cache_metriques import obtenir_metrique
+from src.graphe_compact import aretes
+
+
+SEUIL_LABELS = 200          # Nombre de nœuds au-delà duquel les étiquettes ne sont plus dessinées
+SEUIL_DENSITE = 200_000     # Nombre d'arêtes au-delà duquel elles sont dessinées en carte de densité
+RESOLUTION_DENSITE = 1000   # Taille (en cellules) de la carte de densité
+ECHANTILLONS_ARETE = 16     # Points échantillonnés le long de chaque arête pour la densité
+
+
+def positions_tableau(G, pos):
+    """Positions des nœuds de G (dans l'ordre de G.nodes()) sous forme de tableau n x 2."""
+    return np.array([pos[n][:2] for n in G.nodes()], dtype=float).reshape(-1, 2)
+
+
+def _densite_aretes(ax, P, sources, cibles, couleur_map, taille_bloc=100_000):
+    # Histogramme 2D de points échantillonnés le long des arêtes, traité par blocs
+    mini, maxi = P.min(axis=0), P.max(axis=0)
+    etendue = np.where(maxi > mini, maxi - mini, 1.0)
+    carte = np.zeros((RESOLUTION_DENSITE, RESOLUTION_DENSITE))
+    t = np.linspace(0, 1, ECHANTILLONS_ARETE)[None, :, None]
+    for debut in range(0, len(sources), taille_bloc):
+        a = P[sources[debut:debut + taille_bloc]][:, None, :]
+        b = P[cibles[debut:debut + taille_bloc]][:, None, :]
+        points = ((a * (1 - t) + b * t) - mini) / etendue
+        cellules = np.minimum((points * RESOLUTION_DENSITE).astype(np.int64), RESOLUTION_DENSITE - 1).reshape(-1, 2)
+        carte += np.bincount(cellules[:, 0] * RESOLUTION_DENSITE + cellules[:, 1],
+                             minlength=RESOLUTION_DENSITE ** 2).reshape(RESOLUTION_DENSITE, RESOLUTION_DENSITE)
+    ax.imshow(np.log1p(carte).T, origin='lower', cmap=couleur_map, interpolation='bilinear', zorder=1,
+              extent=(mini[0], maxi[0], mini[1], maxi[1]), aspect='auto')
+
+
+def dessiner_graphe(G, pos, ax=None, node_color='#1f78b4', node_size=300, alpha_noeuds=0.8,
+                    edge_color='gray', alpha_aretes=0.4, largeur_aretes=1.0, labels=None,
+                    font_size=8, font_weight='normal', seuil_labels=SEUIL_LABELS, seuil_densite=SEUIL_DENSITE):
+    """
+    Dessine G avec les positions pos dans l'axe ax (axe courant par défaut).
+    Même rendu que nx.draw_networkx_nodes/edges/labels pour les petits graphes,
+    mais avec un artiste par type d'élément au lieu d'un par étiquette.
+    - labels : {noeud: texte}, ignoré au-delà de seuil_labels nœuds
+    - au-delà de seuil_densite arêtes, les arêtes deviennent une carte de densité
+    """
+    import matplotlib.pyplot as plt                    # Import différé (matplotlib n'est chargé que pour dessiner)
+    from matplotlib.collections import LineCollection  # Toutes les arêtes en un seul artiste
+    ax = ax or plt.gca()
+    P = positions_tableau(G, pos)
+    n = len(P)
+    sources, cibles = aretes(obtenir_metrique(G, 'graphe_compact'))
+
+    if len(sources) > seuil_densite:
+        _densite_aretes(ax, P, sources, cibles, 'Greys')
+    elif len(sources):
+        segments = np.stack([P[sources], P[cibles]], axis=1)
+        ax.add_collection(LineCollection(segments, colors=edge_color, linewidths=largeur_aretes,
+                                         alpha=alpha_aretes, zorder=1, rasterized=n > seuil_labels))
+
+    # Au-delà du seuil d'étiquettes, la taille des nœuds est réduite pour rester lisible
+    taille = np.asarray(node_size, dtype=float)
+    if n > seuil_labels:
+        taille = taille * max(seuil_labels / n, 0.002)
+    ax.scatter(P[:, 0], P[:, 1], s=taille, c=node_color, alpha=alpha_noeuds, zorder=2,
+               rasterized=n > seuil_labels)
+
+    if labels is not None and n <= seuil_labels:
+        for (x, y), noeud in zip(P, G.nodes()):
+            ax.text(x, y, labels[noeud], fontsize=font_size, fontweight=font_weight,
+                    ha='center', va='center', zorder=3)
+    ax.autoscale_view()
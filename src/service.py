@@ -0,0 +1,288 @@
+# src/service.py
+# Service local de requêtes sur le réseau : le graphe est chargé une fois (instantané binaire,
+# voir src/snapshot.py) et les index sont précalculés à partir de analyser_reseau :
+#   - classement des nœuds par centralité, global et par groupe ;
+#   - communauté de chaque nœud et taille des communautés ;
+#   - correspondance identifiant / nom -> indice.
+# Les requêtes (top-k, voisinage à k sauts, communauté, fiche d'un nœud) répondent alors en
+# quelques millisecondes ; les voisinages calculés sont gardés dans un cache LRU.
+# /recharger construit les index d'un nouvel instantané en arrière-plan pendant que l'ancien
+# continue de répondre, puis les remplace d'un seul coup (aucune interruption).
+# Protocole : HTTP/1.1 minimal (asyncio) sur un port local ou une socket Unix, réponses JSON.
+
+import os                                   # Socket Unix
+import time                                 # Durée des requêtes
+import json                                 # Réponses
+import asyncio                              # Serveur et rechargement en arrière-plan
+from collections import OrderedDict         # Cache LRU des voisinages
+from urllib.parse import urlsplit, parse_qsl
+import numpy as np                          # Index et classements
+from src.snapshot import charger_snapshot
+from src.analyse import analyser_reseau
+from src.cache_metriques import obtenir_metrique
+from src.graphe_compact import nb_noeuds, nb_aretes, valeur_attribut, voisinage_compact
+
+
+HOTE_DEFAUT = "127.0.0.1"
+PORT_DEFAUT = 8765
+TAILLE_LRU = 1024          # Voisinages gardés en cache
+SEUIL_EXACT = 5000         # Au-delà, centralités approchées (analyser_reseau mode='approchee')
+LIMITE_DEFAUT = 1000       # Nombre maximal de nœuds renvoyés par /voisinage et /communaute
+K_MAX = 5                  # Profondeur maximale d'un voisinage
+
+# Centralités indexées : nom court accepté dans les requêtes -> clé de l'analyse
+CENTRALITES = {
+    'degre': 'degree_centrality',
+    'betweenness': 'betweenness_centrality',
+    'closeness': 'closeness_centrality',
+    'eigenvector': 'eigenvector_centrality',
+}
+
+
+class ErreurRequete(Exception):
+    """Requête invalide : le message est renvoyé au client avec le code HTTP donné."""
+
+    def __init__(self, message, statut=400):
+        super().__init__(message)
+        self.statut = statut
+
+
+def construire_index(chemin, mode=None):
+    """
+    Charge l'instantané `chemin` et précalcule les index des requêtes.
+    mode : mode de analyser_reseau ('exacte' ou 'approchee' ; par défaut selon SEUIL_EXACT).
+    """
+    debut = time.perf_counter()
+    G = charger_snapshot(chemin, networkx=True)  # Les métriques sauvegardées ne sont pas recalculées
+    mode = mode or ('exacte' if G.number_of_nodes() <= SEUIL_EXACT else 'approchee')
+    analyse = analyser_reseau(G, mode=mode)
+    C = obtenir_metrique(G, 'graphe_compact')
+    noeuds = C['noeuds'].tolist()
+
+    scores = {nom: np.fromiter((analyse[cle][n] for n in noeuds), dtype=float, count=len(noeuds))
+              for nom, cle in CENTRALITES.items()}
+    groupes = C['categories'].get('groupe', [])
+    codes = C['attributs']['groupe'] if 'groupe' in C['attributs'] else np.zeros(len(noeuds), dtype=np.int8)
+    classements = {}
+    for nom, valeurs in scores.items():
+        ordre = np.argsort(-valeurs, kind='stable')  # Classement global, puis restreint à chaque groupe
+        classements[nom] = {None: ordre, **{g: ordre[codes[ordre] == c] for c, g in enumerate(groupes)}}
+
+    noms = {}
+    if 'nom' in C['attributs']:
+        for i, nom in enumerate(C['attributs']['nom'].tolist()):
+            noms.setdefault(nom, []).append(i)
+    communautes = np.asarray(analyse['communaute_noeud'])
+    return {
+        'chemin': chemin, 'mode': mode, 'charge_le': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'duree_chargement': time.perf_counter() - debut,
+        'C': C, 'scores': scores, 'classements': classements,
+        'ids': {str(n): i for i, n in enumerate(noeuds)}, 'noms': noms,
+        'communautes': communautes, 'tailles_communautes': np.bincount(communautes),
+        'modularite': analyse['modularite'],
+        'lru': OrderedDict(), 'succes_lru': 0, 'echecs_lru': 0,
+    }
+
+
+def _indice(index, noeud):
+    # Identifiant (prioritaire) ou nom d'utilisateur -> indice dans le graphe compact
+    if noeud is None:
+        raise ErreurRequete("parametre 'noeud' manquant")
+    if noeud in index['ids']:
+        return index['ids'][noeud]
+    candidats = index['noms'].get(noeud, [])
+    if not candidats:
+        raise ErreurRequete(f"noeud inconnu: {noeud}", 404)
+    if len(candidats) > 1:
+        raise ErreurRequete(f"nom ambigu: {noeud} (identifiants {[_identifiant(index, i) for i in candidats]})")
+    return candidats[0]
+
+
+def _entier(params, nom, defaut, maximum=None):
+    try:
+        valeur = int(params.get(nom, defaut))
+    except ValueError:
+        raise ErreurRequete(f"parametre '{nom}' entier attendu")
+    if valeur < 0:
+        raise ErreurRequete(f"parametre '{nom}' positif ou nul attendu")
+    if maximum is not None and valeur > maximum:
+        raise ErreurRequete(f"parametre '{nom}' hors limites (0..{maximum})")
+    return valeur
+
+
+def _identifiant(index, i):
+    noeud = index['C']['noeuds'][i]
+    return noeud.item() if hasattr(noeud, 'item') else noeud
+
+
+def _fiche(index, i, distance=None):
+    # Description courte d'un nœud dans les réponses
+    C = index['C']
+    fiche = {'id': _identifiant(index, i)}
+    for attribut in C['attributs']:
+        fiche[attribut] = valeur_attribut(C, attribut, i)
+    if distance is not None:
+        fiche['distance'] = distance
+    return fiche
+
+
+def _voisinage_en_cache(index, i, k):
+    # Voisinage à k sauts, gardé dans le cache LRU de l'index
+    cle = (i, k)
+    lru = index['lru']
+    if cle in lru:
+        lru.move_to_end(cle)
+        index['succes_lru'] += 1
+        return lru[cle]
+    index['echecs_lru'] += 1
+    lru[cle] = voisinage_compact(index['C'], [i], k)
+    if len(lru) > TAILLE_LRU:
+        lru.popitem(last=False)
+    return lru[cle]
+
+
+# Requêtes : chemin -> fonction(index, paramètres) retournant un dictionnaire JSON
+
+def _requete_top(index, params):
+    # /top?metrique=betweenness&groupe=Artistes&k=10
+    metrique = params.get('metrique', 'degre')
+    metrique = next((nom for nom, cle in CENTRALITES.items() if metrique in (nom, cle)), metrique)
+    if metrique not in index['classements']:
+        raise ErreurRequete(f"metrique inconnue: {metrique} (choix: {', '.join(CENTRALITES)})")
+    groupe = params.get('groupe')
+    if groupe not in index['classements'][metrique]:
+        raise ErreurRequete(f"groupe inconnu: {groupe}", 404)
+    k = _entier(params, 'k', 10)
+    meilleurs = index['classements'][metrique][groupe][:k].tolist()
+    return {'metrique': metrique, 'groupe': groupe,
+            'resultats': [dict(_fiche(index, i), score=float(index['scores'][metrique][i])) for i in meilleurs]}
+
+
+def _requete_voisinage(index, params):
+    # /voisinage?noeud=Alice&k=2&limite=1000
+    i = _indice(index, params.get('noeud'))
+    k = _entier(params, 'k', 1, K_MAX)
+    limite = _entier(params, 'limite', LIMITE_DEFAUT)
+    atteints, distances = _voisinage_en_cache(index, i, k)
+    return {'noeud': _fiche(index, i), 'k': k, 'taille': len(atteints),
+            'voisins': [_fiche(index, j, d) for j, d in zip(atteints[1:limite + 1].tolist(), distances[1:limite + 1].tolist())]}
+
+
+def _requete_communaute(index, params):
+    # /communaute?noeud=4217&limite=1000
+    i = _indice(index, params.get('noeud'))
+    communaute = int(index['communautes'][i])
+    limite = _entier(params, 'limite', LIMITE_DEFAUT)
+    membres = np.flatnonzero(index['communautes'] == communaute)[:limite].tolist()
+    return {'noeud': _fiche(index, i), 'communaute': communaute,
+            'taille': int(index['tailles_communautes'][communaute]),
+            'membres': [_fiche(index, j) for j in membres]}
+
+
+def _requete_noeud(index, params):
+    # /noeud?noeud=Alice : attributs, degré, centralités et communauté
+    i = _indice(index, params.get('noeud'))
+    C = index['C']
+    return dict(_fiche(index, i), degre=int(C['indptr'][i + 1] - C['indptr'][i]),
+                communaute=int(index['communautes'][i]),
+                centralites={nom: float(valeurs[i]) for nom, valeurs in index['scores'].items()})
+
+
+def _requete_sante(index, params):
+    # /sante : instantané servi et état du cache
+    return {'chemin': index['chemin'], 'charge_le': index['charge_le'], 'mode': index['mode'],
+            'duree_chargement': round(index['duree_chargement'], 3),
+            'noeuds': nb_noeuds(index['C']), 'aretes': nb_aretes(index['C']),
+            'communautes': len(index['tailles_communautes']), 'modularite': index['modularite'],
+            'lru': {'taille': len(index['lru']), 'succes': index['succes_lru'], 'echecs': index['echecs_lru']}}
+
+
+REQUETES = {
+    '/top': _requete_top,
+    '/voisinage': _requete_voisinage,
+    '/communaute': _requete_communaute,
+    '/noeud': _requete_noeud,
+    '/sante': _requete_sante,
+}
+
+
+async def _recharger(etat, params):
+    # /recharger?chemin=... : nouveaux index construits dans un fil séparé, puis échangés
+    # (le cache des métriques, partagé avec ce fil, est protégé par son verrou)
+    if etat['rechargement']:
+        raise ErreurRequete("rechargement deja en cours", 409)
+    chemin = params.get('chemin', etat['index']['chemin'])
+    if not os.path.isdir(chemin):
+        raise ErreurRequete(f"instantane introuvable: {chemin}", 404)
+    etat['rechargement'] = True
+    try:
+        nouvel_index = await asyncio.get_running_loop().run_in_executor(None, construire_index, chemin, params.get('mode'))
+    finally:
+        etat['rechargement'] = False
+    etat['index'] = nouvel_index  # Les requêtes en cours gardent l'ancien index jusqu'à leur fin
+    return _requete_sante(nouvel_index, {})
+
+
+async def repondre(etat, chemin, params):
+    """Traite une requête ; retourne (code HTTP, dictionnaire JSON)."""
+    debut = time.perf_counter()
+    try:
+        if chemin == '/recharger':
+            reponse = await _recharger(etat, params)
+        elif chemin in REQUETES:
+            reponse = REQUETES[chemin](etat['index'], params)
+        else:
+            raise ErreurRequete(f"requete inconnue: {chemin} (choix: {', '.join([*REQUETES, '/recharger'])})", 404)
+        statut = 200
+    except ErreurRequete as erreur:
+        statut, reponse = erreur.statut, {'erreur': str(erreur)}
+    reponse['duree_ms'] = round((time.perf_counter() - debut) * 1000, 3)
+    return statut, reponse
+
+
+_RAISONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 409: "Conflict", 500: "Internal Server Error"}
+
+
+async def _connexion(etat, lecteur, ecrivain):
+    # Une requête HTTP par connexion : ligne de requête, en-têtes ignorés, réponse JSON
+    try:
+        ligne = (await lecteur.readline()).decode('latin-1').split()
+        while (await lecteur.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+        if len(ligne) < 2:
+            statut, reponse = 400, {'erreur': "requete HTTP invalide"}
+        else:
+            url = urlsplit(ligne[1])
+            try:
+                statut, reponse = await repondre(etat, url.path, dict(parse_qsl(url.query)))
+            except Exception as erreur:  # Une requête en échec ne doit pas arrêter le service
+                statut, reponse = 500, {'erreur': f"{type(erreur).__name__}: {erreur}"}
+        corps = json.dumps(reponse, ensure_ascii=False).encode('utf-8')
+        ecrivain.write(f"HTTP/1.1 {statut} {_RAISONS.get(statut, '')}\r\n"
+                       f"Content-Type: application/json; charset=utf-8\r\n"
+                       f"Content-Length: {len(corps)}\r\nConnection: close\r\n\r\n".encode('latin-1') + corps)
+        await ecrivain.drain()
+    finally:
+        ecrivain.close()
+
+
+async def servir(chemin="data/reseau_social.snap", hote=HOTE_DEFAUT, port=PORT_DEFAUT, socket_unix=None, mode=None):
+    """
+    Charge l'instantané et répond aux requêtes jusqu'à interruption (Ctrl+C).
+    socket_unix : chemin d'une socket Unix à utiliser au lieu du port TCP.
+    """
+    etat = {'index': construire_index(chemin, mode), 'rechargement': False}
+    print(f"Index construits en {etat['index']['duree_chargement']:.2f} s "
+          f"({nb_noeuds(etat['index']['C'])} noeuds)")
+
+    async def traiter(lecteur, ecrivain):
+        await _connexion(etat, lecteur, ecrivain)
+
+    if socket_unix:
+        serveur = await asyncio.start_unix_server(traiter, path=socket_unix)
+        print(f"Service a l'ecoute sur {socket_unix}")
+    else:
+        serveur = await asyncio.start_server(traiter, hote, port)
+        print(f"Service a l'ecoute sur http://{hote}:{port} ({', '.join([*REQUETES, '/recharger'])})")
+    async with serveur:
+        await serveur.serve_forever()
@@ -0,0 +1,150 @@
+# src/snapshot.py
+# Instantané binaire et versionné du réseau : tableaux de l'adjacence CSR, colonnes
+# d'attributs des nœuds et, en option, métriques déjà calculées.
+# Chaque tableau est un fichier .npy relu en projection mémoire (chargement quasi instantané).
+# Le CSV de construction_graphe.py reste le format d'import/export.
+
+import os                      # Gestion des dossiers
+import json                    # Métadonnées lisibles
+import shutil                  # Remplacement atomique d'un instantané existant
+import numpy as np             # Tableaux binaires .npy
+import networkx as nx          # Détection du type de graphe
+from src.graphe_compact import creer_graphe_compact, vers_networkx, nb_noeuds, nb_aretes
+from src.cache_metriques import obtenir_metrique, deposer_metrique
+
+
+VERSION_FORMAT = 1  # À incrémenter à chaque changement incompatible de la structure
+
+
+def _tableau_noeuds(noeuds):
+    # Les identifiants doivent être relisibles sans pickle : entiers ou chaînes
+    noeuds = np.asarray(noeuds)
+    if noeuds.dtype.kind in 'iu':
+        return noeuds.astype(np.int64)
+    return noeuds.astype(str)
+
+
+def _ancien(chemin):
+    # Dossier où l'instantané précédent est mis de côté pendant le remplacement
+    return chemin + ".ancien"
+
+
+def _separer_metriques(metriques, noeuds):
+    # Métriques par nœud (tableaux alignés sur les nœuds) et métriques scalaires (meta.json)
+    par_noeud, scalaires = {}, {}
+    for nom, valeurs in metriques.items():
+        if isinstance(valeurs, dict):
+            valeurs = [valeurs[n] for n in noeuds]
+        if np.ndim(valeurs) == 0 and isinstance(np.asarray(valeurs).item(), (int, float)):
+            scalaires[nom] = np.asarray(valeurs).item()
+        elif np.ndim(valeurs) == 1 and len(valeurs) == len(noeuds):
+            par_noeud[nom] = np.asarray(valeurs, dtype=np.float64)
+        else:
+            raise ValueError(f"Metrique {nom}: ni une valeur par noeud ni un scalaire, non sauvegardable")
+    return par_noeud, scalaires
+
+
+def sauvegarder_snapshot(G, chemin="data/reseau_social.snap", metriques=(), parametres=None):
+    """
+    Écrit l'instantané binaire du graphe G (nx.Graph ou graphe compact) dans le dossier `chemin`.
+    - metriques : noms de métriques du cache (ex. 'betweenness_centrality', 'average_clustering'), ou
+      dictionnaire {nom: {noeud: valeur}, tableau aligné sur les nœuds ou nombre} ;
+      les autres valeurs (tuples, structures imbriquées) sont refusées
+    - parametres : {nom: {paramètre: valeur}} pour les métriques calculées avec des paramètres
+      (ex. {'eigenvector_centrality': {'max_iter': 1000}}) ; enregistrés dans meta.json, ils font
+      partie de la clé du cache au rechargement (valeurs simples : nombres, chaînes)
+    L'écriture se fait dans un dossier temporaire. L'ancien instantané est ensuite renommé
+    en `chemin`.ancien, le nouveau prend sa place, et l'ancien n'est supprimé qu'après :
+    à tout instant l'un des deux est complet (charger_snapshot relit `chemin`.ancien si
+    une interruption a eu lieu entre les deux renommages).
+    """
+    est_networkx = isinstance(G, nx.Graph)
+    C = creer_graphe_compact(G) if est_networkx else G
+    parametres = dict(parametres or {})
+    if not isinstance(metriques, dict):
+        if not est_networkx:
+            raise ValueError("les metriques par nom necessitent un nx.Graph (cache des metriques)")
+        metriques = {nom: obtenir_metrique(G, nom, **parametres.get(nom, {})) for nom in metriques}
+    noeuds = C['noeuds'].tolist()
+    metriques, scalaires = _separer_metriques(metriques, noeuds)
+
+    temporaire = chemin + ".tmp"
+    shutil.rmtree(temporaire, ignore_errors=True)
+    os.makedirs(temporaire)
+
+    np.save(os.path.join(temporaire, "noeuds.npy"), _tableau_noeuds(C['noeuds']))
+    np.save(os.path.join(temporaire, "indptr.npy"), C['indptr'])
+    np.save(os.path.join(temporaire, "indices.npy"), C['indices'])
+    for nom, colonne in C['attributs'].items():
+        np.save(os.path.join(temporaire, f"attribut_{nom}.npy"), colonne)
+    for nom, valeurs in metriques.items():
+        np.save(os.path.join(temporaire, f"metrique_{nom}.npy"), valeurs)
+
+    meta = {
+        'version': VERSION_FORMAT,
+        'nb_noeuds': nb_noeuds(C),
+        'nb_aretes': nb_aretes(C),
+        'attributs': list(C['attributs']),
+        'categories': C['categories'],
+        'metriques': list(metriques),
+        'metriques_scalaires': scalaires,
+        'parametres_metriques': {nom: params for nom, params in parametres.items() if nom in metriques or nom in scalaires},
+    }
+    with open(os.path.join(temporaire, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    ancien = _ancien(chemin)
+    if not os.path.exists(chemin) and os.path.exists(ancien):
+        os.replace(ancien, chemin)  # Remplacement précédent interrompu : l'ancien instantané redevient courant
+    shutil.rmtree(ancien, ignore_errors=True)
+    if os.path.exists(chemin):
+        os.replace(chemin, ancien)
+    os.replace(temporaire, chemin)
+    shutil.rmtree(ancien, ignore_errors=True)
+    print(f"Instantane sauvegarde dans {chemin}")
+
+
+def charger_snapshot(chemin="data/reseau_social.snap", mmap=True, networkx=False):
+    """
+    Relit un instantané. Par défaut les tableaux sont projetés en mémoire (lecture seule)
+    et le résultat est un graphe compact dont la clé 'metriques' contient les métriques sauvegardées
+    (et 'parametres_metriques' les paramètres avec lesquels elles ont été calculées).
+    networkx=True : retourne une vue nx.Graph avec tous les attributs des nœuds ;
+    les métriques sauvegardées sont alors déposées dans le cache, sous leurs paramètres,
+    et ne seront pas recalculées.
+    Si `chemin` manque mais que `chemin`.ancien existe (remplacement interrompu), celui-ci est relu.
+    """
+    if not os.path.exists(os.path.join(chemin, "meta.json")) and os.path.exists(os.path.join(_ancien(chemin), "meta.json")):
+        chemin = _ancien(chemin)
+    with open(os.path.join(chemin, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get('version') != VERSION_FORMAT:
+        raise ValueError(f"Version d'instantane non supportee: {meta.get('version')} (attendue {VERSION_FORMAT})")
+
+    mode = 'r' if mmap else None
+
+    def lire(nom):
+        return np.load(os.path.join(chemin, nom), mmap_mode=mode)
+
+    C = {
+        'noeuds': lire("noeuds.npy"),
+        'indptr': lire("indptr.npy"),
+        'indices': lire("indices.npy"),
+        'attributs': {nom: lire(f"attribut_{nom}.npy") for nom in meta['attributs']},
+        'categories': meta['categories'],
+        'metriques': {nom: lire(f"metrique_{nom}.npy") for nom in meta['metriques']},
+    }
+    C['metriques'].update(meta.get('metriques_scalaires', {}))
+    C['parametres_metriques'] = meta.get('parametres_metriques', {})
+    if not networkx:
+        return C
+
+    G = vers_networkx(C)
+    noeuds = C['noeuds'].tolist()
+    for nom, valeurs in C['metriques'].items():
+        params = C['parametres_metriques'].get(nom, {})
+        if nom in meta.get('metriques_scalaires', {}):
+            deposer_metrique(G, nom, valeurs, **params)
+        else:
+            deposer_metrique(G, nom, dict(zip(noeuds, valeurs.tolist())), **params)
+    return G
@@ -0,0 +1,77 @@
+# src/spectral.py
+# Solveur creux de vecteurs propres partagé par le layout spectral (laplacien L = D - A)
+# et la centralité de vecteur propre (adjacence A), sur la représentation CSR du graphe.
+#   - Lanczos (scipy eigsh) pour le vecteur propre dominant de A ;
+#   - LOBPCG pour les plus petits vecteurs propres non triviaux de L, préconditionné par les degrés
+#     et contraint à rester orthogonal au vecteur constant.
+# Les deux méthodes acceptent des vecteurs de départ : les vecteurs d'une exécution précédente
+# sur un graphe proche (quelques arêtes ou nœuds de plus) font converger en quelques itérations.
+# En dessous de SEUIL_DENSE nœuds, la résolution dense est plus rapide et exacte.
+
+import numpy as np                                     # Vecteurs propres
+import scipy.sparse as sp                              # Laplacien creux
+from scipy.sparse.linalg import eigsh, lobpcg          # Lanczos et LOBPCG
+from src.graphe_compact import nb_noeuds, degres_compact, matrice_adjacence, eigenvector_compact
+
+
+SEUIL_DENSE = 500  # Comme nx.spectral_layout : résolution dense pour les petits graphes
+
+
+def laplacien(C):
+    """Laplacien combinatoire L = D - A du graphe compact (CSR)."""
+    return (sp.diags(degres_compact(C).astype(float)) - matrice_adjacence(C)).tocsr()
+
+
+def _vecteurs_depart(precedents, n, k, seed):
+    # Vecteurs de départ n x k : ceux d'une exécution précédente (nœuds ajoutés en fin),
+    # complétés par des valeurs aléatoires
+    X = np.random.default_rng(seed).standard_normal((n, k))
+    if precedents is not None:
+        precedents = np.asarray(precedents, dtype=float).reshape(len(precedents), -1)
+        m = min(len(precedents), n)
+        if precedents.shape[1] == k:
+            X[:m] = precedents[:m]
+    return X
+
+
+def spectre_laplacien(C, k=2, tol=1e-8, max_iter=1000, vecteurs_initiaux=None, seed=42):
+    """
+    Les k plus petites valeurs propres non nulles du laplacien et leurs vecteurs propres (n x k).
+    - tol : tolérance sur les résidus de LOBPCG
+    - vecteurs_initiaux : vecteurs d'une exécution précédente (démarrage à chaud)
+    """
+    n = nb_noeuds(C)
+    L = laplacien(C)
+    if n <= max(SEUIL_DENSE, 5 * (k + 1)):
+        valeurs, vecteurs = np.linalg.eigh(L.toarray())
+        return valeurs[1:k + 1], vecteurs[:, 1:k + 1]
+
+    X = _vecteurs_depart(vecteurs_initiaux, n, k, seed)
+    constant = np.full((n, 1), 1 / np.sqrt(n))                     # Vecteur propre trivial, exclu
+    jacobi = sp.diags(1 / np.maximum(degres_compact(C), 1).astype(float))  # Préconditionneur
+    valeurs, vecteurs = lobpcg(L, X, M=jacobi, Y=constant, tol=tol, maxiter=max_iter, largest=False)
+    ordre = np.argsort(valeurs)
+    return valeurs[ordre], vecteurs[:, ordre]
+
+
+def vecteur_propre_dominant(C, tol=1e-6, max_iter=1000, vecteur_initial=None):
+    """
+    Vecteur propre de la plus grande valeur propre de l'adjacence, normé et positif
+    (même convention que nx.eigenvector_centrality).
+    - vecteur_initial : vecteur d'une exécution précédente (démarrage à chaud)
+    """
+    n = nb_noeuds(C)
+    if n <= SEUIL_DENSE or len(C['indices']) == 0:
+        return eigenvector_compact(C, max_iter=max_iter, tol=tol)  # Itération de puissance, exacte en petit
+
+    # Départ uniforme, comme l'itération de puissance : pour une valeur propre multiple
+    # (plusieurs composantes), Lanczos retrouve la même projection du vecteur de départ
+    v0 = np.ones(n)
+    if vecteur_initial is not None:
+        m = min(len(vecteur_initial), n)
+        v0[:m] = vecteur_initial[:m]
+        v0[m:] = np.mean(vecteur_initial)
+    _, vecteurs = eigsh(matrice_adjacence(C), k=1, which='LA', v0=v0, tol=tol, maxiter=max_iter)
+    x = vecteurs[:, 0]
+    x = x if x.sum() >= 0 else -x
+    return x / np.linalg.norm(x)
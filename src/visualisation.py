@@ -4,30 +4,34 @@
 # et en colorant les nœuds selon leurs groupes.
 
 import networkx as nx           # Bibliothèque pour manipuler des graphes
-import matplotlib.pyplot as plt # Bibliothèque pour visualisation graphique
 import numpy as np              # Bibliothèque pour calcul numérique (non utilisée ici mais utile)
+import multiprocessing          # Calcul des layouts en parallèle
+import time                     # Mesure des durées de calcul
+from src.layout_force import layout_partage, PARAMETRES_SPRING  # Layout force-dirigé vectorisé partagé
+from src.cache_metriques import obtenir_metrique, deposer_metrique, valeur_precedente
+from src.spectral import spectre_laplacien  # Solveur creux partagé avec la centralité de vecteur propre
+from src.cache_layouts import layout_en_cache  # Positions conservées sur disque d'une exécution à l'autre
+from src.rendu_rapide import dessiner_graphe, SEUIL_LABELS  # Rendu groupé pour les grands graphes
+from src.instrumentation import instrumenter, section  # Mesure des appels (durée, CPU, mémoire)
+from src.vues import obtenir_vue  # Sous-graphe (ego, top-k, échantillon) dessiné à la place du réseau complet
 
 
 
 # Fonction pour créer plusieurs layouts pour un graphe
 
-def appliquer_layouts(G):
-    """
-    Crée différents agencements (layouts) pour le graphe G.
-    Retourne un dictionnaire {nom_layout: positions_des_noeuds}.
-    """
-
-    layouts = {}
+# Ordre des layouts produits par appliquer_layouts
+NOMS_LAYOUTS = ['spring', 'circular', 'kamada_kawai', 'shell', 'spectral']
 
-    # Layout "spring" : positions calculées avec un modèle physique de ressorts
-    layouts['spring'] = nx.spring_layout(G, k=2, iterations=50, seed=42)
+# Nombre de nœuds au-delà duquel un layout n'est plus calculé
+# (Kamada-Kawai construit une matrice dense de toutes les distances : O(n²) en mémoire)
+SEUILS_LAYOUTS = {'kamada_kawai': 3000}
 
-    # Layout "circular" : positions disposées en cercle
-    layouts['circular'] = nx.circular_layout(G)
+# Layout de remplacement quand un layout dépasse son seuil ou son délai (None = on l'omet) ;
+# ses positions figurent sous son propre nom, pour que titres et rapports restent exacts
+SUBSTITUTS_LAYOUTS = {'kamada_kawai': 'spring'}
 
-    # Layout "kamada_kawai" : layout basé sur distances géométriques optimisées
-    layouts['kamada_kawai'] = nx.kamada_kawai_layout(G)
 
+def _groupes_shell(G):
     # Préparer le layout "shell" par groupes
     groupes = {}
     for node in G.nodes():
@@ -36,27 +40,151 @@ def appliquer_layouts(G):
         if groupe not in groupes:
             groupes[groupe] = []
         groupes[groupe].append(node)
-
     # Crée une liste de "couches" pour shell_layout
-    shells = list(groupes.values())
-    layouts['shell'] = nx.shell_layout(G, nlist=shells)
-
-    # Layout "spectral" : basé sur les valeurs propres de la matrice Laplacienne
-    layouts['spectral'] = nx.spectral_layout(G)
-
+    return list(groupes.values())
+
+
+def _kamada_kawai(G, pos_initiales=None):
+    # Démarrage à chaud : les nœuds nouveaux partent d'une position aléatoire
+    if pos_initiales is not None:
+        rng = np.random.default_rng(42)
+        pos_initiales = {n: pos_initiales[n] if n in pos_initiales else rng.random(2) for n in G.nodes()}
+    return nx.kamada_kawai_layout(G, pos=pos_initiales)
+
+
+def _spectral(G, pos_initiales=None):
+    # Layout spectral : deux plus petits vecteurs propres non triviaux du laplacien,
+    # recentrés et mis à l'échelle comme nx.spectral_layout
+    if pos_initiales is not None and valeur_precedente(G, 'spectre_laplacien', k=2) is None:
+        # Positions d'une exécution précédente (cache disque) comme vecteurs de départ
+        initiaux = np.array([pos_initiales.get(n, (0.0, 0.0)) for n in G.nodes()], dtype=float)
+        spectre = spectre_laplacien(obtenir_metrique(G, 'graphe_compact'), k=2, vecteurs_initiaux=initiaux)
+        deposer_metrique(G, 'spectre_laplacien', spectre, k=2)
+    _, vecteurs = obtenir_metrique(G, 'spectre_laplacien', k=2)
+    return dict(zip(G.nodes(), nx.rescale_layout(vecteurs.copy())))
+
+
+def _calculer_layout(nom, G):
+    """Calcule un layout et retourne (positions, durée en secondes) ; exécutable dans un processus séparé."""
+    debut = time.perf_counter()
+    with section(f"layout_{nom}", G):
+        if nom == 'spring':
+            # Layout "spring" : positions calculées avec un modèle physique de ressorts
+            # (moteur vectorisé Barnes-Hut/multiniveau, partagé avec les autres figures)
+            pos = layout_partage(G)
+        elif nom == 'circular':
+            # Layout "circular" : positions disposées en cercle
+            pos = nx.circular_layout(G)
+        elif nom == 'kamada_kawai':
+            # Layout "kamada_kawai" : layout basé sur distances géométriques optimisées
+            # (repart des positions de l'exécution précédente si le graphe a peu changé)
+            pos = layout_en_cache(G, 'kamada_kawai', _kamada_kawai, demarrage_a_chaud=True)
+        elif nom == 'shell':
+            pos = nx.shell_layout(G, nlist=_groupes_shell(G))
+        elif nom == 'spectral':
+            # Layout "spectral" : basé sur les valeurs propres de la matrice Laplacienne
+            pos = layout_en_cache(G, 'spectral', _spectral, demarrage_a_chaud=True)
+        else:
+            raise ValueError(f"Layout inconnu: {nom}")
+    return pos, time.perf_counter() - debut
+
+
+def _planifier_layouts(G, noms, seuils, substituts):
+    # Remplace (ou omet) les layouts dont le seuil de taille est dépassé
+    plan = {}
+    for nom in noms:
+        if G.number_of_nodes() > seuils.get(nom, float('inf')):
+            remplacant = substituts.get(nom)
+            print(f"   Layout {nom} ignore au-dela de {seuils[nom]} noeuds"
+                  + (f" (remplace par {remplacant})" if remplacant else ""))
+            if remplacant is None:
+                continue
+            plan[nom] = remplacant
+        else:
+            plan[nom] = nom
+    return plan
+
+
+@instrumenter
+def appliquer_layouts(G, parallele=False, nb_processus=None, delai_max=None,
+                      seuils=SEUILS_LAYOUTS, substituts=SUBSTITUTS_LAYOUTS, retourner_durees=False):
+    """
+    Crée différents agencements (layouts) pour le graphe G.
+    Retourne un dictionnaire {nom_layout: positions_des_noeuds}.
+    - parallele : calcule les layouts (indépendants) dans un pool de processus
+    - delai_max : budget total en secondes du calcul parallèle, compté depuis le démarrage du pool ;
+      les layouts non terminés à son échéance sont remplacés par leur substitut (ou omis).
+      Avec un processus par layout (par défaut), c'est aussi le délai accordé à chacun.
+    - seuils / substituts : layouts remplacés au-delà d'un nombre de nœuds
+    Un layout remplacé n'apparaît que sous le nom de son substitut (une seule fois).
+    - retourner_durees : retourne aussi {nom_layout: durée en secondes}
+    """
+    plan = _planifier_layouts(G, NOMS_LAYOUTS, seuils, substituts)
+    a_calculer = list(dict.fromkeys(plan.values()))  # Un substitut déjà prévu n'est calculé qu'une fois
+    resultats = {}
+
+    if parallele:
+        # Par défaut un processus par layout : tous démarrent ensemble et le budget vaut pour chacun ;
+        # avec moins de processus, les layouts en attente consomment le même budget
+        with multiprocessing.Pool(processes=nb_processus or len(a_calculer)) as pool:
+            taches = {nom: pool.apply_async(_calculer_layout, (nom, G)) for nom in a_calculer}
+            fin = None if delai_max is None else time.perf_counter() + delai_max
+            for nom, tache in taches.items():
+                try:
+                    restant = None if fin is None else max(fin - time.perf_counter(), 0)
+                    resultats[nom] = tache.get(timeout=restant)
+                except multiprocessing.TimeoutError:
+                    print(f"   Layout {nom} interrompu (budget de {delai_max} s depasse)")
+            # La sortie du bloc termine les processus encore occupés par un layout trop lent
+    else:
+        for nom in a_calculer:
+            resultats[nom] = _calculer_layout(nom, G)
+
+    # Layouts interrompus : on se replie sur leur substitut s'il a abouti
+    for nom, calcule in list(plan.items()):
+        if calcule not in resultats:
+            remplacant = substituts.get(calcule)
+            if remplacant in resultats:
+                print(f"   Layout {nom} remplace par {remplacant}")
+                plan[nom] = remplacant
+            else:
+                del plan[nom]
+
+    # Chaque résultat sous le nom du layout réellement calculé
+    layouts = {calcule: resultats[calcule][0] for calcule in plan.values()}
+    if 'spring' in resultats:
+        # Calculé éventuellement dans un autre processus : on le rend disponible aux autres figures
+        deposer_metrique(G, 'layout_force', resultats['spring'][0], dim=2, **PARAMETRES_SPRING)
+    durees = {nom: resultats[nom][1] for nom in layouts}
+    for nom, duree in durees.items():
+        print(f"   Layout {nom}: {duree:.2f} s")
+
+    if retourner_durees:
+        return layouts, durees
     return layouts
 
 
 # Fonction pour visualiser un layout unique
 
-def visualiser_layout_unique(G, layout, titre, nom_fichier):
+@instrumenter
+def visualiser_layout_unique(G, layout, titre, nom_fichier, vue=None):
     """
     Affiche le graphe G avec un layout donné.
-    - layout : positions des nœuds
+    - layout : positions des nœuds, ou nom d'un layout de NOMS_LAYOUTS à calculer ici
     - titre : titre du graphique
     - nom_fichier : nom du fichier PNG à sauvegarder
+    - vue : paramètres de extraire_vue (ou vue déjà extraite) pour ne dessiner qu'un
+      sous-graphe ; un layout donné par son nom n'est alors calculé que sur celui-ci
     """
 
+    import matplotlib.pyplot as plt # Import différé : inutile pour calculer les layouts
+
+    if vue is not None:
+        G = obtenir_vue(G, vue)
+        titre = f"{titre}\n{G.graph['vue']}"
+    if isinstance(layout, str):
+        layout = _calculer_layout(layout, G)[0]
+
     # Taille de la figure
     plt.figure(figsize=(12, 10))
 
@@ -77,16 +205,14 @@ def visualiser_layout_unique(G, layout, titre, nom_fichier):
     degrees = dict(G.degree())
     node_sizes = [300 + degrees[n] * 100 for n in G.nodes()]
 
-    # Dessin des nœuds
-    nx.draw_networkx_nodes(G, layout, node_color=node_colors,
-                           node_size=node_sizes, alpha=0.8)
+    # Labels des nœuds (nom si disponible, sinon ID), seulement pour les graphes de taille lisible
+    labels = None
+    if G.number_of_nodes() <= SEUIL_LABELS:
+        labels = {n: G.nodes[n].get('nom', str(n)) for n in G.nodes()}
 
-    # Dessin des arêtes
-    nx.draw_networkx_edges(G, layout, alpha=0.5, width=1.5, edge_color='gray')
-
-    # Labels des nœuds (nom si disponible, sinon ID)
-    labels = {n: G.nodes[n].get('nom', str(n)) for n in G.nodes()}
-    nx.draw_networkx_labels(G, layout, labels, font_size=8, font_weight='bold')
+    # Dessin des arêtes, des nœuds et des labels (rendu groupé, voir src/rendu_rapide.py)
+    dessiner_graphe(G, layout, node_color=node_colors, node_size=node_sizes, alpha_noeuds=0.8,
+                    alpha_aretes=0.5, largeur_aretes=1.5, labels=labels, font_size=8, font_weight='bold')
 
     # Titre du graphique
     plt.title(titre, fontsize=14, fontweight='bold')
@@ -105,19 +231,23 @@ def visualiser_layout_unique(G, layout, titre, nom_fichier):
     plt.tight_layout()
 
     # Sauvegarde de l’image
-    plt.savefig(f"output/images/{nom_fichier}.png", dpi=300, bbox_inches='tight')
+    with section("savefig", G):
+        plt.savefig(f"output/images/{nom_fichier}.png", dpi=300, bbox_inches='tight')
     plt.close()
 
 
 
 # Fonction pour visualiser tous les layouts
 
+@instrumenter
 def visualiser_tous_layouts(G, layouts):
     """
     Affiche une figure avec tous les layouts fournis dans un tableau 2x3.
     - layouts : dictionnaire {nom_layout: positions}
     """
 
+    import matplotlib.pyplot as plt # Import différé : inutile pour calculer les layouts
+
     # Création de la figure avec 2 lignes et 3 colonnes
     fig, axes = plt.subplots(2, 3, figsize=(18, 12))
     axes = axes.flatten()  # Transformation en liste pour itérer facilement
@@ -141,12 +271,8 @@ def visualiser_tous_layouts(G, layouts):
             break
         ax = axes[idx]
 
-        # Dessin des nœuds
-        nx.draw_networkx_nodes(G, pos, node_color=node_colors,
-                               node_size=200, alpha=0.8, ax=ax)
-
-        # Dessin des arêtes
-        nx.draw_networkx_edges(G, pos, alpha=0.4, width=1, edge_color='gray', ax=ax)
+        # Dessin des arêtes et des nœuds
+        dessiner_graphe(G, pos, ax=ax, node_color=node_colors, node_size=200, alpha_noeuds=0.8)
 
         # Titre de chaque subplot
         ax.set_title(f"Layout: {nom.replace('_', ' ').title()}", fontsize=12)
@@ -155,8 +281,8 @@ def visualiser_tous_layouts(G, layouts):
         ax.axis('off')
 
     # Si moins de 6 layouts, masquer les axes restants
-    if len(layouts) < 6:
-        axes[-1].axis('off')
+    for ax in axes[len(layouts):]:
+        ax.axis('off')
 
     # Titre général
     plt.suptitle("Comparaison des differentes techniques de Layout",
@@ -166,5 +292,6 @@ def visualiser_tous_layouts(G, layouts):
     plt.tight_layout()
 
     # Sauvegarde de l’image
-    plt.savefig("output/images/comparaison_layouts.png", dpi=300, bbox_inches='tight')
+    with section("savefig", G):
+        plt.savefig("output/images/comparaison_layouts.png", dpi=300, bbox_inches='tight')
     plt.close()
@@ -1,83 +1,104 @@
 ﻿# IMPORTATION DES BIBLIOTHÈQUES
-import plotly.graph_objects as go  # Pour les graphiques interactifs 3D
-import networkx as nx              # Pour manipuler les graphes
-import numpy as np                 # Bibliothèque pour calculs numériques (ici optionnel)
+import os                          # Dossier de sortie et fichier plotly.min.js partagé
+import json                        # Données du mode binaire
+import base64                      # Tableaux binaires encodés dans le HTML
+import numpy as np                 # Bibliothèque pour calculs numériques (tableaux des nœuds et des arêtes)
+from src.layout_force import layout_partage  # Layout force-dirigé vectorisé (2D/3D)
+from src.cache_metriques import obtenir_metrique  # Représentation compacte (CSR) et degrés partagés
+from src.graphe_compact import aretes, valeur_attribut
+from src.rendu_rapide import SEUIL_LABELS  # Au-delà, pas d'étiquettes sur les nœuds
+from src.instrumentation import instrumenter, section  # Mesure des appels (durée, CPU, mémoire)
+from src.vues import obtenir_vue  # Sous-graphe (ego, top-k, échantillon) affiché à la place du réseau complet
+
+
+SEUIL_BINAIRE = 50_000  # Nombre d'arêtes à partir duquel l'export binaire est choisi (export='auto')
+TOP_K_DETAIL = 2000     # Nœuds de plus haut degré affichés tant que l'on n'a pas zoomé (mode binaire)
+DISTANCE_DETAIL = 1.2   # Distance de la caméra en dessous de laquelle tout le graphe est affiché
+
+# Définition des couleurs selon le groupe
+COULEURS_GROUPES = {
+    'Etudiants': '#FF6B6B',       # Rouge
+    'Professionnels': '#4ECDC4',  # Bleu/vert
+    'Artistes': '#FFE66D'         # Jaune
+}
+COULEUR_INCONNUE = '#95A5A6'
 
 
 # Fonction : visualisation_3d
-# Paramètre :
+# Paramètres :
 #   G : Graphe NetworkX représentant le réseau social
+#   pos_3d : positions 3D déjà calculées (optionnel)
+#   export : 'html' (figure Plotly), 'binaire' (tableaux binaires + niveau de détail) ou 'auto'
+#   plotly_js : 'directory' (plotly.min.js écrit une fois à côté du fichier) ou 'cdn'
+#   top_k : nombre de nœuds affichés avant zoom en mode binaire
+#   vue : paramètres de extraire_vue (ou vue déjà extraite) ; seul ce sous-graphe est placé et affiché
 # Retour :
-#   fig : figure Plotly 3D interactive
+#   fig : figure Plotly 3D interactive (None en mode binaire, la page est écrite directement)
+
+@instrumenter
+def visualisation_3d(G, pos_3d=None, chemin="output/images/reseau_3d.html", export='auto',
+                     plotly_js='directory', top_k=TOP_K_DETAIL, vue=None):
+
+    titre = "Visualisation 3D du Reseau Social"
+    if vue is not None:
+        G = obtenir_vue(G, vue)  # pos_3d éventuel (réseau complet) : seules les positions de la vue sont lues
+        titre = f"{titre} - {G.graph['vue']}"
 
-def visualisation_3d(G):
-    
-  
     # Calcul des positions 3D des nœuds
-  
-    # Utilise l'algorithme "spring_layout" de NetworkX en 3 dimensions
+
+    # Utilise le layout force-dirigé du projet en 3 dimensions (mis en cache, seed fixe)
     # Les nœuds liés s’attirent et les autres se repoussent pour éviter le chevauchement
-    pos_3d = nx.spring_layout(G, dim=3, seed=42)  # seed pour reproductibilité
-
-    # Préparation des coordonnées des arêtes (liens)
-    edge_x, edge_y, edge_z = [], [], []  # Listes pour stocker les coordonnées des arêtes
-    for edge in G.edges():
-        x0, y0, z0 = pos_3d[edge[0]]  # Coordonnées du premier nœud
-        x1, y1, z1 = pos_3d[edge[1]]  # Coordonnées du deuxième nœud
-        # On ajoute None pour séparer chaque arête dans Plotly
-        edge_x.extend([x0, x1, None])
-        edge_y.extend([y0, y1, None])
-        edge_z.extend([z0, z1, None])
+    if pos_3d is None:
+        pos_3d = layout_partage(G, dim=3)
+
+    # Tableaux des nœuds (ordre de G.nodes()) et des arêtes, sans boucle Python sur les arêtes
+    C = obtenir_metrique(G, 'graphe_compact')
+    P = np.array([pos_3d[n] for n in G.nodes()], dtype=float).reshape(-1, 3)
+    sources, cibles = aretes(C)
+    couleurs = _couleurs_noeuds(C)
+
+    if export == 'auto':
+        export = 'binaire' if len(sources) >= SEUIL_BINAIRE else 'html'
+    os.makedirs(os.path.dirname(chemin) or '.', exist_ok=True)
+    if export == 'binaire':
+        _exporter_binaire(C, P, sources, cibles, couleurs, chemin, plotly_js, top_k, titre)
+        return None
+
+    import plotly.graph_objects as go  # Pour les graphiques interactifs 3D (import différé, mode 'html' seulement)
+
+    # Coordonnées des arêtes : deux extrémités puis NaN pour séparer chaque arête dans Plotly
+    segments = np.full((len(sources), 3, 3), np.nan)
+    segments[:, 0], segments[:, 1] = P[sources], P[cibles]
+    segments = segments.reshape(-1, 3)
 
     # Tracé des arêtes (lignes)
     edge_trace = go.Scatter3d(
-        x=edge_x,
-        y=edge_y,
-        z=edge_z,
+        x=segments[:, 0],
+        y=segments[:, 1],
+        z=segments[:, 2],
         line=dict(width=2, color='#888'),  # Couleur grise pour les liens
         hoverinfo='none',                  # Pas d’infos au survol
         mode='lines'
     )
 
-    # Préparation des coordonnées des nœuds
-    node_x = [pos_3d[node][0] for node in G.nodes()]
-    node_y = [pos_3d[node][1] for node in G.nodes()]
-    node_z = [pos_3d[node][2] for node in G.nodes()]
-
-    # Définition des couleurs selon le groupe
-    couleurs_groupes = {
-        'Etudiants': '#FF6B6B',       # Rouge
-        'Professionnels': '#4ECDC4',  # Bleu/vert
-        'Artistes': '#FFE66D'         # Jaune
-    }
-
-    # Attribution d'une couleur à chaque nœud selon son groupe
-    node_colors = [
-        couleurs_groupes.get(G.nodes[n].get('groupe', 'Inconnu'), '#95A5A6') 
-        for n in G.nodes()
-    ]
-
     # Préparation du texte au survol des nœuds
     # Affiche nom, groupe et degré (nombre de connexions)
-    node_text = [
-        f"{G.nodes[n]['nom']}<br>Groupe: {G.nodes[n]['groupe']}<br>Degre: {G.degree(n)}"
-        for n in G.nodes()
-    ]
+    noms, node_text = _textes_noeuds(C, np.arange(len(P)))
 
     # Tracé des nœuds
     node_trace = go.Scatter3d(
-        x=node_x,
-        y=node_y,
-        z=node_z,
-        mode='markers+text',          # Affiche les points et le texte
+        x=P[:, 0],
+        y=P[:, 1],
+        z=P[:, 2],
+        mode='markers+text' if len(P) <= SEUIL_LABELS else 'markers',  # Affiche les points et le texte
         hoverinfo='text',             # Affiche les infos au survol
-        text=[G.nodes[n]['nom'] for n in G.nodes()],  # Texte des nœuds
+        text=noms,                    # Texte des nœuds
         textposition='top center',    # Position du texte
         hovertext=node_text,          # Texte complet au survol
         marker=dict(
-            size=10,                  # Taille des nœuds
-            color=node_colors,        # Couleur selon le groupe
-            line=dict(width=2, color='white')  # Contour blanc
+            size=10 if len(P) <= SEUIL_LABELS else 3,  # Taille des nœuds
+            color=couleurs,           # Couleur selon le groupe
+            line=dict(width=2 if len(P) <= SEUIL_LABELS else 0, color='white')  # Contour blanc
         )
     )
 
@@ -86,7 +107,7 @@ def visualisation_3d(G):
 
     # Mise en forme de la figure
     fig.update_layout(
-        title="Visualisation 3D du Reseau Social",  # Titre principal
+        title=titre,                                # Titre principal
         showlegend=False,                           # Pas de légende
         scene=dict(                                 # Paramètres des axes 3D
             xaxis=dict(showbackground=False, showticklabels=False, title=''),
@@ -99,7 +120,133 @@ def visualisation_3d(G):
     )
 
     # Sauvegarde de la visualisation
-    fig.write_html("output/images/reseau_3d.html")  # Fichier HTML interactif
+    # Plotly JS n'est pas recopié dans la page : fichier plotly.min.js partagé ou lien CDN
+    with section("write_html", G):
+        fig.write_html(chemin, include_plotlyjs=plotly_js)  # Fichier HTML interactif
 
     # Retour de la figure pour affichage ou manipulation ultérieure
-    return fig
\ No newline at end of file
+    return fig
+
+
+def _couleurs_noeuds(C):
+    # Couleur de chaque nœud selon son groupe (codes entiers du graphe compact)
+    if 'groupe' not in C['attributs']:
+        return np.full(len(C['noeuds']), COULEUR_INCONNUE)
+    palette = np.array([COULEURS_GROUPES.get(g, COULEUR_INCONNUE) for g in C['categories']['groupe']])
+    return palette[C['attributs']['groupe']]
+
+
+def _textes_noeuds(C, indices):
+    # Noms et textes de survol (nom, groupe, degré) des nœuds d'indices donnés
+    degres = np.diff(C['indptr'])
+    noms = [str(valeur_attribut(C, 'nom', i)) if 'nom' in C['attributs'] else str(C['noeuds'][i])
+            for i in indices.tolist()]
+    groupes = [valeur_attribut(C, 'groupe', i) if 'groupe' in C['attributs'] else 'Inconnu'
+               for i in indices.tolist()]
+    textes = [f"{nom}<br>Groupe: {groupe}<br>Degre: {d}"
+              for nom, groupe, d in zip(noms, groupes, degres[indices].tolist())]
+    return noms, textes
+
+
+def _base64(tableau, dtype=np.float32):
+    # Tableau NumPy -> chaîne base64 de ses octets (Float32Array / Uint8Array côté navigateur)
+    return base64.b64encode(np.ascontiguousarray(tableau, dtype=dtype).tobytes()).decode('ascii')
+
+
+def _coordonnees(P, sources, cibles):
+    # Nœuds et segments d'arêtes (séparés par NaN) en float32, coordonnée par coordonnée
+    segments = np.full((len(sources), 3, 3), np.nan, dtype=np.float32)
+    segments[:, 0], segments[:, 1] = P[sources], P[cibles]
+    segments = segments.reshape(-1, 3)
+    return {'noeuds': [_base64(P[:, j]) for j in range(3)],
+            'aretes': [_base64(segments[:, j]) for j in range(3)]}
+
+
+def _script_plotly(dossier, plotly_js):
+    # Plotly JS référencé une seule fois : fichier partagé dans le dossier de sortie, ou CDN
+    from plotly.offline.offline import get_plotlyjs, get_plotlyjs_version
+    if plotly_js == 'cdn':
+        return f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+    fichier = os.path.join(dossier, "plotly.min.js")
+    if not os.path.exists(fichier):
+        with open(fichier, 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+    return "plotly.min.js"
+
+
+def _json_script(valeur):
+    # JSON inclus dans un <script> : '<' échappé pour qu'un texte ne puisse pas fermer la balise
+    return json.dumps(valeur).replace('<', '\\u003c')
+
+
+def _exporter_binaire(C, P, sources, cibles, couleurs, chemin, plotly_js, top_k, titre):
+    # Page HTML légère : coordonnées en float32 encodées en base64 (4 octets par valeur au lieu
+    # d'un nombre écrit en texte) et niveau de détail : seuls les top_k nœuds de plus haut degré
+    # et les arêtes entre eux sont tracés tant que la caméra n'est pas rapprochée.
+    degres = np.diff(C['indptr'])
+    top = np.sort(np.argsort(-degres, kind='stable')[:top_k])
+    dans_top = np.zeros(len(P), dtype=bool)
+    dans_top[top] = True
+    garder = dans_top[sources] & dans_top[cibles]
+
+    palette, codes = np.unique(couleurs, return_inverse=True)
+    _, textes = _textes_noeuds(C, top)
+    donnees = {
+        'complet': dict(_coordonnees(P, sources, cibles), couleurs=_base64(codes, np.uint8)),
+        'detail': dict(_coordonnees(P[top], np.searchsorted(top, sources[garder]),
+                                    np.searchsorted(top, cibles[garder])),
+                       couleurs=_base64(codes[top], np.uint8), textes=textes),
+        'palette': palette.tolist(),
+        'distance_detail': DISTANCE_DETAIL,
+    }
+    script = _script_plotly(os.path.dirname(chemin) or '.', plotly_js)
+    with open(chemin, 'w', encoding='utf-8') as f:
+        f.write(_MODELE_BINAIRE.replace('__SCRIPT__', script).replace('__TITRE__', _json_script(titre))
+                .replace('__DONNEES__', _json_script(donnees)))
+
+
+# Page du mode binaire : décodage des tableaux dans le navigateur et bascule du niveau de détail
+_MODELE_BINAIRE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title></title>
+<script src="__SCRIPT__"></script></head>
+<body style="margin:0"><div id="graphe" style="width:100vw;height:100vh"></div>
+<script>
+const titre = __TITRE__;
+const donnees = __DONNEES__;
+document.title = titre;
+function decoder(texte, Type) {
+  const octets = Uint8Array.from(atob(texte), c => c.charCodeAt(0));
+  return new Type(octets.buffer);
+}
+function traces(niveau) {
+  const d = donnees[niveau], n = donnees.palette.length;
+  const echelle = donnees.palette.map((c, i) => [n > 1 ? i / (n - 1) : 0, c]);
+  if (n === 1) echelle.push([1, donnees.palette[0]]);
+  return [
+    {type: 'scatter3d', mode: 'lines', hoverinfo: 'none', line: {width: 1, color: '#888'},
+     x: decoder(d.aretes[0], Float32Array), y: decoder(d.aretes[1], Float32Array), z: decoder(d.aretes[2], Float32Array)},
+    {type: 'scatter3d', mode: 'markers', hoverinfo: d.textes ? 'text' : 'none', hovertext: d.textes,
+     x: decoder(d.noeuds[0], Float32Array), y: decoder(d.noeuds[1], Float32Array), z: decoder(d.noeuds[2], Float32Array),
+     marker: {size: 3, color: Array.from(decoder(d.couleurs, Uint8Array)), colorscale: echelle,
+              cmin: 0, cmax: Math.max(n - 1, 1)}}
+  ];
+}
+const mise_en_page = {title: titre + ' (zoomer pour tout afficher)', showlegend: false,
+  margin: {l: 0, r: 0, b: 0, t: 40},
+  scene: {xaxis: {showbackground: false, showticklabels: false, title: ''},
+          yaxis: {showbackground: false, showticklabels: false, title: ''},
+          zaxis: {showbackground: false, showticklabels: false, title: ''}}};
+let niveau = 'detail';
+const div = document.getElementById('graphe');
+Plotly.newPlot(div, traces(niveau), mise_en_page);
+div.on('plotly_relayout', evenement => {
+  const oeil = evenement['scene.camera'] && evenement['scene.camera'].eye;
+  if (!oeil) return;
+  const voulu = Math.hypot(oeil.x, oeil.y, oeil.z) < donnees.distance_detail ? 'complet' : 'detail';
+  if (voulu !== niveau) {
+    niveau = voulu;
+    Plotly.react(div, traces(niveau), div.layout);
+  }
+});
+</script></body></html>
+"""
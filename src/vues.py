@@ -0,0 +1,101 @@
+# src/vues.py
+# Vues réduites d'un grand réseau pour les visualisations : au-delà de quelques milliers de
+# nœuds, dessiner tout le graphe est lent et illisible. Une vue est un sous-graphe induit :
+#   - 'ego'         : voisinage à k sauts d'un ou plusieurs utilisateurs (parcours CSR indexé) ;
+#   - 'top'         : les nœuds les plus centraux selon une métrique ;
+#   - 'echantillon' : tirage aléatoire stratifié par groupe (proportions du réseau conservées).
+# Layout et rendu ne portent alors que sur la vue ; les métriques restent celles du réseau complet.
+
+import numpy as np                 # Sélection vectorisée des nœuds
+from src.cache_metriques import obtenir_metrique
+from src.graphe_compact import voisinage_compact, sous_graphe_compact, vers_networkx
+
+
+MODES_VUE = ('ego', 'top', 'echantillon')
+TAILLE_VUE = 2000  # Nombre maximal de nœuds d'une vue
+
+
+def _indices_centres(C, centres):
+    # Identifiants ou noms d'utilisateurs -> indices dans le graphe compact
+    indices = []
+    entiers = C['noeuds'].dtype.kind in 'iu'
+    for centre in centres:
+        if entiers:
+            try:
+                trouves = np.flatnonzero(C['noeuds'] == int(centre))  # Identifiants négatifs compris
+            except ValueError:
+                trouves = []  # Pas un entier : peut-être un nom
+        else:
+            trouves = np.flatnonzero(C['noeuds'] == str(centre))
+        if len(trouves) == 0 and 'nom' in C['attributs']:
+            trouves = np.flatnonzero(C['attributs']['nom'] == centre)
+        if len(trouves) == 0:
+            raise ValueError(f"Utilisateur inconnu: {centre}")
+        indices.extend(trouves.tolist())
+    return indices
+
+
+def _scores(G, C, metrique, scores):
+    # Scores alignés sur les nœuds du graphe compact ({noeud: score} ou tableau)
+    if scores is None:
+        scores = obtenir_metrique(G, metrique)
+    if isinstance(scores, dict):
+        return np.fromiter((scores[n] for n in C['noeuds'].tolist()), dtype=float, count=len(C['noeuds']))
+    return np.asarray(scores, dtype=float)
+
+
+def _echantillon_stratifie(C, taille, seed):
+    # Quota de chaque groupe proportionnel à sa taille (au moins un nœud par groupe non vide)
+    rng = np.random.default_rng(seed)
+    n = len(C['noeuds'])
+    codes = C['attributs']['groupe'] if 'groupe' in C['attributs'] else np.zeros(n, dtype=np.int8)
+    effectifs = np.bincount(codes)
+    quotas = np.minimum(np.maximum(np.round(effectifs * min(taille, n) / n), effectifs > 0), effectifs).astype(int)
+    return np.concatenate([rng.choice(np.flatnonzero(codes == c), quota, replace=False)
+                           for c, quota in enumerate(quotas) if quota > 0])
+
+
+def extraire_vue(G, mode='ego', centres=(), k=1, metrique='degree_centrality', scores=None,
+                 taille=TAILLE_VUE, seed=42):
+    """
+    Sous-graphe induit à visualiser à la place de G (nx.Graph, attributs des nœuds conservés).
+    - mode 'ego' : nœuds à au plus k sauts des `centres` (identifiants ou noms), au plus `taille`
+    - mode 'top' : les `taille` nœuds de plus grand score pour `metrique` (ou `scores` déjà calculés)
+    - mode 'echantillon' : `taille` nœuds tirés au hasard dans chaque groupe (graine `seed`)
+    H.graph['vue'] décrit la vue (titres des figures), H.graph['origine'] donne l'indice
+    de chaque nœud de H dans les tableaux du graphe complet (ordre de G.nodes()).
+    """
+    C = obtenir_metrique(G, 'graphe_compact')
+    if mode == 'ego':
+        if not centres:
+            raise ValueError("Vue ego: au moins un utilisateur central est necessaire")
+        selection, _ = voisinage_compact(C, _indices_centres(C, centres), k, limite=taille)
+        description = f"ego {', '.join(map(str, centres))} (k={k})"
+    elif mode == 'top':
+        valeurs = _scores(G, C, metrique, scores)
+        taille = min(taille, len(valeurs))
+        selection = np.argpartition(-valeurs, taille - 1)[:taille] if taille > 0 else np.array([], dtype=np.int64)
+        description = f"top {taille} {metrique}"
+    elif mode == 'echantillon':
+        selection = _echantillon_stratifie(C, taille, seed)
+        description = "echantillon stratifie par groupe"
+    else:
+        raise ValueError(f"Mode de vue inconnu: {mode} (choix: {', '.join(MODES_VUE)})")
+
+    sous = sous_graphe_compact(C, selection)
+    H = vers_networkx(sous)
+    H.graph['origine'] = sous['origine']
+    H.graph['vue'] = f"vue {description}: {H.number_of_nodes()} noeuds sur {len(C['noeuds'])}"
+    return H
+
+
+def obtenir_vue(G, vue):
+    """Vue à dessiner : `vue` est soit les paramètres de extraire_vue (dictionnaire), soit une vue déjà extraite."""
+    return extraire_vue(G, **vue) if isinstance(vue, dict) else vue
+
+
+def restreindre_analyse(analyse, H):
+    """Résultats de analyser_reseau limités aux nœuds de la vue H (tableaux alignés sur les nœuds)."""
+    restreinte = dict(analyse)
+    restreinte['communaute_noeud'] = np.asarray(analyse['communaute_noeud'])[H.graph['origine']]
+    return restreinte
@@ -0,0 +1,7 @@
+# tests/conftest.py
+# Les tests importent les modules du projet (src/, benchmark.py) depuis la racine du dépôt.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,60 @@
+# tests/test_centralite.py
+# Balayage des plus courts chemins (Brandes), centralités approchées et diamètre/rayon par
+# encadrement : comparés entre eux et à networkx sur des graphes aléatoires.
+
+import networkx as nx
+import src.centralite as centralite
+
+
+def test_balayage_parallele_identique_au_sequentiel(monkeypatch):
+    monkeypatch.setattr(centralite, 'SEUIL_PARALLELE', 0)
+    G = nx.gnm_random_graph(300, 900, seed=3)
+    G.add_edges_from([(300, 301), (301, 302)])  # Seconde composante
+    sequentiel = centralite.balayage_plus_courts_chemins(G, nb_processus=1)
+    for nb_processus in (2, 3):
+        parallele = centralite.balayage_plus_courts_chemins(G, nb_processus=nb_processus)
+        assert parallele == sequentiel  # Égalité exacte des flottants, pas seulement à une tolérance près
+
+
+def _graphe_aleatoire(seed):
+    # Graphe aléatoire à plusieurs composantes (dont un nœud isolé)
+    G = nx.gnm_random_graph(120, 240, seed=seed)
+    G.add_edges_from([(120, 121), (121, 122), (122, 123), (121, 124)])
+    G.add_node(125)
+    return G
+
+
+def _proches(a, b, tolerance=1e-9):
+    return a.keys() == b.keys() and all(abs(a[n] - b[n]) <= tolerance for n in a)
+
+
+def test_balayage_identique_a_networkx():
+    for seed in (1, 2):
+        G = _graphe_aleatoire(seed)
+        balayage = centralite.balayage_plus_courts_chemins(G, nb_processus=1)
+        assert _proches(balayage['betweenness'], nx.betweenness_centrality(G))
+        assert _proches(balayage['closeness'], nx.closeness_centrality(G))
+        excentricites = {}
+        for composante in nx.connected_components(G):
+            excentricites.update(nx.eccentricity(G.subgraph(composante)))
+        assert balayage['eccentricite'] == excentricites
+
+
+def test_centralites_approchees_exactes_avec_tous_les_pivots():
+    G = _graphe_aleatoire(4)
+    approchees = centralite.centralites_approchees(G, echantillon=G.number_of_nodes())
+    assert approchees['nb_pivots'] == G.number_of_nodes()
+    assert _proches(approchees['betweenness'], nx.betweenness_centrality(G))
+    assert _proches(approchees['closeness'], nx.closeness_centrality(G))
+
+
+def test_diametre_rayon_bornes_identiques_a_networkx():
+    for seed in (5, 6, 7):
+        G = _graphe_aleatoire(seed)
+        attendus = sorted((len(c), nx.diameter(G.subgraph(c)), nx.radius(G.subgraph(c)))
+                          for c in nx.connected_components(G))
+        obtenus = sorted((c['taille'], c['diametre'], c['rayon'])
+                         for c in centralite.diametre_rayon_bornes(G)['composantes'])
+        balayage = sorted((c['taille'], c['diametre'], c['rayon'])
+                          for c in centralite.balayage_plus_courts_chemins(G, nb_processus=1)['composantes'])
+        assert obtenus == attendus == balayage
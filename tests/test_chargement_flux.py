@@ -0,0 +1,41 @@
+# tests/test_chargement_flux.py
+# Chargement en flux : identifiants convertis en entiers seulement s'ils s'écrivent exactement ainsi.
+
+import numpy as np
+from src.chargement_flux import charger_aretes_par_blocs
+
+
+def _charger(tmp_path, lignes, taille_bloc=2):
+    chemin = tmp_path / "aretes.csv"
+    chemin.write_text("source,cible\n" + "\n".join(lignes) + "\n", encoding="utf-8")
+    return charger_aretes_par_blocs(str(chemin), taille_bloc=taille_bloc, afficher_progression=False)
+
+
+def test_identifiants_entiers(tmp_path):
+    C = _charger(tmp_path, ["1,2", "2,-3", "-3,1", "1,2"])
+    assert C['noeuds'].dtype.kind == 'i'
+    assert sorted(C['noeuds'].tolist()) == [-3, 1, 2]
+    assert len(C['indices']) // 2 == 3
+
+
+def test_identifiants_mixtes_et_inhabituels(tmp_path):
+    # '007' et '7' sont distincts ; '²' (chiffre Unicode) et '--5' ne sont pas des entiers
+    C = _charger(tmp_path, ["007,7", "²,1", "-3,--5", "7,-3"])
+    assert C['noeuds'].dtype.kind == 'U'
+    assert sorted(C['noeuds'].tolist()) == sorted(['007', '7', '²', '1', '-3', '--5'])
+    voisins = {C['noeuds'][i]: set(C['noeuds'][C['indices'][C['indptr'][i]:C['indptr'][i + 1]]].tolist())
+               for i in range(len(C['noeuds']))}
+    assert voisins['7'] == {'007', '-3'}
+    assert voisins['²'] == {'1'}
+
+
+def test_chiffre_unicode_parmi_des_entiers(tmp_path):
+    C = _charger(tmp_path, ["1,2", "²,1", "2,--5"])
+    assert C['noeuds'].dtype.kind == 'U'
+    assert sorted(C['noeuds'].tolist()) == sorted(['1', '2', '²', '--5'])
+
+
+def test_entiers_hors_int64_restent_des_chaines(tmp_path):
+    C = _charger(tmp_path, ["1,99999999999999999999"])
+    assert C['noeuds'].dtype.kind == 'U'
+    assert np.isin(['1', '99999999999999999999'], C['noeuds']).all()
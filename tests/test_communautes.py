@@ -0,0 +1,37 @@
+# tests/test_communautes.py
+# Louvain sur le graphe compact : modularité calculée comme networkx et comparable à la sienne.
+
+import networkx as nx
+import numpy as np
+
+from src.graphe_compact import creer_graphe_compact
+from src.communautes import louvain_compact, modularite_compact
+
+
+def _partition(etiquettes, noeuds):
+    return [{noeuds[i] for i in np.flatnonzero(etiquettes == c)} for c in np.unique(etiquettes)]
+
+
+def test_louvain_modularite_comme_networkx():
+    for seed in (1, 2, 3):
+        G = nx.planted_partition_graph(6, 30, 0.3, 0.02, seed=seed)
+        C = creer_graphe_compact(G)
+        noeuds = list(G.nodes())
+        etiquettes = louvain_compact(C, seed=seed)
+        communautes = _partition(etiquettes, noeuds)
+        assert sorted(set().union(*communautes)) == sorted(noeuds)
+        modularite = modularite_compact(C, etiquettes)
+        assert np.isclose(modularite, nx.community.modularity(G, communautes))
+        reference = nx.community.modularity(G, nx.community.louvain_communities(G, seed=seed))
+        assert modularite >= reference - 0.02
+
+
+def test_louvain_partition_initiale():
+    # Reprise d'une partition précédente (nouveau nœud marqué -1) : qualité conservée
+    G = nx.planted_partition_graph(5, 25, 0.3, 0.02, seed=4)
+    C = creer_graphe_compact(G)
+    precedente = louvain_compact(C, seed=4)
+    initiale = precedente.copy()
+    initiale[0] = -1
+    etiquettes = louvain_compact(C, seed=4, partition_initiale=initiale)
+    assert modularite_compact(C, etiquettes) >= modularite_compact(C, precedente) - 0.02
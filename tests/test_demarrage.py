@@ -0,0 +1,22 @@
+# tests/test_demarrage.py
+# Garde-fou du temps de démarrage : importer main.py (ligne de commande, --help) doit rester
+# rapide et ne charger aucune bibliothèque lourde (matplotlib, pandas, scikit-learn, ...),
+# qui ne sont importées qu'au moment où une étape en a besoin.
+# Lancer depuis la racine du dépôt : python -m pytest -q tests
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import mesurer_demarrage, BUDGET_DEMARRAGE, MODULES_LOURDS
+
+
+def test_import_main_sans_bibliotheque_lourde():
+    _, lourds = mesurer_demarrage(repetitions=1)
+    assert lourds == [], f"Bibliotheques chargees a l'import de main.py: {', '.join(lourds)} (parmi {MODULES_LOURDS})"
+
+
+def test_import_main_dans_le_budget():
+    secondes, _ = mesurer_demarrage(repetitions=3)
+    assert secondes <= BUDGET_DEMARRAGE, f"Import de main.py: {secondes:.3f} s (budget {BUDGET_DEMARRAGE} s)"
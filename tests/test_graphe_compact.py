@@ -0,0 +1,22 @@
+# tests/test_graphe_compact.py
+# Noyaux sur le graphe compact (triangles et clustering) comparés à networkx.
+
+import networkx as nx
+import numpy as np
+
+from src.graphe_compact import creer_graphe_compact, clustering_compact
+
+
+def test_triangles_clustering_identiques_a_networkx():
+    for seed in (1, 2, 3):
+        G = nx.powerlaw_cluster_graph(300, 4, 0.3, seed=seed)  # Nombreux triangles et quelques hubs
+        G.add_nodes_from([300, 301])  # Nœuds isolés
+        noeuds = list(G.nodes())
+        triangles_nx = np.array([nx.triangles(G)[n] for n in noeuds])
+        clustering_nx = np.array([nx.clustering(G)[n] for n in noeuds])
+        C = creer_graphe_compact(G)
+        # Budget réduit : le calcul matriciel est découpé en plusieurs blocs de lignes
+        for methode, budget in (('matriciel', 20_000_000), ('matriciel', 500), ('iterateur', 20_000_000)):
+            triangles, clustering = clustering_compact(C, methode=methode, budget=budget)
+            assert np.array_equal(triangles, triangles_nx), methode
+            assert np.allclose(clustering, clustering_nx), methode
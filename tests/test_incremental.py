@@ -0,0 +1,48 @@
+# tests/test_incremental.py
+# Métriques maintenues par appliquer_modifications comparées à un recalcul complet (et à networkx)
+# après plusieurs lots aléatoires d'ajouts et de suppressions d'arêtes.
+
+import random
+
+import networkx as nx
+import numpy as np
+
+from src.cache_metriques import obtenir_metrique
+from src.incremental import appliquer_modifications
+
+
+def _lot(G, rng, taille):
+    # Suppressions d'arêtes existantes ; ajouts entre nœuds existants ou nouveaux
+    aretes = list(G.edges())
+    suppressions = rng.sample(aretes, min(taille, len(aretes)))
+    nb = G.number_of_nodes()
+    ajouts = [(rng.randrange(nb + 5), rng.randrange(nb + 5)) for _ in range(taille)]
+    return ajouts, suppressions
+
+
+def _composantes(etiquettes, noeuds):
+    return sorted(sorted(noeuds[i] for i in np.flatnonzero(etiquettes == c)) for c in np.unique(etiquettes))
+
+
+def test_maintenance_identique_au_recalcul():
+    rng = random.Random(7)
+    G = nx.gnm_random_graph(150, 300, seed=7)
+    obtenir_metrique(G, 'triangles_clustering')
+    for _ in range(6):
+        ajouts, suppressions = _lot(G, rng, 25)
+        appliquer_modifications(G, ajouts, suppressions)
+        H = nx.Graph(G)  # Même ordre des nœuds, cache vide : recalcul complet
+        noeuds = list(G.nodes())
+        assert np.array_equal(obtenir_metrique(G, 'degres'), obtenir_metrique(H, 'degres'))
+        triangles, clustering = obtenir_metrique(G, 'triangles_clustering')
+        triangles_h, clustering_h = obtenir_metrique(H, 'triangles_clustering')
+        assert np.array_equal(triangles, triangles_h)
+        assert np.allclose(clustering, [nx.clustering(G, n) for n in noeuds])
+        assert np.allclose(clustering, clustering_h)
+        centralite = obtenir_metrique(G, 'degree_centrality')
+        assert list(centralite) == noeuds
+        assert np.allclose(list(centralite.values()), [nx.degree_centrality(G)[n] for n in noeuds])
+        assert np.isclose(obtenir_metrique(G, 'average_clustering'), nx.average_clustering(G))
+        assert np.isclose(obtenir_metrique(G, 'transitivity'), nx.transitivity(G))
+        assert (_composantes(obtenir_metrique(G, 'composantes_connexes'), noeuds)
+                == sorted(sorted(c) for c in nx.connected_components(G)))
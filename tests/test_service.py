@@ -0,0 +1,19 @@
+# tests/test_service.py
+# Validation des paramètres des requêtes du service local.
+
+import pytest
+
+from src.service import ErreurRequete, _entier
+
+
+def test_entier_sans_maximum():
+    assert _entier({'k': '12'}, 'k', 1) == 12
+    with pytest.raises(ErreurRequete) as erreur:
+        _entier({'k': '-1'}, 'k', 1)
+    assert 'None' not in str(erreur.value)
+
+
+def test_entier_avec_maximum():
+    assert _entier({}, 'k', 2, maximum=5) == 2
+    with pytest.raises(ErreurRequete, match=r"hors limites \(0\.\.5\)"):
+        _entier({'k': '6'}, 'k', 1, maximum=5)
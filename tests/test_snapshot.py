@@ -0,0 +1,37 @@
+# tests/test_snapshot.py
+# Instantané binaire : aller-retour du graphe, des attributs et des métriques (avec leurs paramètres).
+
+import networkx as nx
+import numpy as np
+import src.cache_metriques as cache
+from src.construction_graphe import creer_reseau_social
+from src.snapshot import sauvegarder_snapshot, charger_snapshot
+
+
+def test_aller_retour(tmp_path):
+    G = creer_reseau_social()
+    chemin = str(tmp_path / "reseau.snap")
+    sauvegarder_snapshot(G, chemin, metriques=('betweenness_centrality', 'average_clustering'))
+    H = charger_snapshot(chemin, networkx=True)
+    assert list(H.nodes()) == list(G.nodes())
+    assert nx.utils.edges_equal(H.edges(), G.edges())
+    assert dict(H.nodes(data=True)) == dict(G.nodes(data=True))
+    C = charger_snapshot(chemin)
+    assert np.allclose(C['metriques']['betweenness_centrality'],
+                       [nx.betweenness_centrality(G)[n] for n in G.nodes()])
+    assert C['metriques']['average_clustering'] == cache.obtenir_metrique(G, 'average_clustering')
+
+
+def test_metriques_rechargees_sous_leurs_parametres(tmp_path, monkeypatch):
+    G = creer_reseau_social()
+    chemin = str(tmp_path / "reseau.snap")
+    sauvegarder_snapshot(G, chemin, metriques=('eigenvector_centrality',),
+                         parametres={'eigenvector_centrality': {'max_iter': 1000}})
+    H = charger_snapshot(chemin, networkx=True)
+
+    def interdit(G, **params):
+        raise AssertionError("metrique recalculee au lieu d'etre relue")
+    monkeypatch.setitem(cache.METRIQUES, 'eigenvector_centrality', interdit)
+    valeurs = cache.obtenir_metrique(H, 'eigenvector_centrality', max_iter=1000)
+    attendues = nx.eigenvector_centrality(G, max_iter=1000)
+    assert np.allclose([valeurs[n] for n in G], [attendues[n] for n in G], atol=1e-6)
@@ -0,0 +1,26 @@
+# tests/test_vues.py
+# Résolution des centres d'une vue 'ego' : identifiants entiers (négatifs compris) ou noms.
+
+import numpy as np
+import pytest
+
+from src.graphe_compact import graphe_depuis_aretes
+from src.vues import _indices_centres
+
+
+def _graphe():
+    noeuds = np.array([-3, 0, 7], dtype=np.int64)
+    noms = np.array(["Alice", "Bob", "Chloe"])
+    return graphe_depuis_aretes(np.array([0, 1]), np.array([1, 2]), 3, noeuds, {'nom': noms})
+
+
+def test_identifiants_negatifs():
+    C = _graphe()
+    assert _indices_centres(C, ["-3", -3, "7"]) == [0, 0, 2]
+
+
+def test_noms_et_inconnus():
+    C = _graphe()
+    assert _indices_centres(C, ["Bob"]) == [1]
+    with pytest.raises(ValueError, match="Utilisateur inconnu"):
+        _indices_centres(C, ["Zoe"])